@@ -1,15 +1,43 @@
 import sqlalchemy as sa
+from sqlalchemy.orm import (
+    backref,
+    relationship,
+)
 
 from core.common.models.base import BaseDBModel
 
 
+class AttachmentContent(BaseDBModel):
+    """File content shared by all attachments with the same SHA-256 hash."""
+
+    __tablename__ = 'attachment_contents'
+
+    sha256 = sa.Column(sa.String(64), nullable=False, unique=True)
+    source = sa.Column(sa.LargeBinary(), nullable=False)
+    size = sa.Column(sa.Integer, nullable=False)
+
+    def __str__(self) -> str:
+        return f'AttachmentContent {self.sha256}'
+
+    def __repr__(self) -> str:
+        return f'<{str(self)}>'
+
+
 class Attachment(BaseDBModel):
     __tablename__ = 'attachments'
 
-    source = sa.Column(sa.LargeBinary(), nullable=False)
     filename = sa.Column(sa.String(256), nullable=False)
     is_profile_picture = sa.Column(sa.Boolean(), default=False)
 
+    content_id: int = sa.Column(
+        sa.Integer,
+        sa.ForeignKey('attachment_contents.id'),
+        nullable=False,
+        index=True,
+    )
+    # the file is read only by downloads, which join it explicitly
+    content: AttachmentContent = relationship('AttachmentContent', lazy='raise')
+
     # post
     post_id: int = sa.Column(sa.Integer, sa.ForeignKey('posts.id', ondelete='CASCADE'))
     assignment_id: int = sa.Column(
@@ -23,6 +51,10 @@ class Attachment(BaseDBModel):
     def __repr__(self) -> str:
         return f'<{str(self)}>'
 
+    @property
+    def source(self) -> bytes:
+        return self.content.source
+
     @property
     def is_attached_to_assignment(self):
         return bool(self.assignment_id)
@@ -33,3 +65,38 @@ class Attachment(BaseDBModel):
 
     async def stream(self):
         yield self.source
+
+
+class AttachmentDerivative(BaseDBModel):
+    """Resized copy of an image attachment in a specific format."""
+
+    __tablename__ = 'attachment_derivatives'
+    __table_args__ = (sa.UniqueConstraint('attachment_id', 'size', 'format'),)
+
+    source = sa.Column(sa.LargeBinary(), nullable=False)
+    size = sa.Column(sa.Integer, nullable=False)
+    format = sa.Column(sa.String(16), nullable=False)
+
+    attachment_id: int = sa.Column(
+        sa.Integer,
+        sa.ForeignKey('attachments.id', ondelete='CASCADE'),
+        nullable=False,
+    )
+    attachment = relationship(
+        'Attachment',
+        backref=backref(
+            name='derivatives',
+            uselist=True,
+            passive_deletes=True,
+        ),
+    )
+
+    def __str__(self) -> str:
+        return f'AttachmentDerivative #{self.attachment_id} {self.size}px {self.format}'
+
+    def __repr__(self) -> str:
+        return f'<{str(self)}>'
+
+    @property
+    def content_type(self) -> str:
+        return f'image/{self.format.lower()}'
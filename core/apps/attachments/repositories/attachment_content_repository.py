@@ -0,0 +1,71 @@
+import hashlib
+
+from sqlalchemy import (
+    delete,
+    exists,
+    func,
+    select,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.apps.attachments.models import (
+    Attachment,
+    AttachmentContent,
+)
+from core.common.repositories.base import CRUDRepository
+
+
+class AttachmentContentRepository(CRUDRepository):
+    _model: type[AttachmentContent] = AttachmentContent
+
+    @staticmethod
+    def get_hash(source: bytes) -> str:
+        return hashlib.sha256(source).hexdigest()
+
+    async def acquire(self, session: AsyncSession, source: bytes) -> int:
+        """Returns id of the content with the same hash as `source`.
+
+        The content is stored only if there is no such content yet. Runs in
+        the caller's session so the content is committed together with the
+        attachment.
+
+        """
+        sha256 = self.get_hash(source)
+        statement = select(self._model.id).filter(self._model.sha256 == sha256)
+        content_id = (await session.execute(statement)).scalar()
+
+        if content_id is None:
+            content = self._model(sha256=sha256, source=source, size=len(source))
+            session.add(content)
+            await session.flush()
+            content_id = content.id
+
+        return content_id
+
+    async def delete_unreferenced(self, limit: int) -> tuple[int, int]:
+        """Deletes up to `limit` contents no attachment refers to.
+
+        Returns count of deleted contents and the amount of freed bytes.
+
+        """
+        is_unreferenced = ~exists().where(Attachment.content_id == self._model.id)
+        candidates = select(self._model.id).filter(
+            is_unreferenced,
+        ).order_by(self._model.id.asc()).limit(limit)
+
+        async with self.get_session() as session:
+            freed_bytes = (
+                await session.execute(
+                    select(func.coalesce(func.sum(self._model.size), 0)).filter(
+                        self._model.id.in_(candidates),
+                    ),
+                )
+            ).scalar()
+            result = await session.execute(
+                delete(self._model).filter(
+                    self._model.id.in_(candidates),
+                    is_unreferenced,
+                ).execution_options(synchronize_session=False),
+            )
+            await session.commit()
+            return result.rowcount, freed_bytes
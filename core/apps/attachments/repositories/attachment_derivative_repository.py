@@ -0,0 +1,65 @@
+from typing import Optional
+
+from sqlalchemy import (
+    insert,
+    select,
+)
+
+from core.apps.attachments.models import AttachmentDerivative
+from core.common.helpers.image_resizer import ImageDerivatives
+from core.common.repositories.base import CRUDRepository
+
+
+class AttachmentDerivativeRepository(CRUDRepository):
+    _model: type[AttachmentDerivative] = AttachmentDerivative
+
+    async def create_for_attachment(
+        self,
+        attachment_id: int,
+        derivatives: ImageDerivatives,
+    ) -> int:
+        """Stores all derivatives of the attachment in one statement."""
+        if not derivatives:
+            return 0
+
+        async with self.get_session() as session:
+            await session.execute(
+                insert(self._model), [
+                    {
+                        'attachment_id': attachment_id,
+                        'size': size,
+                        'format': image_format,
+                        'source': source,
+                    }
+                    for (size, image_format), source in derivatives.items()
+                ],
+            )
+            await session.commit()
+        return len(derivatives)
+
+    async def retrieve_best_match(
+        self,
+        attachment_id: int,
+        size: int,
+        formats: list[str],
+    ) -> Optional[AttachmentDerivative]:
+        """Returns the smallest derivative not smaller than `size`.
+
+        Formats are ordered by preference, the first one which has a fitting
+        derivative wins.
+
+        """
+        statement = select(self._model).filter(
+            self._model.attachment_id == attachment_id,
+            self._model.size >= size,
+            self._model.format.in_(formats),
+        ).order_by(self._model.size.asc())
+
+        async with self.get_session() as session:
+            derivatives = (await session.execute(statement)).scalars().all()
+
+        for image_format in formats:
+            for derivative in derivatives:
+                if derivative.format == image_format:
+                    return derivative
+        return None
@@ -1,9 +1,140 @@
-from core.apps.attachments.models import Attachment
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import (
+    cast,
+    column,
+    delete,
+    exists,
+    func,
+    literal,
+    select,
+    String,
+    table,
+)
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from core.apps.attachments.models import (
+    Attachment,
+    AttachmentContent,
+    AttachmentDerivative,
+)
+from core.apps.attachments.repositories.attachment_content_repository import AttachmentContentRepository
+from core.common.config import config
 from core.common.repositories.base import CRUDRepository
+from core.common.repositories.exceptions import ObjectAlreadyExistsException
+
+
+# users app depends on attachments, so the users table is referenced lightly
+users_table = table('users', column('profile_picture_path'))
 
 
 class AttachmentRepository(CRUDRepository):
     _model: type[Attachment] = Attachment
+    _content_repository: AttachmentContentRepository = AttachmentContentRepository()
+
+    @property
+    def model_fields(self):
+        # the content is passed as `source` and stored deduplicated
+        return [*self._model.__table__.columns.keys(), 'source']
+
+    async def create(
+        self,
+        join: list[str] = None,
+        source: bytes = b'',
+        **kwargs,
+    ) -> Attachment:
+        """Creates attachment referencing deduplicated content of `source`."""
+        for is_last_attempt in (False, True):
+            async with self.get_session() as session:
+                try:
+                    content_id = await self._content_repository.acquire(session, source)
+                    created_object = self._model(content_id=content_id, **kwargs)
+                    session.add(created_object)
+                    await session.commit()
+                    break
+                except self._integrity_error as e:
+                    # the same content was stored or collected concurrently, look it up again
+                    await session.rollback()
+
+                    if is_last_attempt:
+                        raise ObjectAlreadyExistsException(e)
+
+        return await self.retrieve(id=created_object.id, join=join)
+
+    async def _delete_selected(
+        self,
+        session: AsyncSession,
+        statement: Select,
+    ) -> tuple[int, int]:
+        """Deletes attachments selected by `id` statement with their
+        derivatives. Their contents are left for the garbage collector.
+
+        Returns count of deleted attachments and size of deleted derivatives.
+
+        """
+        ids = (await session.execute(statement)).scalars().all()
+
+        if not ids:
+            return 0, 0
+
+        derivatives_filter = AttachmentDerivative.attachment_id.in_(ids)
+        derivatives_size = (
+            await session.execute(
+                select(
+                    func.coalesce(func.sum(func.length(AttachmentDerivative.source)), 0),
+                ).filter(derivatives_filter),
+            )
+        ).scalar()
+
+        await session.execute(delete(AttachmentDerivative).filter(derivatives_filter))
+        result = await session.execute(
+            delete(self._model).filter(
+                self._model.id.in_(ids),
+            ).execution_options(synchronize_session=False),
+        )
+        return result.rowcount, derivatives_size
+
+    async def delete(self, **filters) -> int:
+        """Deletes attachments with their derivatives."""
+        statement = select(self._model.id).filter_by(**filters)
+
+        async with self.get_session() as session:
+            deleted_count, _ = await self._delete_selected(session, statement)
+            await session.commit()
+            return deleted_count
+
+    async def delete_orphans(
+        self,
+        created_before: datetime,
+        limit: int,
+    ) -> tuple[int, int]:
+        """Deletes up to `limit` attachments created before `created_before`
+        which are attached to nothing and are not used as a profile picture.
+
+        Returns count of deleted attachments and size of deleted derivatives.
+
+        """
+        path_prefix, _, path_suffix = config.STATIC_URL.partition('{file_id}')
+        # stored paths keep the host they were saved with, so only the
+        # `/attachments/{file_id}` end of them identifies the picture
+        route = '/' + path_prefix.rstrip('/').rsplit('/', 1)[-1] + '/'
+        attachment_path_end = (
+            literal(route) + cast(self._model.id, String) + literal(path_suffix)
+        )
+        statement = select(self._model.id).filter(
+            self._model.post_id.is_(None),
+            self._model.assignment_id.is_(None),
+            self._model.created_at < created_before,
+            ~exists().where(users_table.c.profile_picture_path.endswith(attachment_path_end)),
+        ).order_by(self._model.id.asc()).limit(limit)
+
+        async with self.get_session() as session:
+            result = await self._delete_selected(session, statement)
+            await session.commit()
+            return result
 
     async def create_picture(
         self,
@@ -19,3 +150,22 @@ class AttachmentRepository(CRUDRepository):
         )
 
         return created_object
+
+    async def fetch_headers(self, **filters) -> list[Row]:
+        """Returns `id`, `filename` and `updated_at` of matching attachments
+        without loading their content."""
+        statement = select(
+            self._model.id,
+            self._model.filename,
+            self._model.updated_at,
+        ).filter_by(**filters).order_by(self._model.id.asc())
+
+        async with self.get_session() as session:
+            return (await session.execute(statement)).all()
+
+    async def get_source(self, id: int) -> Optional[bytes]:
+        statement = select(AttachmentContent.source).join(
+            self._model,
+            self._model.content_id == AttachmentContent.id,
+        ).filter(self._model.id == id)
+        return await self.get_scalar(statement)
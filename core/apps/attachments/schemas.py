@@ -50,5 +50,10 @@ class AttachmentListItemSchema(NormalizedDatetimeModel):
         orm_mode = True
 
 
+class AttachmentSignedUrlSchema(BaseModel):
+    url: str
+    expires_at: datetime
+
+
 class AttachmentDeleteSchema(BaseModel):
     ids: List[int]
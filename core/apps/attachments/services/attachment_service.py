@@ -1,29 +1,45 @@
+from datetime import datetime
 from typing import (
     Any,
+    AsyncIterator,
+    Optional,
     Tuple,
     Union,
 )
 
-from core.apps.attachments.models import Attachment
+from core.apps.attachments.models import (
+    Attachment,
+    AttachmentDerivative,
+)
+from core.apps.attachments.repositories.attachment_derivative_repository import AttachmentDerivativeRepository
 from core.apps.attachments.repositories.attachment_repository import AttachmentRepository
+from core.apps.attachments.utils import get_unique_filename
 from core.apps.classroom.models import (
     HomeworkAssignment,
     Participation,
 )
 from core.apps.classroom.repositories.assignment import HomeworkAssignmentRepository
-from core.apps.classroom.repositories.participation_repository import ParticipationRepository
 from core.apps.classroom.repositories.post_repository import RoomPostRepository
+from core.apps.classroom.services.mixins import ParticipationMixin
 from core.apps.localization.utils import translate as _
+from core.common.config import config
 from core.common.services.author import AuthorMixin
 from core.common.services.base import CRUDService
+from core.common.services.decorators import action
+from core.common.utils import (
+    get_attachment_path,
+    get_current_datetime,
+)
 
 
-class AttachmentService(AuthorMixin, CRUDService):
+class AttachmentService(ParticipationMixin, AuthorMixin, CRUDService):
     _repository: AttachmentRepository = AttachmentRepository()
+    _derivative_repository: AttachmentDerivativeRepository = (
+        AttachmentDerivativeRepository()
+    )
     _assignment_repository: HomeworkAssignmentRepository = (
         HomeworkAssignmentRepository()
     )
-    _participation_repository: ParticipationRepository = ParticipationRepository()
     _post_repository: RoomPostRepository = RoomPostRepository()
     _post_checked: bool = False
     _assignment_checked: bool = False
@@ -51,12 +67,98 @@ class AttachmentService(AuthorMixin, CRUDService):
         post = await self._post_repository.retrieve(
             id=post_id,
         )
-        participation: Participation = await self._participation_repository.retrieve(
-            user_id=self.user.id,
-            room_id=post.room_id,
-        )
+        participation: Participation = await self.get_participation(post.room_id)
         return participation.can_manage_posts
 
+    async def retrieve_derivative(
+        self,
+        attachment_id: int,
+        size: int,
+        formats: list[str],
+    ) -> Optional[AttachmentDerivative]:
+        """Returns the best fitting resized copy of the attachment if any."""
+        return await self._derivative_repository.retrieve_best_match(
+            attachment_id=attachment_id,
+            size=size,
+            formats=formats,
+        )
+
+    @action
+    async def get_signed_url(
+        self,
+        attachment_id: int,
+    ) -> Tuple[Optional[dict[str, Any]], Optional[dict[str, str]]]:
+        """Returns short-lived URL which is downloadable without
+        authorization."""
+        if not await self._repository.exists(id=attachment_id):
+            return None, {'id': _('Attachment not found.')}
+
+        return {
+            'url': get_attachment_path(attachment_id, signed=True),
+            'expires_at': get_current_datetime() + config.ATTACHMENT_URL_TIMEDELTA,
+        }, None
+
+    async def _can_download_post_attachments(self, post_id: int) -> bool:
+        post = await self._post_repository.retrieve(id=post_id)
+
+        if not post:
+            return False
+        return await self.get_participation(post.room_id) is not None
+
+    async def _can_download_assignment_attachments(self, assignment_id: int) -> bool:
+        assignment: HomeworkAssignment = await self._assignment_repository.retrieve(
+            id=assignment_id,
+            join=['post'],
+        )
+
+        if not assignment:
+            return False
+        if assignment.author_id == self.user.id:
+            return True
+
+        participation: Participation = await self.get_participation(assignment.post.room_id)
+        return bool(participation) and participation.can_manage_assignments
+
+    async def _iterate_bundle_files(
+        self,
+        **filters,
+    ) -> AsyncIterator[tuple[str, bytes, datetime]]:
+        taken_filenames: set[str] = set()
+
+        for attachment_id, filename, updated_at in await self._repository.fetch_headers(
+            **filters,
+        ):
+            source = await self._repository.get_source(attachment_id)
+
+            if source is None:
+                continue
+            yield get_unique_filename(filename, taken_filenames), source, updated_at
+
+    @action
+    async def get_bundle(
+        self,
+        post_id: Optional[int] = None,
+        assignment_id: Optional[int] = None,
+    ) -> Tuple[Optional[AsyncIterator[tuple[str, bytes, datetime]]], Optional[dict[str, str]]]:
+        """Returns lazy iterator over attachment files of the post or the
+        assignment.
+
+        Attachment contents are loaded one by one while the iterator is
+        consumed.
+
+        """
+        if post_id is not None:
+            if not await self._can_download_post_attachments(post_id):
+                return None, {'post_id': _('You are not allowed to do that.')}
+            return self._iterate_bundle_files(post_id=post_id), None
+
+        if assignment_id is not None:
+            if not await self._can_download_assignment_attachments(assignment_id):
+                return None, {'assignment_id': _('You are not allowed to do that.')}
+            return self._iterate_bundle_files(assignment_id=assignment_id), None
+
+        return None, {'error': _('Either post_id or assignment_id must be provided!')}
+
     async def validate_manage_permissions(self, attachment_id: int):
         attachment: Attachment = await self._repository.retrieve(id=attachment_id)
 
@@ -1,17 +1,34 @@
+import zipfile
+from datetime import timedelta
+from io import BytesIO
+
 from fastapi import status
 from fastapi.applications import FastAPI
 
+from sqlalchemy.exc import InvalidRequestError
+
 import pytest
 
+from core.apps.attachments.repositories.attachment_content_repository import AttachmentContentRepository
 from core.apps.attachments.repositories.attachment_repository import AttachmentRepository
 from core.apps.classroom.constants import ParticipationRoleEnum
 from core.apps.classroom.repositories.assignment import HomeworkAssignmentRepository
 from core.apps.classroom.repositories.post_repository import RoomPostRepository
+from core.common.database import test_engine
+from core.common.utils import (
+    get_attachment_path,
+    get_current_datetime,
+)
+from core.scheduler.tasks.attachments import collect_attachments_garbage
 from core.tests.client import FastAPITestClient
 from core.tests.factories.classroom.assignments import AssignmentFactory
 from core.tests.factories.classroom.participation import ParticipationFactory
 from core.tests.factories.classroom.room_post import RoomPostFactory
-from core.tests.utils.functions import check_attachment_is_attached
+from core.tests.factories.user.user import UserFactory
+from core.tests.utils.functions import (
+    check_attachment_is_attached,
+    count_queries,
+)
 
 
 TEST_FILE_PATH = 'core/apps/attachments/tests/new_file.txt'
@@ -49,7 +66,7 @@ async def test_attach_to_post_host(
     assert response.status_code == status.HTTP_201_CREATED, json_data
     assert not json_data['errors']
 
-    attachment = await attachment_repository.retrieve(post_id=post.id)
+    attachment = await attachment_repository.retrieve(post_id=post.id, join=['content'])
     room_post = await room_post_repository.retrieve(id=post.id, join=['attachments'])
 
     check_attachment_is_attached(
@@ -156,7 +173,7 @@ async def test_attach_to_assignment_participant_author(
     assert response.status_code == status.HTTP_201_CREATED, json_data
     assert not json_data.get('detail')
 
-    attachment = await attachment_repository.retrieve(assignment_id=assignment.id)
+    attachment = await attachment_repository.retrieve(assignment_id=assignment.id, join=['content'])
     assignment = await assignment_repository.retrieve(
         id=assignment.id,
         join=['attachments'],
@@ -224,3 +241,138 @@ async def test_attach_file_assignment_or_post_id_not_provided(
     json_data = response.json()
     assert response.status_code == status.HTTP_400_BAD_REQUEST, json_data
     assert json_data.get('detail')
+
+
+@pytest.mark.asyncio
+async def test_download_post_attachments_bundle(
+    app: FastAPI,
+    client: FastAPITestClient,
+    attachment_repository: AttachmentRepository,
+):
+    participation = await ParticipationFactory.create(
+        role=ParticipationRoleEnum.participant,
+    )
+    post = await RoomPostFactory.create(room=participation.room)
+    sources = [b'first file', b'second file', b'other post file']
+
+    await attachment_repository.create(filename='file.txt', source=sources[0], post_id=post.id)
+    await attachment_repository.create(filename='file.txt', source=sources[1], post_id=post.id)
+    await attachment_repository.create(filename='other.txt', source=sources[2])
+
+    client.authorize(participation.user)
+    response = client.get(
+        app.url_path_for('get_attachments_bundle'),
+        params={'post_id': post.id},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers['content-type'] == 'application/zip'
+
+    with zipfile.ZipFile(BytesIO(response.content)) as archive:
+        assert archive.namelist() == ['file.txt', 'file (1).txt']
+        assert archive.read('file.txt') == sources[0]
+        assert archive.read('file (1).txt') == sources[1]
+
+
+@pytest.mark.asyncio
+async def test_download_assignment_attachments_bundle_not_allowed(
+    app: FastAPI,
+    client: FastAPITestClient,
+    attachment_repository: AttachmentRepository,
+):
+    participation = await ParticipationFactory.create(
+        role=ParticipationRoleEnum.participant,
+    )
+    post = await RoomPostFactory.create(room=participation.room)
+    assignment = await AssignmentFactory.create(post=post)
+    await attachment_repository.create(
+        filename='homework.txt',
+        source=b'homework',
+        assignment_id=assignment.id,
+    )
+
+    client.authorize(participation.user)
+    response = client.get(
+        app.url_path_for('get_attachments_bundle'),
+        params={'assignment_id': assignment.id},
+    )
+    assert response.status_code == status.HTTP_403_FORBIDDEN, response.json()
+
+    response = client.get(app.url_path_for('get_attachments_bundle'))
+    assert response.status_code == status.HTTP_400_BAD_REQUEST, response.json()
+
+
+@pytest.mark.asyncio
+async def test_retrieve_does_not_load_content(attachment_repository: AttachmentRepository):
+    attachment = await attachment_repository.create(filename='lecture.pdf', source=b'lecture notes')
+
+    with count_queries(test_engine) as statements:
+        attachment = await attachment_repository.retrieve(id=attachment.id)
+
+    assert 'attachment_contents' not in statements[0]
+
+    with pytest.raises(InvalidRequestError):
+        attachment.source
+
+    attachment = await attachment_repository.retrieve(id=attachment.id, join=['content'])
+    assert attachment.source == b'lecture notes'
+
+
+@pytest.mark.asyncio
+async def test_attachments_content_deduplicated(
+    attachment_repository: AttachmentRepository,
+):
+    content_repository = AttachmentContentRepository()
+    source = b'the same lecture notes'
+
+    first = await attachment_repository.create(filename='lecture.pdf', source=source)
+    second = await attachment_repository.create(filename='copy.pdf', source=source, join=['content'])
+    other = await attachment_repository.create(filename='other.pdf', source=b'other')
+
+    assert first.content_id == second.content_id != other.content_id
+    assert second.source == source
+    assert await content_repository.count() == 2
+
+    content = await content_repository.retrieve(id=first.content_id)
+    assert content.size == len(source)
+
+    await attachment_repository.delete(id=first.id)
+    assert await content_repository.delete_unreferenced(limit=10) == (0, 0)
+
+    await attachment_repository.delete(id=second.id)
+    assert await content_repository.delete_unreferenced(limit=10) == (1, len(source))
+    assert not await content_repository.exists(id=first.content_id)
+    assert await attachment_repository.get_source(other.id) == b'other'
+
+
+@pytest.mark.asyncio
+async def test_orphaned_attachments_collected(
+    attachment_repository: AttachmentRepository,
+):
+    post = await RoomPostFactory.create()
+    attached = await attachment_repository.create(
+        filename='attached.txt',
+        source=b'attached',
+        post_id=post.id,
+    )
+    orphan = await attachment_repository.create(filename='orphan.txt', source=b'orphan')
+    picture = await attachment_repository.create(filename='picture.jpg', source=b'picture')
+    old_host_picture = await attachment_repository.create(filename='old.jpg', source=b'old picture')
+    await attachment_repository.create(filename='fresh.txt', source=b'fresh')
+    await UserFactory.create(profile_picture_path=get_attachment_path(picture.id))
+    await UserFactory.create(
+        profile_picture_path=f'http://old-host:8000/api/attachments/{old_host_picture.id}',
+    )
+
+    long_ago = get_current_datetime() - timedelta(days=1)
+    for attachment in (attached, orphan, picture, old_host_picture):
+        await attachment_repository.update(values={'created_at': long_ago}, id=attachment.id)
+
+    assert await collect_attachments_garbage() == {
+        'attachments': 1,
+        'contents': 1,
+        'reclaimed_bytes': len(b'orphan'),
+    }
+    assert not await attachment_repository.exists(id=orphan.id)
+    assert await attachment_repository.exists(id=old_host_picture.id)
+    assert await attachment_repository.count() == 4
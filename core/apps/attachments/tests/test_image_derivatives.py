@@ -0,0 +1,96 @@
+from io import BytesIO
+
+from fastapi import status
+from fastapi.applications import FastAPI
+
+import pytest
+from PIL import Image
+
+from core.apps.attachments.utils import get_accepted_image_formats
+from core.common.config import config
+from core.common.helpers.image_resizer import ImageResizer
+from core.tests.client import FastAPITestClient
+from core.tests.factories.user import UserFactory
+
+
+TEST_PICTURE_PATH = 'core/tests/test_attachments/maxresdefault.jpg'
+PROFILE_PICTURE_PATH = 'core/apps/users/tests/storage/profile_photo.jpeg'
+
+
+def test_image_resizer_derivatives():
+    with open(TEST_PICTURE_PATH, 'rb') as picture:
+        derivatives = ImageResizer().get_derivatives(
+            picture.read(),
+            sizes=[50, 200, 100],
+            formats=['JPEG', 'WEBP'],
+        )
+
+    assert sorted(derivatives) == sorted(
+        (size, image_format)
+        for size in (50, 100, 200)
+        for image_format in ('JPEG', 'WEBP')
+    )
+
+    for (size, image_format), source in derivatives.items():
+        image = Image.open(BytesIO(source))
+        assert image.format == image_format
+        assert max(image.size) == size
+
+
+def test_image_resizer_does_not_upscale():
+    picture = BytesIO()
+    Image.new('RGB', (120, 60)).save(picture, format='JPEG')
+
+    derivatives = ImageResizer().get_derivatives(
+        picture.getvalue(),
+        sizes=[50, 120, 400],
+        formats=['JPEG'],
+    )
+
+    assert [
+        Image.open(BytesIO(derivatives[size, 'JPEG'])).size
+        for size in (50, 120, 400)
+    ] == [(50, 25), (120, 60), (120, 60)]
+
+
+def test_accepted_image_formats():
+    assert get_accepted_image_formats(None) == [config.IMAGE_FALLBACK_FORMAT]
+    assert get_accepted_image_formats('*/*') == [config.IMAGE_FALLBACK_FORMAT]
+    assert get_accepted_image_formats('image/avif,image/webp,*/*;q=0.8') == [
+        'WEBP',
+        config.IMAGE_FALLBACK_FORMAT,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_profile_picture_derivatives_negotiation(
+    app: FastAPI,
+    client: FastAPITestClient,
+):
+    user = await UserFactory.create()
+    client.authorize(user)
+
+    with open(PROFILE_PICTURE_PATH, 'rb') as profile_photo:
+        response = client.post(
+            app.url_path_for('add_profile_picture'),
+            files={'profile_picture': ('test.jpeg', profile_photo, 'image/jpeg')},
+        )
+    assert response.status_code == status.HTTP_200_OK, response.json()
+    profile_picture_path = response.json()['profile_picture_path']
+
+    response = client.get(
+        profile_picture_path,
+        params={'size': 50},
+        headers={'Accept': 'image/webp,*/*'},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers['content-type'] == 'image/webp'
+    assert response.headers['vary'] == 'Accept'
+    assert max(Image.open(BytesIO(response.content)).size) == 50
+
+    response = client.get(profile_picture_path, params={'size': 60})
+    assert response.headers['content-type'] == 'image/jpeg'
+    assert max(Image.open(BytesIO(response.content)).size) == 100
+
+    response = client.get(profile_picture_path)
+    assert max(Image.open(BytesIO(response.content)).size) == config.PROFILE_PICTURE_RESOLUTION
@@ -0,0 +1,81 @@
+from fastapi import status
+from fastapi.applications import FastAPI
+
+import pytest
+
+from core.apps.attachments.repositories.attachment_repository import AttachmentRepository
+from core.common.config import config
+from core.common.utils import sign_attachment_id
+from core.tests.client import FastAPITestClient
+from core.tests.factories.user import UserFactory
+
+
+@pytest.mark.asyncio
+async def test_signed_attachment_download(
+    app: FastAPI,
+    client: FastAPITestClient,
+    attachment_repository: AttachmentRepository,
+):
+    user = await UserFactory.create()
+    attachment = await attachment_repository.create(filename='notes.txt', source=b'notes')
+
+    client.authorize(user)
+    response = client.get(
+        app.url_path_for('get_attachment_signed_url', attachment_id=attachment.id),
+    )
+    json_data = response.json()
+    assert response.status_code == status.HTTP_200_OK, json_data
+    assert json_data['expires_at']
+
+    client.headers.pop('Authorization', None)
+    response = client.get(json_data['url'])
+    assert response.status_code == status.HTTP_200_OK
+    assert response.content == b'notes'
+    assert 'max-age' in response.headers['Cache-Control']
+
+
+@pytest.mark.asyncio
+async def test_signed_attachment_url_not_found(
+    app: FastAPI,
+    client: FastAPITestClient,
+):
+    client.authorize(await UserFactory.create())
+    response = client.get(
+        app.url_path_for('get_attachment_signed_url', attachment_id=100),
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_signed_attachment_forged_token(
+    app: FastAPI,
+    client: FastAPITestClient,
+    attachment_repository: AttachmentRepository,
+):
+    attachment = await attachment_repository.create(filename='notes.txt', source=b'notes')
+    token = sign_attachment_id(attachment.id)
+    forged_token = f'{attachment.id + 1}{token[len(str(attachment.id)):]}'
+
+    response = client.get(app.url_path_for('get_signed_attachment', token=forged_token))
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.asyncio
+async def test_signed_attachment_internal_redirect(
+    app: FastAPI,
+    client: FastAPITestClient,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(
+        config,
+        'ATTACHMENT_INTERNAL_REDIRECT_URL',
+        '/internal/attachments/{file_id}',
+    )
+
+    response = client.get(
+        app.url_path_for('get_signed_attachment', token=sign_attachment_id(7)),
+        params={'size': 50},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers['X-Accel-Redirect'] == '/internal/attachments/7?size=50'
+    assert not response.content
@@ -1,2 +1,104 @@
+import zipfile
+from datetime import datetime
+from typing import (
+    AsyncIterator,
+    Optional,
+)
+
+from core.common.config import config
+
+
 async def stream_file(file: bytes):
     yield file
+
+
+def get_accepted_image_formats(accept: Optional[str]) -> list[str]:
+    """Returns derivative formats acceptable for the `Accept` header.
+
+    Formats explicitly listed by the client come first in the order of
+    `IMAGE_DERIVATIVE_FORMATS`, the fallback format is always acceptable
+    since every client is able to render it.
+
+    """
+    accepted_media_types = {
+        media_range.split(';')[0].strip().lower()
+        for media_range in (accept or '').split(',')
+    }
+    formats = [
+        image_format for image_format in config.IMAGE_DERIVATIVE_FORMATS
+        if f'image/{image_format.lower()}' in accepted_media_types
+    ]
+
+    if config.IMAGE_FALLBACK_FORMAT not in formats:
+        formats.append(config.IMAGE_FALLBACK_FORMAT)
+    return formats
+
+
+class ZipStreamBuffer:
+    """Write-only file object collecting the zip output between reads.
+
+    ZipFile falls back to data descriptors when the file object is not
+    seekable, so the archive never has to be rewound.
+
+    """
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def read_written(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def stream_zip(
+    files: AsyncIterator[tuple[str, bytes, Optional[datetime]]],
+) -> AsyncIterator[bytes]:
+    """Yields a zip archive built from `(filename, source, modified_at)`
+    tuples one entry at a time."""
+    buffer = ZipStreamBuffer()
+    chunk_size = config.ZIP_STREAM_CHUNK_SIZE
+
+    with zipfile.ZipFile(buffer, mode='w', compression=zipfile.ZIP_DEFLATED) as archive:
+        async for filename, source, modified_at in files:
+            entry_info = zipfile.ZipInfo(
+                filename=filename,
+                date_time=(modified_at or datetime.utcnow()).timetuple()[:6],
+            )
+            entry_info.compress_type = zipfile.ZIP_DEFLATED
+            entry_info.file_size = len(source)
+
+            with archive.open(entry_info, mode='w') as entry:
+                for offset in range(0, len(source), chunk_size):
+                    entry.write(source[offset:offset + chunk_size])
+
+                    if data := buffer.read_written():
+                        yield data
+            if data := buffer.read_written():
+                yield data
+    yield buffer.read_written()
+
+
+def get_unique_filename(filename: str, taken_filenames: set[str]) -> str:
+    """Returns filename with a numeric suffix if the name is already taken."""
+    unique_filename = filename
+    name, dot, extension = filename.rpartition('.')
+
+    if not dot:
+        name, extension = filename, ''
+
+    counter = 1
+
+    while unique_filename in taken_filenames:
+        unique_filename = f'{name} ({counter}){dot}{extension}'
+        counter += 1
+
+    taken_filenames.add(unique_filename)
+    return unique_filename
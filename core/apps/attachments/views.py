@@ -3,24 +3,38 @@ from typing import Optional
 from fastapi import (
     APIRouter,
     Depends,
+    Header,
+    Query,
     UploadFile,
 )
 from fastapi.exceptions import HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi.responses import (
+    Response,
+    StreamingResponse,
+)
 
+from itsdangerous import BadSignature
 from starlette import status
 
 from core.apps.attachments.schemas import (
     AttachmentBulkCreateResponse,
     AttachmentCreateSchema,
+    AttachmentSignedUrlSchema,
 )
 from core.apps.attachments.services.attachment_service import AttachmentService
-from core.apps.attachments.utils import stream_file
+from core.apps.attachments.utils import (
+    get_accepted_image_formats,
+    stream_file,
+    stream_zip,
+)
+from core.apps.ratelimit.dependencies import UserRateLimit
 from core.apps.users.dependencies import (
     get_current_user,
     get_current_user_optional,
 )
 from core.apps.users.models import User
+from core.common.config import config
+from core.common.utils import unsign_attachment_id
 
 
 router = APIRouter(
@@ -29,34 +43,169 @@ router = APIRouter(
 
 
 @router.get(
-    '/{attachment_id}',
-    status_code=status.HTTP_206_PARTIAL_CONTENT,
-    operation_id='getAttachment',
+    '/bundle',
+    status_code=status.HTTP_200_OK,
+    operation_id='getAttachmentsBundle',
+    summary='Download all attachments as zip',
+    description='Streams a zip archive with every attachment of the room '
+    'post or the homework assignment.',
 )
-async def get_attachment(
-    attachment_id: int,
-    user: User = Depends(
-        get_current_user_optional,
-    ),
+async def get_attachments_bundle(
+    post_id: Optional[int] = None,
+    assignment_id: Optional[int] = None,
+    user: User = Depends(get_current_user),
 ):
+    if all([post_id is None, assignment_id is None]):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={'error': 'Either post_id or assignment_id must be provided!'},
+        )
+
     attachment_service = AttachmentService(user)
-    attachment, errors = await attachment_service.retrieve(id=attachment_id)
+    files, errors = await attachment_service.get_bundle(
+        post_id=post_id,
+        assignment_id=assignment_id,
+    )
 
     if errors:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=errors)
+
+    bundle_name = f'post-{post_id}' if post_id is not None else f'assignment-{assignment_id}'
+    return StreamingResponse(
+        content=stream_zip(files),
+        media_type='application/zip',
+        headers={
+            'Content-Disposition': f'attachment; filename="{bundle_name}.zip"',
+        },
+    )
+
+
+async def _get_attachment_response(
+    attachment_service: AttachmentService,
+    attachment_id: int,
+    size: Optional[int] = None,
+    accept: Optional[str] = None,
+    headers: Optional[dict[str, str]] = None,
+) -> StreamingResponse:
+    headers = headers or {}
+
+    if size is not None:
+        derivative = await attachment_service.retrieve_derivative(
+            attachment_id=attachment_id,
+            size=size,
+            formats=get_accepted_image_formats(accept),
+        )
+
+        if derivative:
+            return StreamingResponse(
+                content=stream_file(derivative.source),
+                media_type=derivative.content_type,
+                headers={**headers, 'Vary': 'Accept'},
+            )
+
+    attachment, errors = await attachment_service.retrieve(id=attachment_id, _join=['content'])
+
+    if errors or not attachment:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=errors)
     return StreamingResponse(
         content=stream_file(attachment.source),
         headers={
+            **headers,
             'Content-Disposition': 'attachment; filename=',
         },
     )
 
 
+@router.get(
+    '/signed/{token}',
+    status_code=status.HTTP_200_OK,
+    operation_id='getSignedAttachment',
+    summary='Download attachment by signed URL',
+    description='Serves attachment without authorization while the URL '
+    'signature is valid.',
+)
+async def get_signed_attachment(
+    token: str,
+    size: Optional[int] = Query(default=None, gt=0),
+    accept: Optional[str] = Header(default=None),
+):
+    try:
+        attachment_id = unsign_attachment_id(token)
+    except BadSignature:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail={'token': 'Download link is invalid or expired.'},
+        )
+
+    max_age = int(config.ATTACHMENT_URL_TIMEDELTA.total_seconds())
+    headers = {'Cache-Control': f'private, max-age={max_age}'}
+
+    if config.ATTACHMENT_INTERNAL_REDIRECT_URL:
+        internal_url = config.ATTACHMENT_INTERNAL_REDIRECT_URL.format(file_id=attachment_id)
+
+        if size is not None:
+            internal_url = f'{internal_url}?size={size}'
+        return Response(headers={**headers, 'X-Accel-Redirect': internal_url})
+
+    return await _get_attachment_response(
+        attachment_service=AttachmentService(None),
+        attachment_id=attachment_id,
+        size=size,
+        accept=accept,
+        headers=headers,
+    )
+
+
+@router.get(
+    '/{attachment_id}/url',
+    response_model=AttachmentSignedUrlSchema,
+    status_code=status.HTTP_200_OK,
+    operation_id='getAttachmentSignedUrl',
+    summary='Get signed attachment URL',
+    description='Returns short-lived URL which can be used to download the '
+    'attachment without authorization.',
+)
+async def get_attachment_signed_url(
+    attachment_id: int,
+    user: User = Depends(get_current_user),
+):
+    attachment_service = AttachmentService(user)
+    signed_url, errors = await attachment_service.get_signed_url(
+        attachment_id=attachment_id,
+    )
+
+    if errors:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=errors)
+    return AttachmentSignedUrlSchema(**signed_url)
+
+
+@router.get(
+    '/{attachment_id}',
+    status_code=status.HTTP_206_PARTIAL_CONTENT,
+    operation_id='getAttachment',
+)
+async def get_attachment(
+    attachment_id: int,
+    size: Optional[int] = Query(default=None, gt=0),
+    accept: Optional[str] = Header(default=None),
+    user: User = Depends(
+        get_current_user_optional,
+    ),
+):
+    return await _get_attachment_response(
+        attachment_service=AttachmentService(user),
+        attachment_id=attachment_id,
+        size=size,
+        accept=accept,
+    )
+
+
 @router.post(
     '/',
     response_model=AttachmentBulkCreateResponse,
     status_code=status.HTTP_201_CREATED,
     operation_id='createAttachments',
+    dependencies=[Depends(UserRateLimit('attachments-upload', *config.ATTACHMENTS_UPLOAD_RATE_LIMIT))],
 )
 async def create_attachments(
     attachments: list[UploadFile],
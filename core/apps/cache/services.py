@@ -1,42 +1,215 @@
+import asyncio
 import json
-from functools import cached_property
+import pickle
+import time
 from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Mapping,
+    Optional,
     Protocol,
     Union,
 )
+from weakref import WeakKeyDictionary
 
-from redis import Redis
+from redis.asyncio import Redis
 
 from core.common.config import config
 
 
+CacheValue = Union[str, bytes]
+
+
 class AbstractCacheService(Protocol):
-    @cached_property
-    def client(self):
-        ...
+    """Key-value cache of a subsystem.
+
+    Keys are prefixed by `CACHE_KEY_PREFIX` and the namespace, so
+    subsystems never collide and can be flushed separately. Raw values are
+    stored as is, objects are serialized with pickle and JSON helpers are
+    kept for data shared with other services.
+
+    """
+    namespace: str
 
-    async def set_cache(self, key: str, value: str):
+    def make_key(self, key: str) -> str:
+        return ':'.join(filter(None, [config.CACHE_KEY_PREFIX, self.namespace, str(key)]))
+
+    async def set_cache(self, key: str, value: CacheValue, expire: Optional[int] = None):
         raise NotImplementedError()
 
-    async def set_json_cache(self, key: str, value: Union[dict, list]):
-        json_data = json.dumps(value)
-        return self.set_cache(key, json_data)
+    async def set_many_cache(self, mapping: Mapping[str, CacheValue], expire: Optional[int] = None):
+        raise NotImplementedError()
+
+    async def get_cache(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError()
+
+    async def get_many_cache(self, keys: Iterable[str]) -> list[Optional[bytes]]:
+        raise NotImplementedError()
+
+    async def delete_cache(self, *keys: str):
+        raise NotImplementedError()
 
-    async def get_cache(self, key: str) -> str:
+    async def expire(self, key: str, expire: int):
         raise NotImplementedError()
 
-    async def get_json_cache(self, key: str) -> Union[dict, list]:
-        json_data = json.loads(self.get_cache(key))
-        return json_data
+    async def clear_namespace(self):
+        """Deletes every key of the namespace."""
+        raise NotImplementedError()
+
+    async def set_json_cache(
+        self,
+        key: str,
+        value: Union[dict, list],
+        expire: Optional[int] = None,
+    ):
+        json_data = json.dumps(value)
+        return await self.set_cache(key, json_data, expire=expire)
+
+    async def get_json_cache(self, key: str) -> Optional[Union[dict, list]]:
+        json_data = await self.get_cache(key)
+
+        if json_data is None:
+            return None
+        return json.loads(json_data)
+
+    async def set_object_cache(self, key: str, value: Any, expire: Optional[int] = None):
+        return await self.set_cache(key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), expire=expire)
+
+    async def set_many_object_cache(self, mapping: Mapping[str, Any], expire: Optional[int] = None):
+        return await self.set_many_cache(
+            {key: pickle.dumps(value, pickle.HIGHEST_PROTOCOL) for key, value in mapping.items()},
+            expire=expire,
+        )
+
+    async def get_object_cache(self, key: str, default: Any = None) -> Any:
+        data = await self.get_cache(key)
+
+        if data is None:
+            return default
+        return pickle.loads(data)
+
+    async def get_many_object_cache(self, keys: Iterable[str]) -> dict[str, Any]:
+        """Returns cached objects by key, missing keys are left out."""
+        keys = list(keys)
+        values = await self.get_many_cache(keys)
+        return {
+            key: pickle.loads(data)
+            for key, data in zip(keys, values)
+            if data is not None
+        }
 
 
 class RedisCacheService(AbstractCacheService):
-    @cached_property
-    def client(self):
-        return Redis(host=config.CACHE_SERVICE_HOST, port=config.CACHE_SERVICE_PORT)
+    """Non-blocking Redis cache.
+
+    Connections belong to the event loop they were opened in, so each loop
+    gets its own client. Batched writes with expiration are sent in a
+    single pipeline round trip.
+
+    """
+
+    def __init__(self, namespace: str = '') -> None:
+        self.namespace = namespace
+        self._clients: WeakKeyDictionary[asyncio.AbstractEventLoop, Redis] = WeakKeyDictionary()
+
+    @property
+    def client(self) -> Redis:
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+
+        if client is None:
+            client = Redis(host=config.CACHE_SERVICE_HOST, port=config.CACHE_SERVICE_PORT)
+            self._clients[loop] = client
+        return client
+
+    async def set_cache(self, key: str, value: CacheValue, expire: Optional[int] = None):
+        await self.client.set(self.make_key(key), value, ex=expire)
+
+    async def set_many_cache(self, mapping: Mapping[str, CacheValue], expire: Optional[int] = None):
+        if not mapping:
+            return
+
+        if expire is None:
+            await self.client.mset({self.make_key(key): value for key, value in mapping.items()})
+            return
+
+        async with self.client.pipeline(transaction=False) as pipeline:
+            for key, value in mapping.items():
+                pipeline.set(self.make_key(key), value, ex=expire)
+            await pipeline.execute()
+
+    async def get_cache(self, key: str) -> Optional[bytes]:
+        return await self.client.get(self.make_key(key))
+
+    async def get_many_cache(self, keys: Iterable[str]) -> list[Optional[bytes]]:
+        keys = [self.make_key(key) for key in keys]
+
+        if not keys:
+            return []
+        return await self.client.mget(keys)
+
+    async def delete_cache(self, *keys: str):
+        if keys:
+            await self.client.delete(*map(self.make_key, keys))
+
+    async def expire(self, key: str, expire: int):
+        await self.client.expire(self.make_key(key), expire)
+
+    async def clear_namespace(self):
+        keys = [key async for key in self.client.scan_iter(match=self.make_key('*'))]
+
+        if keys:
+            await self.client.delete(*keys)
+
+
+class InMemoryCacheService(AbstractCacheService):
+    """Process local cache with the Redis cache interface, used in tests
+    and wherever a shared cache is not needed."""
+
+    def __init__(self, namespace: str = '', timer: Callable[[], float] = time.monotonic) -> None:
+        self.namespace = namespace
+        self._timer = timer
+        self._data: dict[str, tuple[bytes, Optional[float]]] = {}
+
+    def _encode(self, value: CacheValue) -> bytes:
+        return value.encode() if isinstance(value, str) else bytes(value)
+
+    async def set_cache(self, key: str, value: CacheValue, expire: Optional[int] = None):
+        expires_at = None if expire is None else self._timer() + expire
+        self._data[self.make_key(key)] = self._encode(value), expires_at
+
+    async def set_many_cache(self, mapping: Mapping[str, CacheValue], expire: Optional[int] = None):
+        for key, value in mapping.items():
+            await self.set_cache(key, value, expire=expire)
+
+    async def get_cache(self, key: str) -> Optional[bytes]:
+        key = self.make_key(key)
+        value, expires_at = self._data.get(key, (None, None))
+
+        if expires_at is not None and expires_at <= self._timer():
+            del self._data[key]
+            return None
+        return value
+
+    async def get_many_cache(self, keys: Iterable[str]) -> list[Optional[bytes]]:
+        return [await self.get_cache(key) for key in keys]
+
+    async def delete_cache(self, *keys: str):
+        for key in keys:
+            self._data.pop(self.make_key(key), None)
+
+    async def expire(self, key: str, expire: int):
+        key = self.make_key(key)
+
+        if key in self._data:
+            self._data[key] = self._data[key][0], self._timer() + expire
+
+    async def clear_namespace(self):
+        prefix = self.make_key('*')[:-1]
 
-    async def set_cache(self, key: str, value: str):
-        self.client.set(key, value)
+        for key in [key for key in self._data if key.startswith(prefix)]:
+            del self._data[key]
 
-    async def get_cache(self, key: str) -> str:
-        return self.client.get(key)
+    def clear(self) -> None:
+        self._data.clear()
@@ -0,0 +1,108 @@
+import pytest
+
+from core.apps.cache.services import (
+    AbstractCacheService,
+    InMemoryCacheService,
+    RedisCacheService,
+)
+
+
+KEYS = ['first', 'second', 'third']
+
+
+@pytest.fixture(params=['redis', 'in_memory'])
+async def cache_service(request: pytest.FixtureRequest) -> AbstractCacheService:
+    if request.param == 'redis':
+        cache_service = RedisCacheService(namespace='tests')
+    else:
+        cache_service = InMemoryCacheService(namespace='tests')
+
+    await cache_service.delete_cache(*KEYS)
+    yield cache_service
+    await cache_service.delete_cache(*KEYS)
+
+
+@pytest.mark.asyncio
+async def test_namespaces_do_not_collide():
+    first_cache = InMemoryCacheService(namespace='first')
+    second_cache = InMemoryCacheService(namespace='second')
+
+    assert first_cache.make_key('key') == 'core:first:key'
+    assert RedisCacheService(namespace='first').make_key('key') == 'core:first:key'
+
+    await first_cache.set_cache('key', 'value')
+    assert await second_cache.get_cache('key') is None
+
+
+@pytest.mark.asyncio
+async def test_raw_and_batched_values(cache_service: AbstractCacheService):
+    await cache_service.set_cache('first', 'value')
+    assert await cache_service.get_cache('first') == b'value'
+
+    await cache_service.set_many_cache({'second': b'2', 'third': '3'})
+    assert await cache_service.get_many_cache(KEYS) == [b'value', b'2', b'3']
+    assert await cache_service.get_many_cache([]) == []
+
+    await cache_service.delete_cache('first', 'third')
+    assert await cache_service.get_many_cache(KEYS) == [None, b'2', None]
+
+
+@pytest.mark.asyncio
+async def test_serialized_values(cache_service: AbstractCacheService):
+    await cache_service.set_json_cache('first', {'language': 'ru'})
+    assert await cache_service.get_json_cache('first') == {'language': 'ru'}
+    assert await cache_service.get_json_cache('second') is None
+    await cache_service.delete_cache('first')
+
+    value = {'ids': (1, 2), 'names': {'a', 'b'}}
+    await cache_service.set_many_object_cache({'second': value, 'third': None}, expire=60)
+    assert await cache_service.get_object_cache('second') == value
+    assert await cache_service.get_many_object_cache(KEYS) == {'second': value, 'third': None}
+    assert await cache_service.get_object_cache('missing', default=0) == 0
+
+
+@pytest.mark.asyncio
+async def test_in_memory_expiration():
+    now = [0.0]
+    cache_service = InMemoryCacheService(timer=lambda: now[0])
+
+    await cache_service.set_cache('first', 'value', expire=10)
+    await cache_service.set_many_cache({'second': 'value'}, expire=20)
+    await cache_service.set_cache('third', 'value')
+    await cache_service.expire('third', 5)
+
+    now[0] = 5
+    assert await cache_service.get_many_cache(KEYS) == [b'value', b'value', None]
+
+    now[0] = 10
+    assert await cache_service.get_many_cache(KEYS) == [None, b'value', None]
+
+
+@pytest.mark.asyncio
+async def test_redis_expiration():
+    cache_service = RedisCacheService(namespace='tests')
+
+    await cache_service.set_many_cache({'first': 'value', 'second': 'value'}, expire=30)
+    await cache_service.set_cache('third', 'value')
+    await cache_service.expire('third', 60)
+
+    ttls = [await cache_service.client.ttl(cache_service.make_key(key)) for key in KEYS]
+    await cache_service.delete_cache(*KEYS)
+
+    assert 0 < ttls[0] <= 30
+    assert 0 < ttls[1] <= 30
+    assert 30 < ttls[2] <= 60
+
+
+@pytest.mark.asyncio
+async def test_clear_namespace(cache_service: AbstractCacheService):
+    cache_service_class = type(cache_service)
+    other_cache_service = cache_service_class(namespace='tests-other')
+
+    await cache_service.set_many_cache({'first': '1', 'second': '2'})
+    await other_cache_service.set_cache('first', '1')
+    await cache_service.clear_namespace()
+
+    assert await cache_service.get_many_cache(KEYS) == [None, None, None]
+    assert await other_cache_service.get_cache('first') == b'1'
+    await other_cache_service.delete_cache('first')
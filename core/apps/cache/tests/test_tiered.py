@@ -0,0 +1,138 @@
+import asyncio
+import time
+import uuid
+
+import pytest
+
+from core.apps.cache.tiered import (
+    CacheInvalidationListener,
+    invalidation_listener,
+    TieredCache,
+)
+
+
+@pytest.fixture
+def namespace() -> str:
+    return f'tests-{uuid.uuid4().hex}'
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_load_once(namespace: str):
+    cache = TieredCache(namespace)
+    loads = []
+
+    async def loader():
+        loads.append(1)
+        await asyncio.sleep(0.05)
+        return {'value': 1}
+
+    values = await asyncio.gather(*[cache.get_or_load('key', loader) for _ in range(5)])
+
+    assert values == [{'value': 1}] * 5
+    assert len(loads) == 1
+    assert await cache.get_or_load('key', loader) == {'value': 1}
+    assert len(loads) == 1
+    await cache.invalidate('key')
+
+
+@pytest.mark.asyncio
+async def test_failed_load_is_raised_to_waiters(namespace: str):
+    cache = TieredCache(namespace)
+
+    async def loader():
+        await asyncio.sleep(0.01)
+        raise ValueError('load failed')
+
+    results = await asyncio.gather(
+        *[cache.get_or_load('key', loader) for _ in range(3)],
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert await cache.get('key') is None
+
+
+@pytest.mark.asyncio
+async def test_invalidation_during_load_is_not_overwritten(namespace: str):
+    cache = TieredCache(namespace)
+    roles = ['host']
+    loading = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_loader():
+        role = roles[0]
+        loading.set()
+        await release.wait()
+        return role
+
+    async def loader():
+        return roles[0]
+
+    stale_load = asyncio.create_task(cache.get_or_load('key', slow_loader))
+    await loading.wait()
+
+    roles[0] = 'participant'
+    await cache.invalidate('key')
+    assert await cache.get_or_load('key', loader) == 'participant'
+
+    await cache.invalidate('key')
+    release.set()
+    assert await stale_load == 'host'
+    assert await cache.get('key') is None
+    assert await cache.get_or_load('key', loader) == 'participant'
+    assert cache._generations == {}
+    await cache.invalidate('key')
+
+
+@pytest.mark.asyncio
+async def test_tiers_versions_and_metrics(namespace: str):
+    first_cache = TieredCache(namespace)
+    second_cache = TieredCache(namespace)
+
+    await first_cache.set('key', [1, 2])
+
+    assert await second_cache.get('key') == [1, 2]
+    assert await second_cache.get('key') == [1, 2]
+    assert await TieredCache(namespace, version=2).get('key') is None
+
+    assert invalidation_listener.get_metrics()[namespace] == {
+        'l1_hits': 1,
+        'l2_hits': 1,
+        'misses': 1,
+        'loads': 0,
+        'invalidations': 0,
+    }
+    await first_cache.invalidate('key')
+
+
+@pytest.mark.asyncio
+async def test_invalidation_broadcast(namespace: str):
+    invalidation_listener.start()
+    first_cache = TieredCache(namespace)
+    second_cache = TieredCache(namespace)
+    # the listener drops local entries once subscribed
+    await asyncio.sleep(0.2)
+
+    await first_cache.set('key', 'value')
+    assert await second_cache.get('key') == 'value'
+
+    # echoes of invalidations of this process are skipped
+    await invalidation_listener.publish(namespace, ['v1:key'])
+    await asyncio.sleep(0.2)
+    assert second_cache._get_local('v1:key') == 'value'
+
+    # an invalidation published by another process
+    await CacheInvalidationListener().publish(namespace, ['v1:key'])
+    deadline = time.monotonic() + 2
+
+    while second_cache._get_local('v1:key') is not None and time.monotonic() < deadline:
+        await asyncio.sleep(0.02)
+
+    assert second_cache._get_local('v1:key') is None
+
+    # caches of this process are invalidated without waiting for Redis
+    assert await second_cache.get('key') == 'value'
+    await first_cache.invalidate('key')
+    assert second_cache._get_local('v1:key') is None
+    assert await second_cache.get('key') is None
+    invalidation_listener.stop()
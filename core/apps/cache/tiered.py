@@ -0,0 +1,346 @@
+import asyncio
+import json
+import logging
+import threading
+import uuid
+from dataclasses import (
+    asdict,
+    dataclass,
+)
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Iterable,
+    Optional,
+)
+
+from redis import Redis
+from redis.exceptions import RedisError
+
+from core.apps.cache.services import RedisCacheService
+from core.common.config import config
+from core.common.helpers.ttl_cache import TTLCache
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheMetrics:
+    l1_hits: int = 0
+    l2_hits: int = 0
+    misses: int = 0
+    loads: int = 0
+    invalidations: int = 0
+
+
+class TieredCache:
+    """Per-process LRU cache in front of Redis.
+
+    Keys carry `version`, so bumping it after a change of the cached
+    data shape never reads stale entries of the old one. Invalidations
+    drop the Redis entry and are broadcast to every process through the
+    invalidation listener, which drops their in-process entries.
+
+    Concurrent misses of the same key in a process wait for a single
+    load. Values are shared between callers and must not be mutated.
+    Invalidations bump the generation of keys being loaded, a load of an
+    older generation neither stores its value nor is joined by new misses.
+
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        version: int = 1,
+        l1_size: int = config.TIERED_CACHE_L1_SIZE,
+        l1_ttl: float = config.TIERED_CACHE_L1_TTL,
+        l2_ttl: int = config.TIERED_CACHE_L2_TTL,
+    ) -> None:
+        self.namespace = namespace
+        self.version = version
+        self.l2_ttl = l2_ttl
+        self.metrics = CacheMetrics()
+        self._cache_service = RedisCacheService(namespace=namespace)
+        self._local_cache = TTLCache(maxsize=l1_size, ttl=l1_ttl)
+        # invalidations are applied from the listener thread
+        self._lock = threading.Lock()
+        self._loads: dict[tuple[asyncio.AbstractEventLoop, str], tuple[asyncio.Future, int]] = {}
+        # generations of keys with loads in flight
+        self._generations: dict[str, int] = {}
+        invalidation_listener.register(self)
+
+    def _make_key(self, key: Any) -> str:
+        return f'v{self.version}:{key}'
+
+    def _get_local(self, key: str) -> Any:
+        with self._lock:
+            return self._local_cache.get(key)
+
+    def _set_local(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._local_cache.set(key, value)
+
+    def discard_local(self, keys: Optional[Iterable[str]] = None) -> None:
+        """Drops in-process entries of the keys, or all of them, and bumps
+        generations of their loads."""
+        with self._lock:
+            if keys is None:
+                self._local_cache.clear()
+                keys = list(self._generations)
+
+            for key in keys:
+                self._local_cache.pop(key)
+
+                if key in self._generations:
+                    self._generations[key] += 1
+
+    def _start_load(self, load_key: tuple[asyncio.AbstractEventLoop, str]) -> tuple[asyncio.Future, int, bool]:
+        """Returns the load of the current generation of the key, starting
+        one if there is none, and whether it was started."""
+        key = load_key[1]
+
+        with self._lock:
+            generation = self._generations.setdefault(key, 0)
+            load, load_generation = self._loads.get(load_key, (None, None))
+
+            if load is not None and load_generation == generation:
+                return load, generation, False
+
+            load = load_key[0].create_future()
+            self._loads[load_key] = load, generation
+            return load, generation, True
+
+    def _is_current(self, key: str, generation: int) -> bool:
+        with self._lock:
+            return self._generations.get(key) == generation
+
+    def _finish_load(self, load_key: tuple[asyncio.AbstractEventLoop, str], load: asyncio.Future) -> None:
+        key = load_key[1]
+
+        with self._lock:
+            if self._loads.get(load_key, (None,))[0] is load:
+                del self._loads[load_key]
+
+            if not any(other_key == key for _, other_key in self._loads):
+                self._generations.pop(key, None)
+
+    async def _get_remote(self, key: str) -> Any:
+        try:
+            return await self._cache_service.get_object_cache(key)
+        except RedisError as error:
+            logger.warning('Cache %s is read without Redis: %s', self.namespace, error)
+            return None
+
+    async def _set_remote(self, key: str, value: Any) -> None:
+        try:
+            await self._cache_service.set_object_cache(key, value, expire=self.l2_ttl)
+        except RedisError as error:
+            logger.warning('Cache %s is written without Redis: %s', self.namespace, error)
+
+    async def _delete_remote(self, keys: list[str]) -> None:
+        try:
+            await self._cache_service.delete_cache(*keys)
+        except RedisError as error:
+            logger.warning('Cache %s is invalidated without Redis: %s', self.namespace, error)
+
+    async def get(self, key: Any) -> Any:
+        key = self._make_key(key)
+        value = self._get_local(key)
+
+        if value is not None:
+            self.metrics.l1_hits += 1
+            return value
+
+        value = await self._get_remote(key)
+
+        if value is None:
+            self.metrics.misses += 1
+            return None
+
+        self.metrics.l2_hits += 1
+        self._set_local(key, value)
+        return value
+
+    async def set(self, key: Any, value: Any) -> None:
+        key = self._make_key(key)
+        self._set_local(key, value)
+        await self._set_remote(key, value)
+
+    async def get_or_load(self, key: Any, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Returns the cached value or the one returned by `loader`.
+
+        `None` values are never cached.
+
+        """
+        value = await self.get(key)
+
+        if value is not None:
+            return value
+
+        load_key = asyncio.get_running_loop(), self._make_key(key)
+        load, generation, started = self._start_load(load_key)
+
+        if not started:
+            return await asyncio.shield(load)
+
+        try:
+            self.metrics.loads += 1
+            value = await loader()
+
+            if value is not None and self._is_current(load_key[1], generation):
+                await self.set(key, value)
+
+                if not self._is_current(load_key[1], generation):
+                    # invalidated while the value was being written
+                    self.discard_local([load_key[1]])
+                    await self._delete_remote([load_key[1]])
+        except asyncio.CancelledError:
+            load.cancel()
+            raise
+        except Exception as error:
+            load.set_exception(error)
+            # waiters re-raise it, nobody else has to retrieve it
+            load.exception()
+            raise
+        else:
+            load.set_result(value)
+        finally:
+            self._finish_load(load_key, load)
+        return value
+
+    async def invalidate(self, *keys: Any) -> None:
+        keys = [self._make_key(key) for key in keys]
+
+        if not keys:
+            return
+
+        self.metrics.invalidations += 1
+        invalidation_listener.discard_local(self.namespace, keys)
+        await self._delete_remote(keys)
+        await invalidation_listener.publish(self.namespace, keys)
+
+    async def clear(self) -> None:
+        """Drops every entry of the namespace in all processes."""
+        invalidation_listener.discard_local(self.namespace)
+
+        try:
+            await self._cache_service.clear_namespace()
+        except RedisError as error:
+            logger.warning('Cache %s is cleared without Redis: %s', self.namespace, error)
+
+        await invalidation_listener.publish(self.namespace)
+
+
+class CacheInvalidationListener:
+    """Applies invalidations of tiered caches published by any process.
+
+    Every process runs one listener thread with a blocking pub/sub
+    connection, so it works the same under uvicorn workers and the huey
+    consumer, which runs tasks in short-lived event loops. Invalidations
+    are applied to caches of the publishing process right away, their
+    late echoes are skipped.
+
+    """
+
+    def __init__(self) -> None:
+        self.sender = uuid.uuid4().hex
+        self._caches: dict[str, list[TieredCache]] = {}
+        self._cache_service = RedisCacheService()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    @property
+    def channel(self) -> str:
+        return self._cache_service.make_key(config.CACHE_INVALIDATION_CHANNEL)
+
+    def register(self, cache: TieredCache) -> None:
+        self._caches.setdefault(cache.namespace, []).append(cache)
+
+    def get_metrics(self) -> dict[str, dict[str, int]]:
+        """Returns hit and miss counters summed by namespace."""
+        metrics = {}
+
+        for namespace, caches in self._caches.items():
+            namespace_metrics = CacheMetrics()
+
+            for cache in caches:
+                for name, value in asdict(cache.metrics).items():
+                    setattr(namespace_metrics, name, getattr(namespace_metrics, name) + value)
+            metrics[namespace] = asdict(namespace_metrics)
+        return metrics
+
+    async def clear_caches(self) -> None:
+        for caches in self._caches.values():
+            for cache in caches:
+                await cache.clear()
+
+    def discard_local(self, namespace: str, keys: Optional[list[str]] = None) -> None:
+        """Drops in-process entries of the keys, or all of them, from every
+        cache of the namespace."""
+        for cache in self._caches.get(namespace, []):
+            cache.discard_local(keys)
+
+    async def publish(self, namespace: str, keys: Optional[list[str]] = None) -> None:
+        message = json.dumps({'namespace': namespace, 'keys': keys, 'sender': self.sender})
+
+        try:
+            await self._cache_service.client.publish(self.channel, message)
+        except RedisError as error:
+            logger.warning('Cache %s invalidation is not published: %s', namespace, error)
+
+    def handle_message(self, data: bytes) -> None:
+        try:
+            message = json.loads(data)
+            namespace = message['namespace']
+            keys = message['keys']
+        except (ValueError, KeyError, TypeError):
+            logger.warning('Invalid cache invalidation message: %r', data)
+            return
+
+        if message.get('sender') != self.sender:
+            self.discard_local(namespace, keys)
+
+    def _listen(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                client = Redis(host=config.CACHE_SERVICE_HOST, port=config.CACHE_SERVICE_PORT)
+
+                with client.pubsub(ignore_subscribe_messages=True) as pubsub:
+                    pubsub.subscribe(self.channel)
+                    # entries cached while disconnected may have missed invalidations
+                    for caches in self._caches.values():
+                        for cache in caches:
+                            cache.discard_local()
+
+                    while not self._stopped.is_set():
+                        message = pubsub.get_message(timeout=1)
+
+                        if message is not None:
+                            self.handle_message(message['data'])
+            except RedisError as error:
+                logger.warning('Cache invalidation listener reconnects: %s', error)
+                self._stopped.wait(config.CACHE_INVALIDATION_RECONNECT_INTERVAL)
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._listen,
+            name='cache-invalidation-listener',
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stopped.set()
+
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+
+invalidation_listener = CacheInvalidationListener()
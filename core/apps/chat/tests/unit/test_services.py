@@ -3,10 +3,12 @@ import pytest
 from core.apps.chat.repositories.dialog_repository import DialogRepository
 from core.apps.chat.services.dialog_service import DialogService
 from core.apps.classroom.repositories.participation_repository import ParticipationRepository
+from core.common.database import test_engine
 from core.tests.factories.chat.dialog import DialogFactory
 from core.tests.factories.classroom.participation import ParticipationFactory
 from core.tests.factories.classroom.room import RoomFactory
 from core.tests.factories.user.user import UserFactory
+from core.tests.utils.functions import count_queries
 
 
 @pytest.mark.asyncio
@@ -139,6 +141,28 @@ async def test_are_users_roommates(
     assert await participation_repository.are_users_rommmates(users_ids=rommates_ids)
 
 
+@pytest.mark.asyncio
+async def test_are_users_roommates_single_query(
+    participation_repository: ParticipationRepository,
+):
+    room, other_room = await RoomFactory.create_batch(size=2)
+    participations = await ParticipationFactory.create_batch(size=10, room=room)
+    outsider_participation = await ParticipationFactory.create(room=other_room)
+    await ParticipationFactory.create(room=other_room, user=participations[0].user)
+    users_ids = [participation.user_id for participation in participations]
+
+    with count_queries(test_engine) as statements:
+        assert await participation_repository.are_users_rommmates(users_ids=users_ids)
+        assert not await participation_repository.are_users_rommmates(
+            users_ids=users_ids + [outsider_participation.user_id],
+        )
+        assert await participation_repository.are_users_rommmates(
+            users_ids=users_ids[:1] + [outsider_participation.user_id],
+        )
+    assert len(statements) == 3
+    assert await participation_repository.are_users_rommmates(users_ids=users_ids[:1] * 2)
+
+
 @pytest.mark.asyncio
 async def test_dialog_init_success(
     dialog_repository: DialogRepository,
@@ -0,0 +1,21 @@
+from core.apps.cache.tiered import TieredCache
+from core.common.config import config
+
+
+# roles of users in rooms by `{user_id}:{room_id}`, '' for non-members
+participation_role_cache = TieredCache(
+    namespace='participation-roles',
+    l1_ttl=config.PARTICIPATION_ROLE_CACHE_TTL,
+    l2_ttl=config.PARTICIPATION_ROLE_CACHE_REDIS_TTL,
+)
+
+# gradebooks of rooms by room id
+gradebook_cache = TieredCache(
+    namespace='gradebooks',
+    l1_ttl=config.GRADEBOOK_CACHE_TTL,
+    l2_ttl=config.GRADEBOOK_CACHE_REDIS_TTL,
+)
+
+
+def get_participation_role_key(user_id: int, room_id: int) -> str:
+    return f'{user_id}:{room_id}'
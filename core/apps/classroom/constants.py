@@ -18,6 +18,15 @@ class RoomPostType(str, Enum):
     homework = 'homework'
 
 
+class RoomExportTable(str, Enum):
+    gradebook = 'gradebook'
+    roster = 'roster'
+
+
+class RoomExportFormat(str, Enum):
+    csv = 'csv'
+
+
 ASSIGNMENTS_MANAGER = 'moderator'
 ASSIGNMENT_AUTHOR = 'author'
 
@@ -0,0 +1,83 @@
+import csv
+import io
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Iterable,
+)
+
+from core.apps.classroom.gradebook import GradebookRow
+from core.common.config import config
+
+
+# spreadsheet apps evaluate cells starting with these as formulas
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def _escape_formula(value: Any) -> Any:
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return f"'{value}"
+    return value
+
+
+def _escape_row(row: Iterable[Any]) -> list[Any]:
+    return [_escape_formula(value) for value in row]
+
+
+async def stream_csv(
+    header: Iterable[Any],
+    rows: AsyncIterable[Iterable[Any]],
+) -> AsyncIterator[str]:
+    """Yields CSV of the rows in chunks of `EXPORT_STREAM_BATCH_SIZE` rows,
+    so memory use does not depend on the number of rows.
+
+    Starts with a byte order mark, otherwise Excel misreads UTF-8. String
+    cells which would be read as formulas are prefixed with `'`.
+
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write('\ufeff')
+    writer.writerow(_escape_row(header))
+    buffered_rows = 0
+
+    async for row in rows:
+        writer.writerow(_escape_row(row))
+        buffered_rows += 1
+
+        if buffered_rows >= config.EXPORT_STREAM_BATCH_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            buffered_rows = 0
+    yield buffer.getvalue()
+
+
+async def iter_gradebook_rows(
+    rows: AsyncIterable[GradebookRow],
+    post_ids: list[int],
+) -> AsyncIterator[list[Any]]:
+    """Yields a row of status and rate of every post per student.
+
+    Rows of a student are expected to be consecutive, so only one student
+    is kept in memory. Posts missing in `post_ids` are left out.
+
+    """
+    post_indexes = {post_id: index for index, post_id in enumerate(post_ids)}
+    user_id, student_row = None, None
+
+    async for row_user_id, first_name, last_name, post_id, _, status, rate in rows:
+        if row_user_id != user_id:
+            if student_row is not None:
+                yield student_row
+            user_id, student_row = row_user_id, [last_name, first_name] + [''] * 2 * len(post_ids)
+
+        post_index = post_indexes.get(post_id)
+
+        if post_index is not None and status is not None:
+            student_row[2 + 2 * post_index] = status.value
+            student_row[3 + 2 * post_index] = '' if rate is None else rate
+
+    if student_row is not None:
+        yield student_row
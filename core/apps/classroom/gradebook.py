@@ -0,0 +1,109 @@
+import warnings
+from typing import (
+    Iterable,
+    Optional,
+)
+
+import numpy as np
+
+from core.apps.classroom.constants import HomeWorkAssignmentStatus
+from core.apps.classroom.schemas.gradebook import (
+    GradebookCellSchema,
+    GradebookPostSchema,
+    GradebookSchema,
+    GradebookStatisticsSchema,
+    GradebookStudentSchema,
+)
+
+
+# user id, first name, last name, post id, post title, assignment status, rate
+GradebookRow = tuple[int, str, str, Optional[int], Optional[str], Optional[str], Optional[int]]
+
+
+def _to_optional(values: np.ndarray) -> list[Optional[float]]:
+    return [None if np.isnan(value) else round(float(value), 2) for value in values]
+
+
+def get_statistics(rates: np.ndarray, done: np.ndarray, axis: int) -> list[GradebookStatisticsSchema]:
+    """Returns mean and median rates and completion percents along the
+    axis, 0 for posts and 1 for students.
+
+    Unrated assignments are `NaN` in `rates` and are left out of the rate
+    statistics.
+
+    """
+    rated_counts = np.count_nonzero(~np.isnan(rates), axis=axis)
+    means = np.divide(
+        np.nansum(rates, axis=axis),
+        rated_counts,
+        out=np.full(rated_counts.shape, np.nan),
+        where=rated_counts > 0,
+    )
+
+    with warnings.catch_warnings():
+        # slices without rates have no median
+        warnings.simplefilter('ignore', RuntimeWarning)
+        medians = np.nanmedian(rates, axis=axis)
+
+    completions = np.count_nonzero(done, axis=axis) * 100 / max(rates.shape[axis], 1)
+    return [
+        GradebookStatisticsSchema(mean_rate=mean, median_rate=median, completion=round(float(completion), 2))
+        for mean, median, completion in zip(_to_optional(means), _to_optional(medians), completions)
+    ]
+
+
+def build_gradebook(rows: Iterable[GradebookRow]) -> GradebookSchema:
+    """Builds the students by posts matrix of the rows.
+
+    Rows are expected in the order of students and then posts, each pair
+    of them appears once.
+
+    """
+    students: dict[int, GradebookStudentSchema] = {}
+    posts: dict[int, GradebookPostSchema] = {}
+    assignments: list[tuple[int, int, str, Optional[int]]] = []
+
+    for user_id, first_name, last_name, post_id, title, status, rate in rows:
+        if user_id not in students:
+            students[user_id] = GradebookStudentSchema(
+                id=user_id,
+                first_name=first_name,
+                last_name=last_name,
+            )
+        if post_id is None:
+            continue
+        if post_id not in posts:
+            posts[post_id] = GradebookPostSchema(id=post_id, title=title)
+        if status is not None:
+            assignments.append((user_id, post_id, status, rate))
+
+    student_indexes = {user_id: index for index, user_id in enumerate(students)}
+    post_indexes = {post_id: index for index, post_id in enumerate(posts)}
+    cells: list[list[Optional[GradebookCellSchema]]] = [[None] * len(posts) for _ in students]
+    rates = np.full((len(students), len(posts)), np.nan)
+    done = np.zeros((len(students), len(posts)), dtype=bool)
+
+    if assignments:
+        user_ids, post_ids, statuses, assignment_rates = zip(*assignments)
+        row_indexes = np.fromiter(map(student_indexes.get, user_ids), dtype=np.intp)
+        column_indexes = np.fromiter(map(post_indexes.get, post_ids), dtype=np.intp)
+        rates[row_indexes, column_indexes] = np.array(assignment_rates, dtype=float)
+        done[row_indexes, column_indexes] = np.fromiter(
+            (status == HomeWorkAssignmentStatus.done for status in statuses),
+            dtype=bool,
+            count=len(statuses),
+        )
+
+        for row_index, column_index, status, rate in zip(row_indexes, column_indexes, statuses, assignment_rates):
+            cells[row_index][column_index] = GradebookCellSchema(status=status, rate=rate)
+
+    for student, statistics in zip(students.values(), get_statistics(rates, done, axis=1)):
+        student.statistics = statistics
+    for post, statistics in zip(posts.values(), get_statistics(rates, done, axis=0)):
+        post.statistics = statistics
+
+    return GradebookSchema(
+        students=list(students.values()),
+        posts=list(posts.values()),
+        cells=cells,
+    )
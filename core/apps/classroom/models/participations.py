@@ -29,6 +29,8 @@ class Participation(BaseDBModel, AuthorAbstract):
         sa.Integer,
         sa.ForeignKey('rooms.id', ondelete='CASCADE'),
         nullable=False,
+        # the unique constraint leads with user_id
+        index=True,
     )
     room = relationship(
         'Room',
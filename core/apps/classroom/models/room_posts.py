@@ -1,12 +1,14 @@
 import sqlalchemy as sa
 from sqlalchemy.orm import (
     backref,
+    deferred,
     relationship,
 )
 
 from core.apps.classroom.constants import RoomPostType
 from core.common.models.base import BaseDBModel
 from core.common.models.mixins import AuthorAbstract
+from core.common.models.types import TSVector
 
 
 class AttachmentsCountMixin:
@@ -26,6 +28,14 @@ class RoomPost(BaseDBModel, AttachmentsCountMixin, AuthorAbstract):
         sa.Enum(RoomPostType),
         default=RoomPostType.material,
     )
+    # generated by Postgres from the weighted title, description and text
+    search_vector = deferred(
+        sa.Column(
+            TSVector,
+            server_default=sa.FetchedValue(),
+            server_onupdate=sa.FetchedValue(),
+        ),
+    )
 
     # relations
     room_id: int = sa.Column(
@@ -1,14 +1,115 @@
+from contextlib import asynccontextmanager
+from typing import (
+    Any,
+    AsyncIterator,
+)
+
+from sqlalchemy import (
+    and_,
+    select,
+)
+
+from core.apps.classroom.cache import gradebook_cache
+from core.apps.classroom.constants import (
+    ParticipationRoleEnum,
+    RoomPostType,
+)
+from core.apps.classroom.gradebook import GradebookRow
 from core.apps.classroom.models import (
     HomeworkAssignment,
+    Participation,
     RoomPost,
 )
+from core.apps.users.models import User
+from core.common.config import config
 from core.common.repositories.base import CRUDRepository
 
 
 class HomeworkAssignmentRepository(CRUDRepository):
+    """Homework assignments repository.
+
+    Every write through the repository invalidates gradebooks of the
+    affected rooms.
+
+    """
     _model: type[HomeworkAssignment] = HomeworkAssignment
     _post_model: type[RoomPost] = RoomPost
 
+    async def _get_room_ids(self, **filters) -> list[int]:
+        async with self.get_session() as session:
+            result = await session.execute(
+                select(self._post_model.room_id).join(
+                    self._model,
+                    self._model.post_id == self._post_model.id,
+                ).filter_by(**filters).distinct(),
+            )
+            return result.scalars().all()
+
+    async def create(self, join: list[str] = None, **kwargs) -> HomeworkAssignment:
+        assignment = await super().create(join=join, **kwargs)
+        await gradebook_cache.invalidate(*await self._get_room_ids(id=assignment.id))
+        return assignment
+
+    @asynccontextmanager
+    async def _updating(self, values: dict[str, Any], **filters) -> AsyncIterator[None]:
+        room_ids = await self._get_room_ids(**filters)
+        yield
+        await gradebook_cache.invalidate(*room_ids)
+
+    async def delete(self, **filters):
+        room_ids = await self._get_room_ids(**filters)
+        deleted_rows = await super().delete(**filters)
+        await gradebook_cache.invalidate(*room_ids)
+        return deleted_rows
+
+    def _get_gradebook_rows_statement(self, room_id: int):
+        """Selects assignment status and rate of every student of the room
+        for every homework post, rows of a student are consecutive.
+
+        Rooms without homeworks have a row with empty post per student.
+
+        """
+        return select(
+            User.id,
+            User.first_name,
+            User.last_name,
+            self._post_model.id,
+            self._post_model.title,
+            self._model.status,
+            self._model.rate,
+        ).select_from(Participation).join(
+            User,
+            User.id == Participation.user_id,
+        ).outerjoin(
+            self._post_model,
+            and_(
+                self._post_model.room_id == Participation.room_id,
+                self._post_model.type == RoomPostType.homework,
+            ),
+        ).outerjoin(
+            self._model,
+            and_(
+                self._model.post_id == self._post_model.id,
+                self._model.author_id == Participation.user_id,
+            ),
+        ).filter(
+            Participation.room_id == room_id,
+            Participation.role == ParticipationRoleEnum.participant,
+        ).order_by(
+            User.last_name,
+            User.first_name,
+            User.id,
+            self._post_model.created_at,
+            self._post_model.id,
+        )
+
+    async def fetch_gradebook_rows(self, room_id: int) -> list[GradebookRow]:
+        statement = self._get_gradebook_rows_statement(room_id)
+
+        async with self.get_session() as session:
+            result = await session.execute(statement)
+            return result.all()
+
     async def fetch_by_post_id(
         self,
         post_id: int,
@@ -60,3 +161,26 @@ class HomeworkAssignmentRepository(CRUDRepository):
         async with self.get_session() as session:
             result = await session.execute(statement)
             return result.unique().scalars().all()
+
+    async def stream_gradebook_rows(self, room_id: int) -> AsyncIterator[GradebookRow]:
+        """Yields gradebook rows from a server-side cursor."""
+        statement = self._get_gradebook_rows_statement(room_id)
+
+        async with self._stream_statement(statement, yield_per=config.EXPORT_STREAM_BATCH_SIZE) as result:
+            async for row in result:
+                yield row
+
+    async def fetch_homework_posts(self, room_id: int) -> list[tuple[int, str]]:
+        """Returns ids and titles of homework posts of the room in the
+        order of gradebook columns."""
+        async with self.get_session() as session:
+            result = await session.execute(
+                select(self._post_model.id, self._post_model.title).filter(
+                    self._post_model.room_id == room_id,
+                    self._post_model.type == RoomPostType.homework,
+                ).order_by(
+                    self._post_model.created_at,
+                    self._post_model.id,
+                ),
+            )
+            return result.all()
@@ -1,12 +1,119 @@
-from sqlalchemy import select
+from contextlib import asynccontextmanager
+from typing import (
+    Any,
+    AsyncIterator,
+    Optional,
+)
 
+from sqlalchemy import (
+    and_,
+    func,
+    select,
+)
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import aliased
+
+from core.apps.classroom.cache import (
+    get_participation_role_key,
+    gradebook_cache,
+    participation_role_cache,
+)
+from core.apps.classroom.constants import ParticipationRoleEnum
 from core.apps.classroom.models import Participation
+from core.apps.users.models import User
+from core.common.config import config
 from core.common.repositories.base import CRUDRepository
 
 
 class ParticipationRepository(CRUDRepository):
+    """Participations repository.
+
+    Roles are cached across requests, every write through the repository
+    invalidates roles of the affected participations and gradebooks of
+    their rooms.
+
+    """
     _model: type[Participation] = Participation
 
+    async def retrieve_role(
+        self,
+        user_id: int,
+        room_id: int,
+    ) -> Optional[ParticipationRoleEnum]:
+        """Returns role of the user in the room, `None` for non-members."""
+        async def load_role() -> str:
+            role = await self.get_scalar(
+                select(self._model.role).filter_by(user_id=user_id, room_id=room_id),
+            )
+            return role.value if role is not None else ''
+
+        role = await participation_role_cache.get_or_load(
+            get_participation_role_key(user_id, room_id),
+            load_role,
+        )
+        return ParticipationRoleEnum(role) if role else None
+
+    async def _get_memberships(self, **filters) -> list[tuple[int, int]]:
+        if 'user_id' in filters and 'room_id' in filters:
+            return [(filters['user_id'], filters['room_id'])]
+
+        async with self.get_session() as session:
+            result = await session.execute(
+                select(self._model.user_id, self._model.room_id).filter_by(**filters),
+            )
+            return result.all()
+
+    async def _invalidate_memberships(self, memberships: list[tuple[int, int]]) -> None:
+        await participation_role_cache.invalidate(
+            *[get_participation_role_key(user_id, room_id) for user_id, room_id in memberships],
+        )
+        await gradebook_cache.invalidate(*{room_id for _, room_id in memberships})
+
+    async def create(self, join: list[str] = None, **kwargs) -> Participation:
+        participation = await super().create(join=join, **kwargs)
+        await self._invalidate_memberships([(participation.user_id, participation.room_id)])
+        return participation
+
+    @asynccontextmanager
+    async def _updating(self, values: dict[str, Any], **filters) -> AsyncIterator[None]:
+        memberships = await self._get_memberships(**filters)
+        yield
+
+        if {'user_id', 'room_id'} & values.keys():
+            memberships += await self._get_memberships(**{**filters, **values})
+        await self._invalidate_memberships(memberships)
+
+    async def delete(self, **filters):
+        memberships = await self._get_memberships(**filters)
+        deleted_rows = await super().delete(**filters)
+        await self._invalidate_memberships(memberships)
+        return deleted_rows
+
+    async def stream_roster(self, room_id: int) -> AsyncIterator[Row]:
+        """Yields names, emails, roles and join dates of the room members
+        from a server-side cursor."""
+        statement = select(
+            User.last_name,
+            User.first_name,
+            User.middle_name,
+            User.email,
+            self._model.role,
+            self._model.created_at,
+        ).join(
+            User,
+            User.id == self._model.user_id,
+        ).filter(
+            self._model.room_id == room_id,
+        ).order_by(
+            User.last_name,
+            User.first_name,
+            User.id,
+        )
+
+        async with self._stream_statement(statement, yield_per=config.EXPORT_STREAM_BATCH_SIZE) as result:
+            async for row in result:
+                yield row
+
     async def count_room_members(self, room_id: int):
         return await self.count(room_id=room_id)
 
@@ -24,20 +131,38 @@ class ParticipationRepository(CRUDRepository):
             return roommates_ids
 
     async def is_user_roommate(self, user_id: int, other_user_id: int) -> bool:
-        return other_user_id in await self.get_user_roommates(user_id=user_id)
+        return await self.are_users_rommmates(users_ids=[user_id, other_user_id])
 
     async def are_users_rommmates(self, users_ids: list[int]) -> bool:
-        users_ids_length = len(users_ids)
-        are_roommates = True
-
-        for user_index in range(users_ids_length - 1):
-            for other_user_index in range(user_index + 1, users_ids_length):
-                if not await self.is_user_roommate(
-                    user_id=users_ids[user_index],
-                    other_user_id=users_ids[other_user_index],
-                ):
-                    are_roommates = False
-                    break
-            if not are_roommates:
-                break
-        return are_roommates
+        """Returns whether every pair of the users shares a room.
+
+        Pairs sharing a room are counted by a single self-join of the
+        participations, so the check costs one query for any number of
+        users.
+
+        """
+        users_ids = set(users_ids)
+
+        if len(users_ids) < 2:
+            return True
+
+        participation = aliased(self._model)
+        other_participation = aliased(self._model)
+        roommate_pairs = select(
+            participation.user_id,
+            other_participation.user_id,
+        ).join(
+            other_participation,
+            and_(
+                other_participation.room_id == participation.room_id,
+                other_participation.user_id > participation.user_id,
+            ),
+        ).filter(
+            participation.user_id.in_(users_ids),
+            other_participation.user_id.in_(users_ids),
+        ).distinct().subquery()
+
+        roommate_pairs_count = await self.get_scalar(
+            select(func.count()).select_from(roommate_pairs),
+        )
+        return roommate_pairs_count == len(users_ids) * (len(users_ids) - 1) // 2
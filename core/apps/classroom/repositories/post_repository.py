@@ -1,11 +1,97 @@
+from contextlib import asynccontextmanager
+from typing import (
+    Any,
+    AsyncIterator,
+)
+
+import sqlalchemy as sa
+from sqlalchemy import func
+
+from core.apps.classroom.cache import gradebook_cache
 from core.apps.classroom.models import RoomPost
+from core.common.config import config
 from core.common.repositories.base import CRUDRepository
+from core.common.repositories.search import is_postgresql
 
 
 class RoomPostRepository(CRUDRepository):
+    """Room posts repository.
+
+    Every write through the repository invalidates gradebooks of the
+    affected rooms.
+
+    """
     _model: type[RoomPost] = RoomPost
 
-    async def search_fetch(
+    async def _get_room_ids(self, **filters) -> list[int]:
+        async with self.get_session() as session:
+            result = await session.execute(
+                sa.select(self._model.room_id).filter_by(**filters).distinct(),
+            )
+            return result.scalars().all()
+
+    async def create(self, join: list[str] = None, **kwargs) -> RoomPost:
+        post = await super().create(join=join, **kwargs)
+        await gradebook_cache.invalidate(post.room_id)
+        return post
+
+    @asynccontextmanager
+    async def _updating(self, values: dict[str, Any], **filters) -> AsyncIterator[None]:
+        room_ids = await self._get_room_ids(**filters)
+        yield
+
+        if 'room_id' in values:
+            room_ids.append(values['room_id'])
+        await gradebook_cache.invalidate(*room_ids)
+
+    async def delete(self, **filters):
+        room_ids = await self._get_room_ids(**filters)
+        deleted_rows = await super().delete(**filters)
+        await gradebook_cache.invalidate(*room_ids)
+        return deleted_rows
+
+    def _get_search_config(self):
+        return sa.literal_column(f"'{config.POST_SEARCH_CONFIG}'::regconfig")
+
+    async def _full_text_search_statement(
+        self,
+        ordering: list[str] = None,
+        join: list[str] = None,
+        offset: int = None,
+        limit: int = None,
+        search: str = '',
+        **filters,
+    ):
+        """Returns posts matching the search with their rank and highlighted
+        snippet, best matches first.
+
+        Served by the GIN index over the generated `search_vector` column.
+
+        """
+        search_config = self._get_search_config()
+        query = func.websearch_to_tsquery(search_config, search)
+        rank = func.ts_rank(self._model.search_vector, query)
+        headline = func.ts_headline(
+            search_config,
+            func.concat_ws(' ', self._model.description, self._model.text),
+            query,
+            config.POST_SEARCH_HEADLINE_OPTIONS,
+        )
+        statement = await self._fetch_statement(
+            join=join,
+            limit=limit,
+            offset=offset,
+            **filters,
+        )
+        statement = statement.add_columns(
+            rank.label('search_rank'),
+            headline.label('search_headline'),
+        ).filter(
+            self._model.search_vector.op('@@')(query),
+        ).order_by(rank.desc())
+        return await self._order_query(statement, ordering)
+
+    async def _pattern_search_statement(
         self,
         ordering: list[str] = None,
         join: list[str] = None,
@@ -21,8 +107,7 @@ class RoomPostRepository(CRUDRepository):
             offset=offset,
             **filters,
         )
-
-        statement = statement.filter(
+        return statement.filter(
             (
                 self._model.title.ilike(f'%{search}%')
                 | self._model.text.ilike(f'%{search}%')
@@ -30,6 +115,48 @@ class RoomPostRepository(CRUDRepository):
             ),
         )
 
+    async def search_fetch(
+        self,
+        ordering: list[str] = None,
+        join: list[str] = None,
+        offset: int = None,
+        limit: int = None,
+        search: str = '',
+        **filters,
+    ):
+        """Returns posts matching the search.
+
+        Postgres uses full-text search, posts get `search_rank` and
+        `search_headline` attributes. Other databases fall back to
+        substring matching.
+
+        """
         async with self.get_session() as session:
+            if not is_postgresql(session):
+                statement = await self._pattern_search_statement(
+                    ordering,
+                    join,
+                    offset=offset,
+                    limit=limit,
+                    search=search,
+                    **filters,
+                )
+                result = await session.execute(statement)
+                return result.unique().scalars().all()
+
+            statement = await self._full_text_search_statement(
+                ordering,
+                join,
+                offset=offset,
+                limit=limit,
+                search=search,
+                **filters,
+            )
             result = await session.execute(statement)
-            return result.unique().scalars().all()
+            posts = []
+
+            for post, search_rank, search_headline in result.unique().all():
+                post.search_rank = search_rank
+                post.search_headline = search_headline
+                posts.append(post)
+            return posts
@@ -4,36 +4,129 @@ from typing import (
 )
 
 from sqlalchemy import (
+    case,
+    cast,
+    column,
+    delete,
+    func,
+    Integer,
+    literal,
     select,
     update,
+    values,
 )
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.apps.classroom.models.topics import Topic
 from core.common.repositories.base import CRUDRepository
+from core.common.repositories.search import (
+    is_postgresql,
+    set_trigram_threshold,
+    trigram_match,
+)
 
 
 class TopicRepository(CRUDRepository):
     _model: type[Topic] = Topic
 
-    async def _displace_orders(self, room_id: int, session: AsyncSession):
-        statement = select(self._model).where(
-            self._model.room_id == room_id,
-        ).order_by(
-            self._model.order.asc(),
+    def _get_compacted_orders(self, room_ids: Iterable[int]):
+        return select(
+            self._model.id,
+            func.row_number().over(
+                partition_by=self._model.room_id,
+                order_by=(self._model.order.asc(), self._model.id.asc()),
+            ).label('order'),
+        ).filter(
+            self._model.room_id.in_(room_ids),
+        ).subquery('compacted_orders')
+
+    def _join_compact_statement(self, room_ids: Iterable[int]):
+        compacted_orders = self._get_compacted_orders(room_ids)
+        return update(self._model).where(
+            self._model.id == compacted_orders.c.id,
+            self._model.order.is_distinct_from(compacted_orders.c.order),
+        ).values(order=compacted_orders.c.order)
+
+    def _subquery_compact_statement(self, room_ids: Iterable[int]):
+        compacted_orders = self._get_compacted_orders(room_ids)
+        return update(self._model).where(
+            self._model.room_id.in_(room_ids),
+        ).values(
+            order=select(compacted_orders.c.order).where(
+                compacted_orders.c.id == self._model.id,
+            ).scalar_subquery(),
         )
-        existing_topics_in_room = (await session.execute(statement)).scalars().all()
 
-        for index, topic in enumerate(existing_topics_in_room, 1):
-            topic.order = index
+    async def _compact_orders(self, room_ids: Iterable[int], session: AsyncSession):
+        """Renumbers topics of the rooms from 1 without gaps in a single
+        statement.
+
+        Postgres joins the window-numbered topics, other databases,
+        e.g. the sqlite test database, look them up per row.
+
+        """
+        room_ids = list(room_ids)
 
-        session.add_all(existing_topics_in_room)
+        if is_postgresql(session):
+            statement = self._join_compact_statement(room_ids)
+        else:
+            statement = self._subquery_compact_statement(room_ids)
+        await session.execute(statement.execution_options(synchronize_session=False))
 
     async def delete_and_displace_orders(self, instances: Iterable[_model]):
+        instances = list(instances)
+
+        async with self.get_session() as session:
+            await session.execute(
+                delete(self._model).where(
+                    self._model.id.in_([instance.id for instance in instances]),
+                ),
+            )
+            await self._compact_orders({instance.room_id for instance in instances}, session)
+            await session.commit()
+
+    def _values_reorder_statement(self, room_id: int, topic_ids: list[int]):
+        # postgres resolves untyped VALUES parameters as text
+        new_orders = values(
+            column('id', Integer),
+            column('order', Integer),
+            name='new_orders',
+        ).data([
+            (cast(literal(topic_id), Integer), cast(literal(order), Integer))
+            for order, topic_id in enumerate(topic_ids, 1)
+        ])
+        return update(self._model).where(
+            self._model.id == new_orders.c.id,
+            self._model.room_id == room_id,
+        ).values(order=new_orders.c.order)
+
+    def _case_reorder_statement(self, room_id: int, topic_ids: list[int]):
+        return update(self._model).where(
+            self._model.id.in_(topic_ids),
+            self._model.room_id == room_id,
+        ).values(
+            order=case(
+                {topic_id: order for order, topic_id in enumerate(topic_ids, 1)},
+                value=self._model.id,
+            ),
+        )
+
+    async def get_room_topic_ids(self, room_id: int) -> list[int]:
         async with self.get_session() as session:
-            for instance in instances:
-                await session.delete(instance)
-                await self._displace_orders(instance.room_id, session=session)
+            result = await session.execute(
+                select(self._model.id).filter(self._model.room_id == room_id),
+            )
+            return result.scalars().all()
+
+    async def reorder(self, room_id: int, topic_ids: list[int]) -> None:
+        """Orders topics of the room as listed in a single statement."""
+        async with self.get_session() as session:
+            if is_postgresql(session):
+                statement = self._values_reorder_statement(room_id, topic_ids)
+            else:
+                # SQLAlchemy renders no UPDATE ... FROM for sqlite
+                statement = self._case_reorder_statement(room_id, topic_ids)
+            await session.execute(statement.execution_options(synchronize_session=False))
             await session.commit()
 
     async def change_orders(
@@ -94,6 +187,13 @@ class TopicRepository(CRUDRepository):
         offset: int = 0,
         search: str = '',
     ) -> list[_model]:
+        """Returns topics of the room in order.
+
+        On Postgres searched topics are matched by title with typos and
+        ordered by similarity, other databases fall back to substring
+        matching.
+
+        """
         fetch_statement = await self._fetch_statement(
             limit=limit,
             offset=offset,
@@ -101,13 +201,18 @@ class TopicRepository(CRUDRepository):
 
         fetch_statement = fetch_statement.filter(
             self._model.room_id == room_id,
-        ).order_by(self._model.order.asc())
-
-        if search:
-            fetch_statement = fetch_statement.filter(
-                self._model.title.ilike(f'%{search}%'),
-            )
+        )
 
         async with self.get_session() as session:
+            if search and is_postgresql(session):
+                condition, rank = trigram_match(self._model.title, search)
+                fetch_statement = fetch_statement.filter(condition).order_by(rank.desc())
+                await set_trigram_threshold(session)
+            elif search:
+                fetch_statement = fetch_statement.filter(
+                    self._model.title.ilike(f'%{search}%'),
+                )
+
+            fetch_statement = fetch_statement.order_by(self._model.order.asc())
             result = await session.execute(fetch_statement)
             return result.scalars().all()
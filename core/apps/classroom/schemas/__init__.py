@@ -5,6 +5,13 @@ from .assignments import (
     HomeworkAssignmentRateSchema,
     HomeworkAssignmentRequestChangesSchema,
 )
+from .gradebook import (
+    GradebookCellSchema,
+    GradebookPostSchema,
+    GradebookSchema,
+    GradebookStatisticsSchema,
+    GradebookStudentSchema,
+)
 from .participations import (
     ParticipationCreateByJoinSlugSchema,
     ParticipationCreateSchema,
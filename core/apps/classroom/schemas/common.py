@@ -46,6 +46,9 @@ class RoomPostListItemSchema(NormalizedDatetimeModel):
     room_id: int
     type: str
     topic: Optional[TopicNestedSchema] = None
+    # set by full-text search only
+    search_rank: Optional[float] = None
+    search_headline: Optional[str] = None
 
     class Config(NormalizedDatetimeModel.Config):
         orm_mode = True
@@ -0,0 +1,36 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+from core.apps.classroom.constants import HomeWorkAssignmentStatus
+
+
+class GradebookStatisticsSchema(BaseModel):
+    mean_rate: Optional[float] = None
+    median_rate: Optional[float] = None
+    completion: float = 0
+
+
+class GradebookStudentSchema(BaseModel):
+    id: int
+    first_name: str
+    last_name: str
+    statistics: GradebookStatisticsSchema = GradebookStatisticsSchema()
+
+
+class GradebookPostSchema(BaseModel):
+    id: int
+    title: str
+    statistics: GradebookStatisticsSchema = GradebookStatisticsSchema()
+
+
+class GradebookCellSchema(BaseModel):
+    status: HomeWorkAssignmentStatus
+    rate: Optional[int] = None
+
+
+class GradebookSchema(BaseModel):
+    students: list[GradebookStudentSchema] = []
+    posts: list[GradebookPostSchema] = []
+    # rows of students by columns of posts, `None` for missing assignments
+    cells: list[list[Optional[GradebookCellSchema]]] = []
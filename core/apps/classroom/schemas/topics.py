@@ -13,6 +13,10 @@ class TopicUpdateSchema(BaseModel):
     order: Optional[int] = None
 
 
+class TopicOrderSchema(BaseModel):
+    topic_ids: list[int]
+
+
 class TopicRetrieveSchema(TopicCreateSchema):
     id: int
     order: int
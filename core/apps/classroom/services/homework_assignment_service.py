@@ -1,6 +1,11 @@
 from functools import partialmethod
-from typing import Union
+from typing import (
+    AsyncIterator,
+    Optional,
+    Union,
+)
 
+from core.apps.classroom.cache import gradebook_cache
 from core.apps.classroom.constants import (
     ASSIGNMENT_AUTHOR,
     ASSIGNMENT_STATUS_MUTATIONS,
@@ -8,26 +13,33 @@ from core.apps.classroom.constants import (
     HomeWorkAssignmentStatus,
     RoomPostType,
 )
+from core.apps.classroom.exports import (
+    iter_gradebook_rows,
+    stream_csv,
+)
+from core.apps.classroom.gradebook import build_gradebook
 from core.apps.classroom.models import (
     HomeworkAssignment,
     Participation,
 )
 from core.apps.classroom.repositories.assignment import HomeworkAssignmentRepository
-from core.apps.classroom.repositories.participation_repository import ParticipationRepository
 from core.apps.classroom.repositories.post_repository import RoomPostRepository
 from core.apps.classroom.repositories.room_repository import RoomRepository
-from core.apps.classroom.schemas import HomeworkAssignmentRequestChangesSchema
+from core.apps.classroom.schemas import (
+    GradebookSchema,
+    HomeworkAssignmentRequestChangesSchema,
+)
+from core.apps.classroom.services.mixins import ParticipationMixin
 from core.apps.localization.utils import translate as _
 from core.common.services.author import AuthorMixin
 from core.common.services.base import CRUDService
 from core.common.services.decorators import action
 
 
-class AssignmentService(AuthorMixin, CRUDService):
+class AssignmentService(ParticipationMixin, AuthorMixin, CRUDService):
     _repository: HomeworkAssignmentRepository = HomeworkAssignmentRepository()
     _room_repository: RoomRepository = RoomRepository()
     _room_post_repository: RoomPostRepository = RoomPostRepository()
-    _participation_repository: ParticipationRepository = ParticipationRepository()
 
     def _check_is_status_restricted(self, assignment: HomeworkAssignment):
         return assignment.status == HomeWorkAssignmentStatus.done
@@ -46,10 +58,7 @@ class AssignmentService(AuthorMixin, CRUDService):
         ):
             return None, ('Homework is already assigned by this user.')
 
-        participation: Participation = await self._participation_repository.retrieve(
-            user_id=self.user.id,
-            room_id=assigned_post.room_id,
-        )
+        participation: Participation = await self.get_participation(assigned_post.room_id)
 
         if not participation:
             return None, _('You are not participating in this room.')
@@ -73,10 +82,7 @@ class AssignmentService(AuthorMixin, CRUDService):
             join=join,
         )
 
-        participation: Participation = await self._participation_repository.retrieve(
-            room_id=room.id,
-            user_id=self.user.id,
-        )
+        participation: Participation = await self.get_participation(room.id)
 
         if not participation:
             return None, {'error': _('You are not allowed to do that')}
@@ -94,10 +100,7 @@ class AssignmentService(AuthorMixin, CRUDService):
         if join is None:
             join = []
 
-        participation: Participation = await self._participation_repository.retrieve(
-            room_id=room_id,
-            user_id=self.user.id,
-        )
+        participation: Participation = await self.get_participation(room_id)
 
         if not participation:
             return None, {'error': _('You are not allowed to do that.')}
@@ -119,15 +122,50 @@ class AssignmentService(AuthorMixin, CRUDService):
                 None,
             )
 
+    @action
+    async def fetch_gradebook(
+        self,
+        room_id: int,
+    ) -> tuple[Optional[GradebookSchema], Optional[dict[str, str]]]:
+        participation: Participation = await self.get_participation(room_id)
+
+        if not participation or not participation.can_manage_assignments:
+            return None, {'error': _('You are not allowed to do that.')}
+
+        async def load_gradebook() -> GradebookSchema:
+            return build_gradebook(await self._repository.fetch_gradebook_rows(room_id))
+
+        return await gradebook_cache.get_or_load(room_id, load_gradebook), None
+
+    @action
+    async def export_gradebook(
+        self,
+        room_id: int,
+    ) -> tuple[Optional[AsyncIterator[str]], Optional[dict[str, str]]]:
+        """Returns CSV of the room gradebook streamed from the database."""
+        participation: Participation = await self.get_participation(room_id)
+
+        if not participation or not participation.can_manage_assignments:
+            return None, {'error': _('You are not allowed to do that.')}
+
+        posts = await self._repository.fetch_homework_posts(room_id)
+        header = [_('Last name'), _('First name')]
+
+        for _post_id, title in posts:
+            header += [f'{title}: {_("status")}', f'{title}: {_("rate")}']
+
+        rows = iter_gradebook_rows(
+            self._repository.stream_gradebook_rows(room_id),
+            post_ids=[post_id for post_id, _title in posts],
+        )
+        return stream_csv(header, rows), None
+
     async def _check_assignment_rights(
         self,
         assignment: HomeworkAssignment,
         status: str,
     ) -> tuple[bool, Union[str, None]]:
-        participation: Participation = await self._participation_repository.retrieve(
-            user_id=self.user.id,
-            room_id=assignment.post.room_id,
-        )
+        participation: Participation = await self.get_participation(assignment.post.room_id)
 
         is_moderator = False
 
@@ -191,10 +229,7 @@ class AssignmentService(AuthorMixin, CRUDService):
             join=['attachments', 'author', 'post', 'post.room'],
             id=id,
         )
-        participation: Participation = await self._participation_repository.retrieve(
-            user_id=self.user.id,
-            room_id=assignment.post.room_id,
-        )
+        participation: Participation = await self.get_participation(assignment.post.room_id)
         if (
             not participation.can_manage_assignments
             and assignment.author_id != self.user.id
@@ -0,0 +1,32 @@
+from typing import Optional
+
+from core.apps.classroom.models import Participation
+from core.apps.classroom.repositories.participation_repository import ParticipationRepository
+
+
+class ParticipationMixin:
+    """Resolves participations of the service user.
+
+    Roles come from the cross-request role cache and are memoized by the
+    service instance, which lives for a single request, so repeated
+    permission checks cost nothing.
+
+    """
+    _participation_repository: ParticipationRepository = ParticipationRepository()
+
+    async def get_participation(self, room_id: int) -> Optional[Participation]:
+        """Returns a detached participation with the user role in the room,
+        `None` if the user is not a member."""
+        participations = self.__dict__.setdefault('_participations', {})
+
+        if room_id not in participations:
+            role = await self._participation_repository.retrieve_role(
+                user_id=self.user.id,
+                room_id=room_id,
+            )
+            participations[room_id] = None if role is None else Participation(
+                user_id=self.user.id,
+                room_id=room_id,
+                role=role,
+            )
+        return participations[room_id]
@@ -1,12 +1,16 @@
 from typing import (
     Any,
+    AsyncIterator,
     Dict,
+    Optional,
 )
 
 from core.apps.classroom.constants import ParticipationRoleEnum
+from core.apps.classroom.exports import stream_csv
 from core.apps.classroom.repositories.participation_repository import ParticipationRepository
 from core.apps.classroom.repositories.room_repository import RoomRepository
 from core.apps.classroom.schemas.participations import ParticipationSuccessSchema
+from core.apps.classroom.services.mixins import ParticipationMixin
 from core.apps.localization.utils import translate as _
 from core.apps.users.models import User
 from core.common.services.author import AuthorMixin
@@ -14,7 +18,7 @@ from core.common.services.base import CRUDService
 from core.common.services.decorators import action
 
 
-class ParticipationService(AuthorMixin, CRUDService):
+class ParticipationService(ParticipationMixin, AuthorMixin, CRUDService):
     _repository: ParticipationRepository = ParticipationRepository()
     _room_repository: RoomRepository = RoomRepository()
     schema_map = {
@@ -54,10 +58,7 @@ class ParticipationService(AuthorMixin, CRUDService):
 
     @action
     async def remove_user_from_room(self, user_id: int, room_id: int):
-        participation, _ = await self.retrieve(
-            room_id=room_id,
-            user_id=self.user.id,
-        )
+        participation = await self.get_participation(room_id)
         errors = []
 
         if not participation:
@@ -71,7 +72,7 @@ class ParticipationService(AuthorMixin, CRUDService):
             errors.append({'user_id': _("Can't remove a room host.")})
         if errors:
             return False, errors
-        await self.model.filter(user_id=user_id, room_id=room_id).delete()
+        await self._repository.delete(user_id=user_id, room_id=room_id)
         return True, None
 
     @action
@@ -95,6 +96,33 @@ class ParticipationService(AuthorMixin, CRUDService):
         join: list[str] = None,
         **filters,
     ):
-        if await self._repository.count(room_id=room_id, user_id=self.user.id):
+        if await self.get_participation(room_id):
             return await super().fetch(_ordering, join, room_id=room_id, **filters)
         return None, {'error': _('Access denied.')}
+
+    async def _iter_roster_rows(self, room_id: int) -> AsyncIterator[list[Any]]:
+        async for last_name, first_name, middle_name, email, role, joined_at in (
+            self._repository.stream_roster(room_id)
+        ):
+            yield [last_name, first_name, middle_name or '', email, role.value, joined_at.isoformat()]
+
+    @action
+    async def export_roster(
+        self,
+        room_id: int,
+    ) -> tuple[Optional[AsyncIterator[str]], Optional[dict[str, str]]]:
+        """Returns CSV of the room members streamed from the database."""
+        participation = await self.get_participation(room_id)
+
+        if not participation or not participation.is_moderator:
+            return None, {'error': _('Access denied.')}
+
+        header = [
+            _('Last name'),
+            _('First name'),
+            _('Middle name'),
+            _('Email'),
+            _('Role'),
+            _('Joined at'),
+        ]
+        return stream_csv(header, self._iter_roster_rows(room_id)), None
@@ -5,7 +5,6 @@ from core.apps.classroom.models import (
     Participation,
     RoomPost,
 )
-from core.apps.classroom.repositories.participation_repository import ParticipationRepository
 from core.apps.classroom.repositories.post_repository import RoomPostRepository
 from core.apps.classroom.repositories.room_repository import RoomRepository
 from core.apps.classroom.repositories.topic_repository import TopicRepository
@@ -15,6 +14,7 @@ from core.apps.classroom.schemas.room_posts import (
     RoomPostCreateSuccessSchema,
     RoomPostUpdateSchema,
 )
+from core.apps.classroom.services.mixins import ParticipationMixin
 from core.apps.localization.utils import translate as _
 from core.common.config import config
 from core.common.services.author import AuthorMixin
@@ -23,9 +23,8 @@ from core.common.services.decorators import action
 from core.scheduler.tasks.classroom import notify_room_post_created
 
 
-class RoomPostService(AuthorMixin, CRUDService):
+class RoomPostService(ParticipationMixin, AuthorMixin, CRUDService):
     _repository: RoomPostRepository = RoomPostRepository()
-    _participation_repository: ParticipationRepository = ParticipationRepository()
     _room_repository: RoomRepository = RoomRepository()
     _topic_repository: TopicRepository = TopicRepository()
 
@@ -97,10 +96,7 @@ class RoomPostService(AuthorMixin, CRUDService):
         post_id: int,
     ) -> Participation:
         room_post: RoomPost = await self._repository.retrieve(id=post_id)
-        return await self._participation_repository.retrieve(
-            room_id=room_post.room_id,
-            user_id=self.user.id,
-        )
+        return await self.get_participation(room_post.room_id)
 
     @action
     async def fetch(
@@ -113,10 +109,7 @@ class RoomPostService(AuthorMixin, CRUDService):
         **filters,
     ):
         if 'room_id' in filters:
-            if not await self._participation_repository.count(
-                room_id=filters['room_id'],
-                user_id=self.user.id,
-            ):
+            if not await self.get_participation(filters['room_id']):
                 return None, {'error': _('Access denied!')}
 
         if search:
@@ -179,10 +172,7 @@ class RoomPostService(AuthorMixin, CRUDService):
         exclude_unset: bool = False,
         join: list[str] = None,
     ):
-        participation: Participation = await self._participation_repository.retrieve(
-            user_id=self.user.id,
-            room_id=create_schema.room_id,
-        )
+        participation: Participation = await self.get_participation(create_schema.room_id)
         errors = defaultdict(list)
 
         if not await self._check_participant_permission(participation):
@@ -8,22 +8,21 @@ from pydantic import BaseModel
 
 from core.apps.classroom.constants import ParticipationRoleEnum
 from core.apps.classroom.models import Participation
-from core.apps.classroom.repositories.participation_repository import ParticipationRepository
 from core.apps.classroom.repositories.room_repository import RoomRepository
 from core.apps.classroom.schemas import ParticipationCreateSchema
 from core.apps.classroom.schemas.rooms import (
     RoomCreateSuccessSchema,
     RoomDetailSchema,
 )
+from core.apps.classroom.services.mixins import ParticipationMixin
 from core.apps.localization.utils import translate as _
 from core.common.services.author import AuthorMixin
 from core.common.services.base import CRUDService
 from core.common.services.decorators import action
 
 
-class RoomService(AuthorMixin, CRUDService):
+class RoomService(ParticipationMixin, AuthorMixin, CRUDService):
     _repository: RoomRepository = RoomRepository()
-    _participation_repository: ParticipationRepository = ParticipationRepository()
 
     schema_map: dict[str, BaseModel] = {
         'create': RoomCreateSuccessSchema,
@@ -65,10 +64,7 @@ class RoomService(AuthorMixin, CRUDService):
     @action
     async def refresh_join_slug(self, room_id: int) -> Dict:
         """Create or refresh join link."""
-        participation: Participation = await self._participation_repository.retrieve(
-            user_id=self.user.id,
-            room_id=room_id,
-        )
+        participation: Participation = await self.get_participation(room_id)
 
         if not participation:
             return None, _('You are not allowed to perform this operation.')
@@ -85,21 +81,20 @@ class RoomService(AuthorMixin, CRUDService):
     async def delete(self, **filters):
         room_id = filters.get('id')
 
-        participation: Participation = await self._participation_repository.retrieve(
-            user_id=self.user.id,
-            room_id=room_id,
-        )
+        participation: Participation = await self.get_participation(room_id)
         permission_error = _('You are not allowed to do that.')
 
         if not participation:
             return None, permission_error
         if not participation.can_delete_room:
             return None, permission_error
-        deleted_rooms_count = await self._repository.delete(**filters)
 
+        # invalidates cached roles, which can't be found after the room
+        # deletion cascades to participations
         await self._participation_repository.delete(
             room_id=participation.room_id,
         )
+        deleted_rooms_count = await self._repository.delete(**filters)
         return deleted_rooms_count, None
 
     async def validate_name(self, value):
@@ -114,10 +109,7 @@ class RoomService(AuthorMixin, CRUDService):
         exclude_unset: bool = True,
         join: list[str] = None,
     ):
-        participation: Participation = await self._participation_repository.retrieve(
-            room_id=id,
-            user_id=self.user.id,
-        )
+        participation: Participation = await self.get_participation(id)
 
         if participation.can_update_room:
             return await super().update(
@@ -6,30 +6,26 @@ from typing import (
 
 from core.apps.classroom.models.participations import Participation
 from core.apps.classroom.models.topics import Topic
-from core.apps.classroom.repositories.participation_repository import ParticipationRepository
 from core.apps.classroom.repositories.topic_repository import TopicRepository
 from core.apps.classroom.schemas.topics import (
     TopicCreateSchema,
     TopicUpdateSchema,
 )
+from core.apps.classroom.services.mixins import ParticipationMixin
 from core.common.services.author import AuthorMixin
 from core.common.services.base import CRUDService
 from core.common.services.decorators import action
 
 
-class TopicService(AuthorMixin, CRUDService):
+class TopicService(ParticipationMixin, AuthorMixin, CRUDService):
     _repository: TopicRepository = TopicRepository()
-    _participation_repository: ParticipationRepository = ParticipationRepository()
 
     async def _validate_manage_topics_in_room(
         self,
         room_id: int,
     ) -> dict[str, list]:
         errors = defaultdict(list)
-        participation: Participation = await self._participation_repository.retrieve(
-            room_id=room_id,
-            user_id=self.user.id,
-        )
+        participation: Participation = await self.get_participation(room_id)
 
         if participation is None:
             errors['room_id'].append(
@@ -57,10 +53,7 @@ class TopicService(AuthorMixin, CRUDService):
     async def __validate_fetch(self, room_id: int) -> dict:
         errors = defaultdict(list)
 
-        participation: Participation = await self._participation_repository.retrieve(
-            room_id=room_id,
-            user_id=self.user.id,
-        )
+        participation: Participation = await self.get_participation(room_id)
 
         if participation is None:
             errors['room_id'].append(
@@ -147,6 +140,26 @@ class TopicService(AuthorMixin, CRUDService):
             **create_schema.dict(exclude_unset=exclude_unset),
         ), None
 
+    @action
+    async def reorder(
+        self,
+        room_id: int,
+        topic_ids: list[int],
+    ) -> tuple[Optional[list[Topic]], dict]:
+        errors = await self._validate_manage_topics_in_room(room_id)
+
+        if len(errors) > 0:
+            return None, errors
+
+        room_topic_ids = await self._repository.get_room_topic_ids(room_id)
+
+        if len(topic_ids) != len(room_topic_ids) or set(topic_ids) != set(room_topic_ids):
+            errors['topic_ids'].append('Необходимо перечислить все темы комнаты по одному разу.')
+            return None, errors
+
+        await self._repository.reorder(room_id=room_id, topic_ids=topic_ids)
+        return await self._repository.fetch_for_room(room_id=room_id), None
+
     @action
     async def delete_and_displace_orders(self, id: int):
         errors = defaultdict(list)
@@ -0,0 +1,106 @@
+from fastapi import status
+from fastapi.applications import FastAPI
+
+import pytest
+
+from core.apps.classroom.constants import (
+    HomeWorkAssignmentStatus,
+    ParticipationRoleEnum,
+    RoomPostType,
+)
+from core.apps.classroom.gradebook import build_gradebook
+from core.tests.client import FastAPITestClient
+from core.tests.factories.classroom.assignments import AssignmentFactory
+from core.tests.factories.classroom.participation import ParticipationFactory
+from core.tests.factories.classroom.room_post import RoomPostFactory
+from core.tests.factories.user import UserFactory
+
+
+def test_build_gradebook_statistics():
+    done, assigned = HomeWorkAssignmentStatus.done, HomeWorkAssignmentStatus.assigned
+    gradebook = build_gradebook([
+        (1, 'Anna', 'Adams', 10, 'Essay', done, 5),
+        (1, 'Anna', 'Adams', 11, 'Quiz', done, 2),
+        (1, 'Anna', 'Adams', 12, 'Lab', assigned, None),
+        (2, 'Boris', 'Brown', 10, 'Essay', done, 4),
+        (2, 'Boris', 'Brown', 11, 'Quiz', None, None),
+        (2, 'Boris', 'Brown', 12, 'Lab', None, None),
+    ])
+
+    assert [student.id for student in gradebook.students] == [1, 2]
+    assert [post.id for post in gradebook.posts] == [10, 11, 12]
+    assert gradebook.cells[0][2].status == assigned
+    assert gradebook.cells[1][1] is None
+
+    anna, boris = (student.statistics for student in gradebook.students)
+    assert (anna.mean_rate, anna.median_rate, anna.completion) == (3.5, 3.5, 66.67)
+    assert (boris.mean_rate, boris.median_rate, boris.completion) == (4, 4, 33.33)
+
+    essay, quiz, lab = (post.statistics for post in gradebook.posts)
+    assert (essay.mean_rate, essay.median_rate, essay.completion) == (4.5, 4.5, 100)
+    assert (quiz.mean_rate, quiz.completion) == (2, 50)
+    assert (lab.mean_rate, lab.median_rate, lab.completion) == (None, None, 0)
+
+
+def test_build_gradebook_without_homeworks():
+    gradebook = build_gradebook([(1, 'Anna', 'Adams', None, None, None, None)])
+
+    assert [student.id for student in gradebook.students] == [1]
+    assert gradebook.posts == []
+    assert gradebook.cells == [[]]
+    assert gradebook.students[0].statistics.mean_rate is None
+
+
+@pytest.mark.asyncio
+async def test_room_gradebook(
+    app: FastAPI,
+    client: FastAPITestClient,
+):
+    host_participation = await ParticipationFactory.create(role=ParticipationRoleEnum.host)
+    room = host_participation.room
+    students = [
+        await UserFactory.create(first_name='Anna', last_name='Adams'),
+        await UserFactory.create(first_name='Boris', last_name='Brown'),
+    ]
+
+    for student in students:
+        await ParticipationFactory.create(room=room, user=student, role=ParticipationRoleEnum.participant)
+
+    posts = [
+        await RoomPostFactory.create(room=room, type=RoomPostType.homework)
+        for _ in range(2)
+    ]
+    await RoomPostFactory.create(room=room, type=RoomPostType.material)
+    await AssignmentFactory.create(post=posts[0], author=students[0], status=HomeWorkAssignmentStatus.done, rate=5)
+    assignment = await AssignmentFactory.create(
+        post=posts[1],
+        author=students[0],
+        status=HomeWorkAssignmentStatus.assigned,
+        rate=1,
+    )
+    url = app.url_path_for('get_room_gradebook', room_id=room.id)
+
+    client.authorize(host_participation.user)
+    response = client.get(url)
+    assert response.status_code == status.HTTP_200_OK, response.json()
+    gradebook = response.json()
+
+    assert [student['id'] for student in gradebook['students']] == [student.id for student in students]
+    assert [post['id'] for post in gradebook['posts']] == [post.id for post in posts]
+    assert gradebook['cells'][0][1] == {'status': HomeWorkAssignmentStatus.assigned, 'rate': 1}
+    assert gradebook['cells'][1] == [None, None]
+    assert gradebook['students'][0]['statistics']['completion'] == 50
+
+    response = client.post(
+        app.url_path_for('mark_assignment_as_done', assignment_id=assignment.id),
+        json={'rate': 3},
+    )
+    assert response.status_code == status.HTTP_200_OK, response.json()
+
+    gradebook = client.get(url).json()
+    assert gradebook['cells'][0][1] == {'status': HomeWorkAssignmentStatus.done, 'rate': 3}
+    assert gradebook['students'][0]['statistics'] == {'mean_rate': 4, 'median_rate': 4, 'completion': 100}
+
+    client.authorize(students[0])
+    response = client.get(url)
+    assert response.status_code == status.HTTP_403_FORBIDDEN, response.json()
@@ -0,0 +1,58 @@
+import pytest
+
+from core.apps.attachments.repositories.attachment_repository import AttachmentRepository
+from core.apps.classroom.constants import ParticipationRoleEnum
+from core.apps.classroom.repositories.post_repository import RoomPostRepository
+from core.apps.classroom.repositories.topic_repository import TopicRepository
+from core.common.database import test_engine
+from core.tests.factories.classroom.participation import ParticipationFactory
+from core.tests.factories.classroom.room_post import RoomPostFactory
+from core.tests.factories.classroom.topics import TopicFactory
+from core.tests.utils.functions import count_queries
+
+
+class JoinedRoomPostRepository(RoomPostRepository):
+    join_strategies = {'attachments': 'joined'}
+
+
+@pytest.mark.asyncio
+async def test_collections_are_selectin_loaded(
+    room_post_repository: RoomPostRepository,
+    attachment_repository: AttachmentRepository,
+):
+    post = await RoomPostFactory.create()
+
+    for index in range(3):
+        await attachment_repository.create(filename=f'{index}.txt', source=f'{index}'.encode(), post_id=post.id)
+
+    with count_queries(test_engine) as statements:
+        posts = await room_post_repository.fetch(join=['author', 'attachments', 'topic'], room_id=post.room_id)
+
+    assert len(statements) == 2
+    assert 'JOIN users' in statements[0]
+    assert 'attachments' not in statements[0]
+    assert statements[1].startswith('SELECT attachments.post_id')
+    assert [len(post.attachments) for post in posts] == [3]
+    assert posts[0].author.id == post.author_id
+
+    with count_queries(test_engine) as statements:
+        posts = await JoinedRoomPostRepository().fetch(join=['author', 'attachments'], room_id=post.room_id)
+
+    assert len(statements) == 1
+    assert 'LEFT OUTER JOIN attachments' in statements[0]
+    assert [len(post.attachments) for post in posts] == [3]
+
+
+@pytest.mark.asyncio
+async def test_nested_collections_are_selectin_loaded(topic_repository: TopicRepository):
+    participation = await ParticipationFactory.create(role=ParticipationRoleEnum.host)
+    await ParticipationFactory.create(room=participation.room, role=ParticipationRoleEnum.participant)
+    await TopicFactory.create(room=participation.room)
+
+    with count_queries(test_engine) as statements:
+        topic = await topic_repository.retrieve(join=['room', 'room.participations'], room_id=participation.room_id)
+
+    assert len(statements) == 2
+    assert 'JOIN rooms' in statements[0]
+    assert 'participations' in statements[1]
+    assert len(topic.room.participations) == 2
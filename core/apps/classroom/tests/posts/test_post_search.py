@@ -0,0 +1,37 @@
+from sqlalchemy.dialects import postgresql
+
+import pytest
+
+from core.apps.classroom.repositories.post_repository import RoomPostRepository
+from core.tests.factories.classroom.room import RoomFactory
+from core.tests.factories.classroom.room_post import RoomPostFactory
+
+
+@pytest.mark.asyncio
+async def test_full_text_search_statement(room_post_repository: RoomPostRepository):
+    statement = await room_post_repository._full_text_search_statement(
+        ['-created_at'],
+        ['author', 'attachments'],
+        limit=50,
+        search='домашнее задание',
+        room_id=1,
+    )
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+
+    assert "posts.search_vector @@ websearch_to_tsquery('russian'::regconfig" in sql
+    assert 'ORDER BY ts_rank(posts.search_vector' in sql
+    assert sql.index('ts_rank(posts.search_vector') < sql.index('posts.created_at DESC')
+    assert 'ts_headline(' in sql
+    assert 'ILIKE' not in sql.upper()
+
+
+@pytest.mark.asyncio
+async def test_search_falls_back_to_pattern_matching(room_post_repository: RoomPostRepository):
+    room = await RoomFactory.create()
+    post = await RoomPostFactory.create(room=room, description='Контрольная по алгебре')
+    await RoomPostFactory.create(room=room, description='Лабораторная работа')
+
+    posts = await room_post_repository.search_fetch(search='алгебре', room_id=room.id)
+
+    assert [found_post.id for found_post in posts] == [post.id]
+    assert not hasattr(posts[0], 'search_rank')
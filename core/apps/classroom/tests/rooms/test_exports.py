@@ -0,0 +1,121 @@
+import csv
+import io
+
+from fastapi import status
+from fastapi.applications import FastAPI
+
+import pytest
+
+from core.apps.classroom.constants import (
+    HomeWorkAssignmentStatus,
+    ParticipationRoleEnum,
+    RoomPostType,
+)
+from core.apps.classroom.exports import stream_csv
+from core.common.config import config
+from core.tests.client import FastAPITestClient
+from core.tests.factories.classroom.assignments import AssignmentFactory
+from core.tests.factories.classroom.participation import ParticipationFactory
+from core.tests.factories.classroom.room_post import RoomPostFactory
+from core.tests.factories.user import UserFactory
+
+
+def read_csv(content: str) -> list[list[str]]:
+    assert content.startswith('\ufeff')
+    return list(csv.reader(io.StringIO(content[1:])))
+
+
+@pytest.mark.asyncio
+async def test_stream_csv_in_chunks(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(config, 'EXPORT_STREAM_BATCH_SIZE', 2)
+
+    async def rows():
+        for index in range(5):
+            yield [index, f'row {index}']
+
+    chunks = [chunk async for chunk in stream_csv(['id', 'name'], rows())]
+
+    assert len(chunks) == 3
+    assert read_csv(''.join(chunks)) == [['id', 'name']] + [[str(index), f'row {index}'] for index in range(5)]
+
+
+@pytest.mark.asyncio
+async def test_stream_csv_escapes_formulas():
+    async def rows():
+        yield ['=HYPERLINK("http://example.com")', '+1', '-1', -1, '@SUM(A1)', '\tname', '\rname', 'Anna']
+
+    chunks = [chunk async for chunk in stream_csv(['=cmd|\' /C calc\'!A0', 'name'], rows())]
+
+    assert read_csv(''.join(chunks)) == [
+        ["'=cmd|' /C calc'!A0", 'name'],
+        ['\'=HYPERLINK("http://example.com")', "'+1", "'-1", '-1', "'@SUM(A1)", "'\tname", "'\rname", 'Anna'],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_export_room_gradebook(
+    app: FastAPI,
+    client: FastAPITestClient,
+):
+    host_participation = await ParticipationFactory.create(role=ParticipationRoleEnum.host)
+    room = host_participation.room
+    students = [
+        await UserFactory.create(first_name='Anna', last_name='Adams'),
+        await UserFactory.create(first_name='Boris', last_name='Brown'),
+    ]
+
+    for student in students:
+        await ParticipationFactory.create(room=room, user=student, role=ParticipationRoleEnum.participant)
+
+    posts = [
+        await RoomPostFactory.create(room=room, type=RoomPostType.homework, title=title)
+        for title in ('Essay', 'Quiz')
+    ]
+    await AssignmentFactory.create(post=posts[1], author=students[1], status=HomeWorkAssignmentStatus.done, rate=4)
+    url = app.url_path_for('export_room', room_id=room.id)
+
+    client.authorize(host_participation.user)
+    response = client.get(url, params={'format': 'csv'})
+    assert response.status_code == status.HTTP_200_OK, response.text
+    assert response.headers['content-type'].startswith('text/csv')
+    assert response.headers['content-disposition'] == f'attachment; filename="room-{room.id}-gradebook.csv"'
+    assert read_csv(response.text) == [
+        ['Last name', 'First name', 'Essay: status', 'Essay: rate', 'Quiz: status', 'Quiz: rate'],
+        ['Adams', 'Anna', '', '', '', ''],
+        ['Brown', 'Boris', '', '', HomeWorkAssignmentStatus.done.value, '4'],
+    ]
+
+    response = client.get(url, params={'format': 'xlsx'})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    client.authorize(students[0])
+    response = client.get(url)
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.asyncio
+async def test_export_room_roster(
+    app: FastAPI,
+    client: FastAPITestClient,
+):
+    host_participation = await ParticipationFactory.create(role=ParticipationRoleEnum.host)
+    student = await UserFactory.create(first_name='Anna', last_name='Adams', middle_name=None)
+    await ParticipationFactory.create(
+        room=host_participation.room,
+        user=student,
+        role=ParticipationRoleEnum.participant,
+    )
+
+    client.authorize(host_participation.user)
+    response = client.get(
+        app.url_path_for('export_room', room_id=host_participation.room_id),
+        params={'table': 'roster'},
+    )
+    assert response.status_code == status.HTTP_200_OK, response.text
+    header, *rows = read_csv(response.text)
+
+    assert header == ['Last name', 'First name', 'Middle name', 'Email', 'Role', 'Joined at']
+    assert len(rows) == 2
+    assert ['Adams', 'Anna', '', student.email, ParticipationRoleEnum.participant.value] in [
+        row[:5] for row in rows
+    ]
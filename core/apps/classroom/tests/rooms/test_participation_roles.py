@@ -0,0 +1,128 @@
+from fastapi import status
+from fastapi.applications import FastAPI
+
+import pytest
+
+from core.apps.classroom.constants import ParticipationRoleEnum
+from core.apps.classroom.repositories.participation_repository import ParticipationRepository
+from core.apps.classroom.services.room_post_service import RoomPostService
+from core.apps.classroom.services.room_service import RoomService
+from core.common.database import test_engine
+from core.tests.client import FastAPITestClient
+from core.tests.factories.classroom.participation import ParticipationFactory
+from core.tests.factories.classroom.room import RoomFactory
+from core.tests.factories.user import UserFactory
+from core.tests.utils.functions import count_queries
+
+
+@pytest.fixture
+def role_queries(monkeypatch: pytest.MonkeyPatch) -> list:
+    queries = []
+    get_scalar = ParticipationRepository.get_scalar
+
+    async def counted_get_scalar(self, statement):
+        queries.append(statement)
+        return await get_scalar(self, statement)
+
+    monkeypatch.setattr(ParticipationRepository, 'get_scalar', counted_get_scalar)
+    yield queries
+
+
+@pytest.mark.asyncio
+async def test_participation_role_cached_and_invalidated(
+    participation_repository: ParticipationRepository,
+    role_queries: list,
+):
+    participation = await ParticipationFactory.create(role=ParticipationRoleEnum.participant)
+    user_id, room_id = participation.user_id, participation.room_id
+
+    for _ in range(3):
+        role = await participation_repository.retrieve_role(user_id=user_id, room_id=room_id)
+        assert role == ParticipationRoleEnum.participant
+    assert len(role_queries) == 1
+
+    await participation_repository.update(
+        values={'role': ParticipationRoleEnum.moderator},
+        id=participation.id,
+    )
+    role = await participation_repository.retrieve_role(user_id=user_id, room_id=room_id)
+    assert role == ParticipationRoleEnum.moderator
+
+    await participation_repository.delete(room_id=room_id)
+    assert await participation_repository.retrieve_role(user_id=user_id, room_id=room_id) is None
+    assert await participation_repository.retrieve_role(user_id=user_id, room_id=room_id) is None
+    assert len(role_queries) == 3
+
+    await participation_repository.create(
+        user_id=user_id,
+        room_id=room_id,
+        role=ParticipationRoleEnum.host,
+        author_id=user_id,
+        updated_by_id=user_id,
+    )
+    role = await participation_repository.retrieve_role(user_id=user_id, room_id=room_id)
+    assert role == ParticipationRoleEnum.host
+
+
+@pytest.mark.asyncio
+async def test_participation_memoized_by_service(role_queries: list):
+    participation = await ParticipationFactory.create(role=ParticipationRoleEnum.moderator)
+    other_room = await RoomFactory.create()
+    service = RoomPostService(participation.user)
+
+    for _ in range(3):
+        resolved_participation = await service.get_participation(participation.room_id)
+        assert resolved_participation.can_manage_posts
+        assert await service.get_participation(other_room.id) is None
+    assert len(role_queries) == 2
+
+    await RoomPostService(participation.user).get_participation(participation.room_id)
+    assert len(role_queries) == 2
+
+
+@pytest.mark.asyncio
+async def test_room_deletion_invalidates_roles():
+    participation = await ParticipationFactory.create(role=ParticipationRoleEnum.host)
+    room_id = participation.room_id
+
+    assert await RoomPostService(participation.user).get_participation(room_id)
+
+    with count_queries(test_engine) as statements:
+        _, errors = await RoomService(participation.user).delete(id=room_id)
+    assert not errors
+
+    deletions = [statement.split()[2] for statement in statements if statement.startswith('DELETE')]
+    assert deletions == ['participations', 'rooms']
+    assert await RoomPostService(participation.user).get_participation(room_id) is None
+
+
+@pytest.mark.asyncio
+async def test_room_access_follows_membership(
+    app: FastAPI,
+    client: FastAPITestClient,
+):
+    host_participation = await ParticipationFactory.create(role=ParticipationRoleEnum.host)
+    room = host_participation.room
+    user = await UserFactory.create()
+    posts_url = app.url_path_for('get_room_posts')
+
+    client.authorize(user)
+    response = client.get(posts_url, params={'room_id': room.id})
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    response = client.get(app.url_path_for('join_room_by_link', join_slug=room.join_slug))
+    assert response.status_code == status.HTTP_200_OK, response.json()
+
+    response = client.get(posts_url, params={'room_id': room.id})
+    assert response.status_code == status.HTTP_200_OK, response.json()
+
+    client.authorize(host_participation.user)
+    response = client.delete(
+        app.url_path_for('delete_participant'),
+        params={'user_id': user.id, 'room_id': room.id},
+    )
+    assert response.status_code == status.HTTP_204_NO_CONTENT, response.json()
+
+    client.authorize(user)
+    response = client.get(posts_url, params={'room_id': room.id})
+    assert response.status_code == status.HTTP_403_FORBIDDEN
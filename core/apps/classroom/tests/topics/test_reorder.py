@@ -0,0 +1,106 @@
+from fastapi import status
+from fastapi.applications import FastAPI
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import asyncpg
+
+import pytest
+
+from core.apps.classroom.constants import ParticipationRoleEnum
+from core.apps.classroom.repositories.topic_repository import TopicRepository
+from core.common.database import test_engine
+from core.tests.client import FastAPITestClient
+from core.tests.factories.classroom.participation import ParticipationFactory
+from core.tests.factories.classroom.topics import TopicFactory
+from core.tests.utils.functions import count_queries
+
+
+@pytest.mark.asyncio
+async def test_reorder_statements(topic_repository: TopicRepository):
+    dialect = postgresql.dialect()
+
+    reorder_sql = str(topic_repository._values_reorder_statement(1, [3, 1, 2]).compile(dialect=dialect))
+    assert '"order"=new_orders."order" FROM (VALUES' in reorder_sql
+    assert 'topics.id = new_orders.id' in reorder_sql
+
+    reorder_sql = str(topic_repository._values_reorder_statement(1, [3, 1, 2]).compile(dialect=asyncpg.dialect()))
+    assert 'VALUES (CAST(%s AS INTEGER), CAST(%s AS INTEGER)), (CAST(%s AS INTEGER)' in reorder_sql
+
+    compact_sql = str(topic_repository._join_compact_statement([1]).compile(dialect=dialect))
+    assert 'row_number() OVER (PARTITION BY topics.room_id' in compact_sql
+    assert 'FROM (SELECT topics.id' in compact_sql
+    assert 'IS DISTINCT FROM compacted_orders."order"' in compact_sql
+
+
+@pytest.mark.asyncio
+async def test_reorder_room_topics(
+    app: FastAPI,
+    client: FastAPITestClient,
+    topic_repository: TopicRepository,
+):
+    participation = await ParticipationFactory.create(role=ParticipationRoleEnum.host)
+    topics = [
+        await TopicFactory.create(room=participation.room, order=order)
+        for order in range(1, 5)
+    ]
+    other_room_topic = await TopicFactory.create(order=1)
+    topic_ids = [topic.id for topic in reversed(topics)]
+    url = app.url_path_for('reorder_room_topics', room_id=participation.room_id)
+
+    client.authorize(participation.user)
+
+    with count_queries(test_engine) as statements:
+        response = client.put(url, json={'topic_ids': topic_ids})
+    assert response.status_code == status.HTTP_200_OK, response.json()
+    assert [topic['id'] for topic in response.json()] == topic_ids
+    assert [topic['order'] for topic in response.json()] == [1, 2, 3, 4]
+    assert len([statement for statement in statements if statement.startswith('UPDATE')]) == 1
+
+    for invalid_topic_ids in (
+        topic_ids[1:],
+        topic_ids + topic_ids[:1],
+        topic_ids[1:] + [other_room_topic.id],
+    ):
+        response = client.put(url, json={'topic_ids': invalid_topic_ids})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST, response.json()
+        assert 'topic_ids' in response.json()['detail']
+
+    other_room_topic = await topic_repository.refresh(other_room_topic)
+    assert other_room_topic.order == 1
+
+
+@pytest.mark.asyncio
+async def test_reorder_room_topics_as_participant(
+    app: FastAPI,
+    client: FastAPITestClient,
+):
+    participation = await ParticipationFactory.create(role=ParticipationRoleEnum.participant)
+    topic = await TopicFactory.create(room=participation.room, order=1)
+
+    client.authorize(participation.user)
+    response = client.put(
+        app.url_path_for('reorder_room_topics', room_id=participation.room_id),
+        json={'topic_ids': [topic.id]},
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST, response.json()
+
+
+@pytest.mark.asyncio
+async def test_delete_compacts_orders(topic_repository: TopicRepository):
+    participation = await ParticipationFactory.create(role=ParticipationRoleEnum.host)
+    topics = [
+        await TopicFactory.create(room=participation.room, order=order)
+        for order in (2, 5, 5, 9)
+    ]
+    other_room_topic = await TopicFactory.create(order=7)
+
+    with count_queries(test_engine) as statements:
+        await topic_repository.delete_and_displace_orders([topics[1]])
+    assert [statement.split()[0] for statement in statements] == ['DELETE', 'UPDATE']
+
+    room_topics = await topic_repository.fetch_for_room(room_id=participation.room_id)
+    assert [topic.id for topic in room_topics] == [topics[0].id, topics[2].id, topics[3].id]
+    assert [topic.order for topic in room_topics] == [1, 2, 3]
+
+    other_room_topic = await topic_repository.refresh(other_room_topic)
+    assert other_room_topic.order == 7
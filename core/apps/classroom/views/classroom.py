@@ -6,6 +6,7 @@ from fastapi import (
     Query,
 )
 from fastapi.exceptions import HTTPException
+from fastapi.responses import StreamingResponse
 from fastapi_pagination import (
     Page,
     paginate,
@@ -13,7 +14,12 @@ from fastapi_pagination import (
 
 from starlette import status
 
+from core.apps.classroom.constants import (
+    RoomExportFormat,
+    RoomExportTable,
+)
 from core.apps.classroom.schemas import (
+    GradebookSchema,
     ParticipationCreateByJoinSlugSchema,
     ParticipationSuccessSchema,
     RoomCreateJoinLinkSuccessSchema,
@@ -22,8 +28,14 @@ from core.apps.classroom.schemas import (
     RoomDetailSchema,
 )
 from core.apps.classroom.schemas.participations import ParticipationDetailSchema
+from core.apps.classroom.schemas.topics import (
+    TopicOrderSchema,
+    TopicRetrieveSchema,
+)
+from core.apps.classroom.services.homework_assignment_service import AssignmentService
 from core.apps.classroom.services.participation_service import ParticipationService
 from core.apps.classroom.services.room_service import RoomService
+from core.apps.classroom.services.topic_service import TopicService
 from core.apps.users.dependencies import get_current_user
 from core.apps.users.models import User
 
@@ -160,6 +172,77 @@ async def refresh_join_slug(
     return RoomCreateJoinLinkSuccessSchema(join_slug=join_slug)
 
 
+@classroom_router.get(
+    '/{room_id}/gradebook',
+    response_model=GradebookSchema,
+    operation_id='getRoomGradebook',
+    summary='Get room gradebook',
+    description='Returns homework statuses and rates of every student with their statistics',
+)
+async def get_room_gradebook(
+    room_id: int,
+    user: User = Depends(get_current_user),
+):
+    assignment_service = AssignmentService(user)
+    gradebook, errors = await assignment_service.fetch_gradebook(room_id)
+
+    if errors:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=errors)
+    return gradebook
+
+
+@classroom_router.get(
+    '/{room_id}/export',
+    response_class=StreamingResponse,
+    operation_id='exportRoom',
+    summary='Export room table',
+    description='Streams the room gradebook or roster as a file',
+)
+async def export_room(
+    room_id: int,
+    table: RoomExportTable = Query(RoomExportTable.gradebook),
+    export_format: RoomExportFormat = Query(RoomExportFormat.csv, alias='format'),
+    user: User = Depends(get_current_user),
+):
+    if table == RoomExportTable.roster:
+        content, errors = await ParticipationService(user).export_roster(room_id)
+    else:
+        content, errors = await AssignmentService(user).export_gradebook(room_id)
+
+    if errors:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=errors)
+    return StreamingResponse(
+        content=content,
+        media_type='text/csv',
+        headers={
+            'Content-Disposition': f'attachment; filename="room-{room_id}-{table.value}.{export_format.value}"',
+        },
+    )
+
+
+@classroom_router.put(
+    '/{room_id}/topics/order',
+    response_model=list[TopicRetrieveSchema],
+    operation_id='reorderRoomTopics',
+    summary='Reorder room lessons topics',
+    description='Orders all room lessons topics as listed',
+)
+async def reorder_room_topics(
+    room_id: int,
+    topic_order_schema: TopicOrderSchema,
+    user: User = Depends(get_current_user),
+):
+    topic_service = TopicService(user)
+    topics, errors = await topic_service.reorder(
+        room_id=room_id,
+        topic_ids=topic_order_schema.topic_ids,
+    )
+
+    if errors:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=errors)
+    return topics
+
+
 @classroom_router.get(
     '/join/{join_slug}',
     response_model=ParticipationSuccessSchema,
@@ -1,6 +1,7 @@
-from dataclasses import dataclass
-
-import httpx
+from dataclasses import (
+    dataclass,
+    field,
+)
 
 from core.apps.integrations.authentications.vk.schemas import (
     VKResponseAccessDataSchema,
@@ -8,6 +9,10 @@ from core.apps.integrations.authentications.vk.schemas import (
 )
 from core.apps.integrations.exceptions import IntegrationException
 from core.common.config import config
+from core.common.integrations.pool import (
+    http_client_pool,
+    HTTPClientPool,
+)
 
 
 @dataclass
@@ -15,51 +20,50 @@ class VKIntegratioinClient:
     client_id: str
     client_secret: str
     redirect_uri: str
+    client_pool: HTTPClientPool = field(default=http_client_pool)
 
     def __get_oauth_client(self):
-        return httpx.AsyncClient(base_url=config.VK_OAUTH_URL)
+        return self.client_pool.get_async_client(config.VK_OAUTH_URL)
 
     def __get_api_client(self):
-        return httpx.AsyncClient(base_url=config.VK_API_URL)
+        return self.client_pool.get_async_client(config.VK_API_URL)
 
     async def get_user_access_data(self, code: str) -> VKResponseAccessDataSchema:
-        async with self.__get_oauth_client() as client:
-            response = await client.get(
-                url='access_token', params={
-                    'client_id': self.client_id,
-                    'client_secret': self.client_secret,
-                    'redirect_uri': self.redirect_uri,
-                    'code': code,
-                },
-            )
+        response = await self.__get_oauth_client().get(
+            url='access_token', params={
+                'client_id': self.client_id,
+                'client_secret': self.client_secret,
+                'redirect_uri': self.redirect_uri,
+                'code': code,
+            },
+        )
 
-            if response.is_error:
-                raise IntegrationException(response.content.decode())
+        if response.is_error:
+            raise IntegrationException(response.content.decode())
 
-            return VKResponseAccessDataSchema(**response.json())
+        return VKResponseAccessDataSchema(**response.json())
 
     async def get_user_data(
         self,
         access_token: str,
         user_id: int,
     ) -> VKResponseUserInfoSchema:
-        async with self.__get_api_client() as client:
-            response = await client.post(
-                url='/method/users.get/',
-                data={
-                    'access_token': access_token,
-                    'user_ids': [user_id],
-                    'fields': ['photo_400_orig'],
-                },
-                params={
-                    'v': config.VK_API_VERSION,
-                },
-            )
+        response = await self.__get_api_client().post(
+            url='/method/users.get/',
+            data={
+                'access_token': access_token,
+                'user_ids': [user_id],
+                'fields': ['photo_400_orig'],
+            },
+            params={
+                'v': config.VK_API_VERSION,
+            },
+        )
 
-            if response.is_error:
-                raise IntegrationException(response.content.decode())
+        if response.is_error:
+            raise IntegrationException(response.content.decode())
 
-            user_info = response.json()['response'][0]
-            user_info['user_id'] = user_id
+        user_info = response.json()['response'][0]
+        user_info['user_id'] = user_id
 
-            return VKResponseUserInfoSchema(**user_info)
+        return VKResponseUserInfoSchema(**user_info)
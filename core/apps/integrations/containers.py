@@ -5,6 +5,7 @@ from dependency_injector import (
 
 from core.apps.integrations.authentications.vk.client import VKIntegratioinClient
 from core.common.config import config
+from core.common.integrations.pool import http_client_pool
 
 
 class IntegrationContainer(containers.DeclarativeContainer):
@@ -14,9 +15,11 @@ class IntegrationContainer(containers.DeclarativeContainer):
             'core.apps.users.services.user_service',
         ],
     )
+    http_client_pool = providers.Object(http_client_pool)
     vk_integration_client: VKIntegratioinClient = providers.Factory(
         VKIntegratioinClient,
         client_id=config.VK_CLIENT_ID,
         client_secret=config.VK_CLIENT_SECRET,
         redirect_uri=config.VK_REDIRECT_URI,
+        client_pool=http_client_pool,
     )
@@ -0,0 +1,94 @@
+import httpx
+import pytest
+
+from core.apps.integrations.authentications.vk.client import VKIntegratioinClient
+from core.common.config import config
+from core.common.integrations.base import HTTPXClient
+from core.common.integrations.pool import HTTPClientPool
+
+
+@pytest.fixture(autouse=True)
+def no_retry_delay(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(config, 'HTTP_CLIENT_RETRY_DELAY', 0)
+
+
+def make_pool(responses: list) -> tuple[HTTPClientPool, list[httpx.Request]]:
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        response = responses.pop(0)
+
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    return HTTPClientPool(transport=httpx.MockTransport(handler)), requests
+
+
+@pytest.mark.asyncio
+async def test_vk_client_uses_pooled_clients():
+    pool, requests = make_pool([
+        httpx.Response(200, json={'access_token': 'token', 'user_id': 1, 'expires_in': 0}),
+        httpx.Response(200, json={'response': [{'first_name': 'Ivan', 'last_name': 'Ivanov'}]}),
+    ])
+    client = VKIntegratioinClient(
+        client_id='id',
+        client_secret='secret',
+        redirect_uri='uri',
+        client_pool=pool,
+    )
+
+    access_data = await client.get_user_access_data(code='code')
+    user_data = await client.get_user_data(access_token=access_data.access_token, user_id=1)
+
+    assert user_data.first_name == 'Ivan'
+    assert [request.url.host for request in requests] == ['oauth.vk.com', 'api.vk.com']
+    api_client = pool.get_async_client(config.VK_API_URL)
+    assert api_client is pool.get_async_client(config.VK_API_URL)
+
+    await pool.aclose()
+    assert api_client.is_closed
+
+
+@pytest.mark.asyncio
+async def test_async_client_retries_idempotent_requests():
+    pool, requests = make_pool([
+        httpx.Response(503),
+        httpx.ReadTimeout('timeout'),
+        httpx.Response(200, json={}),
+    ])
+    response = await pool.get_async_client('https://example.com').get('/resource')
+
+    assert response.status_code == 200
+    assert len(requests) == 3
+
+
+@pytest.mark.asyncio
+async def test_async_client_does_not_repeat_sent_post():
+    pool, requests = make_pool([
+        httpx.ConnectError('refused'),
+        httpx.Response(503),
+        httpx.Response(200),
+    ])
+    response = await pool.get_async_client('https://example.com').post('/resource')
+
+    assert response.status_code == 503
+    assert len(requests) == 2
+
+
+def test_notifications_client_retries_and_reuses_connection():
+    pool, requests = make_pool([
+        httpx.Response(502),
+        httpx.Response(200, json={'status': 'ok'}),
+        httpx.Response(200, json={'status': 'ok'}),
+    ])
+    client = HTTPXClient(base_url='https://notifications.example.com', client_pool=pool)
+    client.set_headers({'X-Service': 'classroom'})
+
+    assert client.get('/status') == {'status': 'ok'}
+    assert client.post('/send', json={'text': 'hello'}) == {'status': 'ok'}
+    assert len(requests) == 3
+    assert requests[-1].headers['X-Service'] == 'classroom'
+
+    pool.close()
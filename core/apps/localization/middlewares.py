@@ -3,10 +3,18 @@ from typing import Callable
 from fastapi import Request
 
 from core.apps.localization.services import LocalizationService
+from core.common.config import config
 
 
 async def localization_middleware(request: Request, call_next: Callable):
-    LocalizationService.translate_language = await LocalizationService.get_client_localization(
-        request.client.host,
+    language = (
+        await LocalizationService.get_client_localization(request.client.host)
+        or LocalizationService.get_accepted_language(request.headers.get('Accept-Language'))
+        or config.DEFAULT_LANGUAGE
     )
-    return await call_next(request)
+    token = LocalizationService.set_language(language)
+
+    try:
+        return await call_next(request)
+    finally:
+        LocalizationService.reset_language(token)
@@ -1,10 +1,59 @@
+from contextvars import (
+    ContextVar,
+    Token,
+)
+from typing import Optional
+
 from core.apps.cache.services import RedisCacheService
 from core.common.config import config
+from core.common.helpers.ttl_cache import TTLCache
+
+
+current_language: ContextVar[str] = ContextVar(
+    'current_language',
+    default=config.DEFAULT_LANGUAGE,
+)
 
 
 class LocalizationService:
-    _cache_service: RedisCacheService = RedisCacheService()
-    translate_language: str = config.DEFAULT_LANGUAGE
+    _cache_service: RedisCacheService = RedisCacheService(namespace='localization')
+    # client choices seen by this worker, '' stands for no choice
+    _local_cache: TTLCache = TTLCache(
+        maxsize=config.LOCALIZATION_CACHE_SIZE,
+        ttl=config.LOCALIZATION_CACHE_TTL,
+    )
+
+    @classmethod
+    def get_language(cls) -> str:
+        """Returns language of the current request."""
+        return current_language.get()
+
+    @classmethod
+    def set_language(cls, language: str) -> Token:
+        return current_language.set(language)
+
+    @classmethod
+    def reset_language(cls, token: Token) -> None:
+        current_language.reset(token)
+
+    @classmethod
+    def get_accepted_language(cls, accept_language: Optional[str]) -> Optional[str]:
+        """Returns the most preferred supported language of the
+        `Accept-Language` header."""
+        languages = []
+
+        for position, language_range in enumerate((accept_language or '').split(',')):
+            language, _, parameters = language_range.strip().partition(';')
+            language = language.split('-')[0].strip().lower()
+
+            try:
+                quality = float(parameters.strip().partition('q=')[2] or 1)
+            except ValueError:
+                continue
+
+            if language in config.SUPPORTED_LANGUAGES and quality > 0:
+                languages.append((-quality, position, language))
+        return min(languages)[2] if languages else None
 
     @classmethod
     async def set_localization_to_client(cls, localization_code: str, client_address: str):
@@ -12,8 +61,20 @@ class LocalizationService:
             return False, {'localization': 'Language is not supported.'}
 
         await cls._cache_service.set_cache(client_address, localization_code.encode())
+        cls._local_cache.set(client_address, localization_code)
         return True, None
 
     @classmethod
-    async def get_client_localization(cls, client_address: str) -> str:
-        return (await cls._cache_service.get_cache(client_address) or b'en').decode()
+    async def get_client_localization(cls, client_address: str) -> Optional[str]:
+        """Returns language chosen by the client if any.
+
+        Choices are cached by the worker for `LOCALIZATION_CACHE_TTL`
+        seconds, so Redis is queried once per client in that period.
+
+        """
+        language = cls._local_cache.get(client_address)
+
+        if language is None:
+            language = (await cls._cache_service.get_cache(client_address) or b'').decode()
+            cls._local_cache.set(client_address, language)
+        return language or None
@@ -0,0 +1,85 @@
+from types import SimpleNamespace
+
+import pytest
+
+from core.apps.localization.middlewares import localization_middleware
+from core.apps.localization.services import LocalizationService
+from core.common.config import config
+
+
+CLIENT_ADDRESSES = ['10.0.0.1', '10.0.0.2', '10.0.0.3']
+
+
+@pytest.fixture
+async def redis_lookups(monkeypatch: pytest.MonkeyPatch) -> list:
+    LocalizationService._local_cache.clear()
+
+    for client_address in CLIENT_ADDRESSES:
+        await LocalizationService._cache_service.delete_cache(client_address)
+
+    lookups = []
+    get_cache = LocalizationService._cache_service.get_cache
+
+    async def counted_get_cache(key):
+        lookups.append(key)
+        return await get_cache(key)
+
+    monkeypatch.setattr(LocalizationService._cache_service, 'get_cache', counted_get_cache)
+    yield lookups
+    LocalizationService._local_cache.clear()
+
+
+@pytest.mark.parametrize(
+    'accept_language, language',
+    [
+        ('ru-RU,ru;q=0.9,en-US;q=0.8,en;q=0.7', 'ru'),
+        ('de-DE,de;q=0.9,en;q=0.5,ru;q=0.6', 'ru'),
+        ('en-GB;q=0.3,ru;q=0.0', 'en'),
+        ('de, fr;q=0.9', None),
+        ('ru;q=invalid', None),
+        ('', None),
+        (None, None),
+    ],
+)
+def test_get_accepted_language(accept_language, language):
+    assert LocalizationService.get_accepted_language(accept_language) == language
+
+
+@pytest.mark.asyncio
+async def test_client_localization_cached_locally(redis_lookups: list):
+    client_address = '10.0.0.1'
+
+    assert await LocalizationService.get_client_localization(client_address) is None
+    assert await LocalizationService.get_client_localization(client_address) is None
+    assert redis_lookups == [client_address]
+
+    _, errors = await LocalizationService.set_localization_to_client('ru', client_address)
+    assert errors is None
+
+    assert await LocalizationService.get_client_localization(client_address) == 'ru'
+    assert redis_lookups == [client_address]
+
+    LocalizationService._local_cache.clear()
+    assert await LocalizationService.get_client_localization(client_address) == 'ru'
+    assert redis_lookups == [client_address, client_address]
+
+
+@pytest.mark.asyncio
+async def test_middleware_sets_request_language(redis_lookups: list):
+    languages = []
+
+    async def call_next(request):
+        languages.append(LocalizationService.get_language())
+
+    def make_request(client_address: str, accept_language: str = None):
+        headers = {'Accept-Language': accept_language} if accept_language else {}
+        return SimpleNamespace(client=SimpleNamespace(host=client_address), headers=headers)
+
+    await LocalizationService.set_localization_to_client('en', '10.0.0.2')
+
+    await localization_middleware(make_request('10.0.0.2', 'ru'), call_next)
+    await localization_middleware(make_request('10.0.0.3', 'ru;q=0.8, en;q=0.1'), call_next)
+    await localization_middleware(make_request('10.0.0.3'), call_next)
+
+    assert languages == ['en', 'ru', config.DEFAULT_LANGUAGE]
+    assert LocalizationService.get_language() == config.DEFAULT_LANGUAGE
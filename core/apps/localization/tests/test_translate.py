@@ -0,0 +1,46 @@
+import pytest
+
+from core.apps.localization.services import LocalizationService
+from core.apps.localization.utils import (
+    translate,
+    translate_lazy,
+)
+
+
+MESSAGE = 'User with that credits is already registred.'
+
+
+@pytest.fixture
+def language():
+    tokens = []
+
+    def set_language(language: str):
+        tokens.append(LocalizationService.set_language(language))
+
+    yield set_language
+
+    for token in reversed(tokens):
+        LocalizationService.reset_language(token)
+
+
+def test_translate_uses_loaded_catalogs(language):
+    language('ru')
+    assert translate(MESSAGE) != MESSAGE
+
+    language('en')
+    assert translate(MESSAGE) == MESSAGE
+
+    language('de')
+    assert translate(MESSAGE) == MESSAGE
+
+
+def test_lazy_translation_resolved_on_render(language):
+    lazy_message = translate_lazy(MESSAGE)
+
+    language('ru')
+    assert str(lazy_message) == translate(MESSAGE)
+    assert lazy_message == translate(MESSAGE)
+
+    language('en')
+    assert str(lazy_message) == MESSAGE
+    assert f'{lazy_message}!' == f'{MESSAGE}!'
@@ -1,11 +1,78 @@
 import gettext
+from types import MappingProxyType
+from typing import (
+    Any,
+    Callable,
+    Mapping,
+)
 
 from core.apps.localization.services import LocalizationService
 from core.common.config import config
 
 
+def load_translators() -> Mapping[str, Callable[[str], str]]:
+    """Parses catalogs of every supported language once.
+
+    Returns immutable map of languages to their `gettext` functions, which
+    are plain catalog lookups.
+
+    """
+    return MappingProxyType({
+        language: gettext.translation(
+            'base',
+            localedir=config.LOCALE_DIR,
+            languages=[language],
+            fallback=True,
+        ).gettext
+        for language in config.SUPPORTED_LANGUAGES
+    })
+
+
+translators = load_translators()
+
+
 def translate(message: str) -> str:
-    language = LocalizationService.translate_language
-    return gettext.translation(
-        'base', localedir=config.LOCALE_DIR, languages=[language],
-    ).gettext(message)
+    translator = translators.get(LocalizationService.get_language())
+
+    if translator is None:
+        return message
+    return translator(message)
+
+
+class LazyString:
+    """Message which is translated to the current language each time it
+    is rendered.
+
+    Used for module level messages, which are created before any request
+    language is known.
+
+    """
+    __slots__ = ('message',)
+
+    def __init__(self, message: str) -> None:
+        self.message = message
+
+    def __str__(self) -> str:
+        return translate(self.message)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.message!r})'
+
+    def __eq__(self, other: Any) -> bool:
+        return str(self) == str(other)
+
+    def __hash__(self) -> int:
+        return hash(str(self))
+
+    def __add__(self, other: str) -> str:
+        return str(self) + other
+
+    def __radd__(self, other: str) -> str:
+        return other + str(self)
+
+    def format(self, *args, **kwargs) -> str:
+        return str(self).format(*args, **kwargs)
+
+
+def translate_lazy(message: str) -> LazyString:
+    return LazyString(message)
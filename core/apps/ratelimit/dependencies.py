@@ -0,0 +1,58 @@
+from fastapi import (
+    Depends,
+    Request,
+)
+
+from core.apps.ratelimit.exceptions import TooManyRequestsException
+from core.apps.ratelimit.services import (
+    rate_limiter_service,
+    RateLimiterService,
+)
+from core.apps.users.dependencies import get_current_user
+from core.apps.users.models import User
+from core.common.config import config
+
+
+class RateLimit:
+    """Route dependency limiting requests of a client to `requests` per
+    `period` seconds.
+
+    Clients are identified by IP address.
+
+    """
+
+    def __init__(
+        self,
+        scope: str,
+        requests: int,
+        period: float,
+        service: RateLimiterService = rate_limiter_service,
+    ) -> None:
+        self.scope = scope
+        self.requests = requests
+        self.period = period
+        self.service = service
+
+    async def check(self, identity: str) -> None:
+        if not config.RATE_LIMIT_ENABLED:
+            return
+
+        allowed, retry_after = await self.service.acquire(
+            scope=self.scope,
+            identity=identity,
+            requests=self.requests,
+            period=self.period,
+        )
+
+        if not allowed:
+            raise TooManyRequestsException(retry_after=retry_after)
+
+    async def __call__(self, request: Request) -> None:
+        await self.check(f'ip:{request.client.host}')
+
+
+class UserRateLimit(RateLimit):
+    """Rate limit of authenticated routes, clients are identified by user."""
+
+    async def __call__(self, user: User = Depends(get_current_user)) -> None:
+        await self.check(f'user:{user.id}')
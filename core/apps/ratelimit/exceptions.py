@@ -0,0 +1,14 @@
+import math
+
+from fastapi.exceptions import HTTPException
+
+from starlette import status
+
+
+class TooManyRequestsException(HTTPException):
+    def __init__(self, retry_after: float) -> None:
+        super().__init__(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail='Too many requests, please try again later.',
+            headers={'Retry-After': str(max(math.ceil(retry_after), 1))},
+        )
@@ -0,0 +1,128 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from core.apps.cache.services import RedisCacheService
+from core.common.config import config
+from core.common.helpers.ttl_cache import TTLCache
+
+
+logger = logging.getLogger(__name__)
+
+# Refills the bucket for the time passed since the previous request and
+# takes a token if there is one. Returns whether the request is allowed and
+# in how many seconds the next token will be available.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local refill_rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'timestamp')
+local tokens = tonumber(bucket[1]) or capacity
+local timestamp = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - timestamp) * refill_rate)
+
+local allowed = 0
+local retry_after = 0
+
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    retry_after = (1 - tokens) / refill_rate
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'timestamp', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / refill_rate) + 1)
+return {allowed, tostring(retry_after)}
+"""
+
+
+class RateLimiterService:
+    """Token bucket rate limiter.
+
+    Buckets live in Redis and are updated atomically by a Lua script, so
+    every worker shares them. While Redis is unavailable or slower than
+    `RATE_LIMIT_REDIS_TIMEOUT` each worker falls back to its own in-process
+    buckets and retries Redis after `RATE_LIMIT_REDIS_RETRY_INTERVAL`
+    seconds.
+
+    """
+
+    def __init__(self, cache_service: Optional[RedisCacheService] = None) -> None:
+        self._cache_service = cache_service or RedisCacheService(namespace='rate-limit')
+        self._local_buckets = TTLCache(
+            maxsize=config.RATE_LIMIT_LOCAL_BUCKETS,
+            ttl=config.RATE_LIMIT_REDIS_RETRY_INTERVAL * 10,
+        )
+        self._redis_retry_at = 0.0
+
+    @property
+    def client(self) -> Redis:
+        return self._cache_service.client
+
+    def make_key(self, scope: str, identity: str) -> str:
+        return self._cache_service.make_key(f'{scope}:{identity}')
+
+    async def _acquire_redis(
+        self,
+        key: str,
+        capacity: int,
+        refill_rate: float,
+        now: float,
+    ) -> tuple[bool, float]:
+        token_bucket_script = self.client.register_script(TOKEN_BUCKET_SCRIPT)
+        allowed, retry_after = await asyncio.wait_for(
+            token_bucket_script(keys=[key], args=[capacity, refill_rate, now]),
+            timeout=config.RATE_LIMIT_REDIS_TIMEOUT,
+        )
+        return bool(allowed), float(retry_after)
+
+    def _acquire_local(
+        self,
+        key: str,
+        capacity: int,
+        refill_rate: float,
+        now: float,
+    ) -> tuple[bool, float]:
+        tokens, timestamp = self._local_buckets.get(key, (capacity, now))
+        tokens = min(capacity, tokens + max(0.0, now - timestamp) * refill_rate)
+
+        if tokens >= 1:
+            self._local_buckets.set(key, (tokens - 1, now))
+            return True, 0.0
+
+        self._local_buckets.set(key, (tokens, now))
+        return False, (1 - tokens) / refill_rate
+
+    async def acquire(
+        self,
+        scope: str,
+        identity: str,
+        requests: int,
+        period: float,
+    ) -> tuple[bool, float]:
+        """Takes a token from the bucket of the identity.
+
+        Returns whether the request is allowed and the number of seconds
+        after which it should be retried otherwise.
+
+        """
+        key = self.make_key(scope, identity)
+        refill_rate = requests / period
+        now = time.time()
+
+        if now >= self._redis_retry_at:
+            try:
+                return await self._acquire_redis(key, requests, refill_rate, now)
+            except (RedisError, asyncio.TimeoutError) as error:
+                logger.warning('Rate limiter falls back to local buckets: %s', error)
+                self._redis_retry_at = now + config.RATE_LIMIT_REDIS_RETRY_INTERVAL
+
+        return self._acquire_local(key, requests, refill_rate, now)
+
+
+rate_limiter_service = RateLimiterService()
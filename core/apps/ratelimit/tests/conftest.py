@@ -0,0 +1 @@
+from core.tests.conftest import *  # no qa
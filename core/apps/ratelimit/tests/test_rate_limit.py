@@ -0,0 +1,71 @@
+import uuid
+
+from fastapi import status
+from fastapi.applications import FastAPI
+
+import pytest
+from redis.asyncio import Redis
+
+from core.apps.cache.services import RedisCacheService
+from core.apps.ratelimit.services import (
+    rate_limiter_service,
+    RateLimiterService,
+)
+from core.common.config import config
+from core.tests.client import FastAPITestClient
+
+
+@pytest.mark.asyncio
+async def test_redis_token_bucket():
+    scope = uuid.uuid4().hex
+
+    for _ in range(3):
+        allowed, _ = await rate_limiter_service.acquire(scope, 'ip:test', requests=3, period=60)
+        assert allowed
+
+    allowed, retry_after = await rate_limiter_service.acquire(scope, 'ip:test', requests=3, period=60)
+    assert not allowed
+    assert 0 < retry_after <= 20
+
+    allowed, _ = await rate_limiter_service.acquire(scope, 'ip:other', requests=3, period=60)
+    assert allowed
+
+
+class UnreachableCacheService(RedisCacheService):
+    @property
+    def client(self) -> Redis:
+        return Redis(host='127.0.0.1', port=1)
+
+
+@pytest.mark.asyncio
+async def test_local_fallback_when_redis_is_down():
+    service = RateLimiterService(cache_service=UnreachableCacheService(namespace='rate-limit'))
+    scope = uuid.uuid4().hex
+
+    assert (await service.acquire(scope, 'ip:test', requests=1, period=60))[0]
+    assert service._redis_retry_at
+
+    allowed, retry_after = await service.acquire(scope, 'ip:test', requests=1, period=60)
+    assert not allowed
+    assert 0 < retry_after <= 60
+
+
+@pytest.mark.asyncio
+async def test_authenticate_rate_limited(
+    app: FastAPI,
+    client: FastAPITestClient,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(config, 'RATE_LIMIT_ENABLED', True)
+    await rate_limiter_service.client.delete(rate_limiter_service.make_key('authenticate', 'ip:testclient'))
+    url = app.url_path_for('authenticate_user')
+    credentials = {'username': 'nobody@example.com', 'password': 'Password1'}
+    requests, _ = config.AUTHENTICATE_RATE_LIMIT
+
+    for _ in range(requests):
+        response = client.post(url, data=credentials)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    response = client.post(url, data=credentials)
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert int(response.headers['Retry-After']) >= 1
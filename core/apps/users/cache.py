@@ -0,0 +1,95 @@
+from datetime import datetime
+from typing import (
+    Any,
+    Optional,
+    Union,
+)
+
+import sqlalchemy as sa
+
+from core.apps.cache.services import RedisCacheService
+from core.apps.users.models import User
+from core.common.config import config
+from core.common.helpers.ttl_cache import TTLCache
+
+
+UserId = Union[int, str]
+
+
+class CurrentUserCache:
+    """Cache of authenticated users snapshots.
+
+    In-process entries are keyed by user id and token `jti` and live for a
+    few seconds, which bounds staleness in other workers. Optional Redis
+    entries are keyed by user id only, so one delete invalidates them for
+    every worker.
+
+    """
+    _cache_service: RedisCacheService = RedisCacheService(namespace='current-user')
+
+    def __init__(self) -> None:
+        self._local_cache = TTLCache(
+            maxsize=config.CURRENT_USER_CACHE_SIZE,
+            ttl=config.CURRENT_USER_CACHE_TTL,
+        )
+
+    def _make_snapshot(self, user: User) -> dict[str, Any]:
+        snapshot = {}
+
+        for column in User.__table__.columns:
+            value = getattr(user, column.key)
+
+            if isinstance(value, datetime):
+                value = value.isoformat()
+            snapshot[column.key] = value
+        return snapshot
+
+    def _restore_user(self, snapshot: dict[str, Any]) -> User:
+        """Returns a new detached user on each call, so request handlers
+        never share mutable instances."""
+        values = {}
+
+        for column in User.__table__.columns:
+            value = snapshot.get(column.key)
+
+            if value is not None and isinstance(column.type, sa.DateTime):
+                value = datetime.fromisoformat(value)
+            values[column.key] = value
+        return User(**values)
+
+    async def get(self, user_id: UserId, jti: Optional[str]) -> Optional[User]:
+        local_key = (str(user_id), jti)
+        snapshot = self._local_cache.get(local_key)
+
+        if snapshot is None and config.CURRENT_USER_REDIS_CACHE:
+            snapshot = await self._cache_service.get_json_cache(
+                str(user_id),
+            )
+
+            if snapshot is not None:
+                self._local_cache.set(local_key, snapshot)
+
+        if snapshot is None:
+            return None
+        return self._restore_user(snapshot)
+
+    async def set(self, user: User, jti: Optional[str]) -> None:
+        snapshot = self._make_snapshot(user)
+        self._local_cache.set((str(user.id), jti), snapshot)
+
+        if config.CURRENT_USER_REDIS_CACHE:
+            await self._cache_service.set_json_cache(
+                str(user.id),
+                snapshot,
+                expire=config.CURRENT_USER_REDIS_CACHE_TTL,
+            )
+
+    async def invalidate(self, user_id: UserId) -> None:
+        user_id = str(user_id)
+        self._local_cache.discard_where(lambda key: key[0] == user_id)
+
+        if config.CURRENT_USER_REDIS_CACHE:
+            await self._cache_service.delete_cache(str(user_id))
+
+
+current_user_cache = CurrentUserCache()
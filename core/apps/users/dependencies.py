@@ -1,26 +1,45 @@
 from typing import Optional
 
 from fastapi import Depends
-from fastapi_jwt_auth import AuthJWT
 
+from dependency_injector.wiring import (
+    inject,
+    Provide,
+)
+
+from core.apps.users.cache import current_user_cache
 from core.apps.users.exceptions import NotAuthenticatedException
 from core.apps.users.models import User
 from core.apps.users.oauth import oauth2_scheme
 from core.apps.users.services.user_service import UserService
+from core.common.containers import MainContainer
+from core.common.helpers.jwt import JWTManager
+
+
+async def _get_token_user(
+    claims: dict,
+    user_service: UserService,
+) -> Optional[User]:
+    user_id, jti = claims['sub'], claims.get('jti')
+    current_user = await current_user_cache.get(user_id, jti)
+
+    if current_user is None:
+        current_user, _ = await user_service.retrieve(id=user_id)
+
+        if current_user:
+            await current_user_cache.set(current_user, jti)
+    return current_user
 
 
+@inject
 async def _get_current_user(
     token: Optional[str] = Depends(oauth2_scheme),
     user_service: UserService = Depends(),
+    jwt_manager: JWTManager = Depends(Provide[MainContainer.jwt_manager]),
 ):
     if not token:
         return None
-
-    # TODO: костыль, убрать. выпилить вообще эту либу нах
-    Authorize = AuthJWT()
-    user_id = Authorize.get_raw_jwt(token)['sub']
-    current_user, _ = await user_service.retrieve(id=user_id)
-    return current_user
+    return await _get_token_user(jwt_manager.decode(token), user_service)
 
 
 async def get_current_user(
@@ -31,14 +50,12 @@ async def get_current_user(
     return current_user
 
 
-async def get_websocket_user(token: str):
-    Authorize = AuthJWT()
-    user_service = UserService()
-
-    Authorize.jwt_required('websocket', token=token)
-    user_id = Authorize.get_raw_jwt(token)['sub']
-
-    current_user, _ = await user_service.retrieve(id=user_id)
+@inject
+async def get_websocket_user(
+    token: str,
+    jwt_manager: JWTManager = Provide[MainContainer.jwt_manager],
+):
+    current_user = await _get_token_user(jwt_manager.decode(token), UserService())
 
     if not current_user:
         raise NotAuthenticatedException()
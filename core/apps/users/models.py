@@ -14,7 +14,7 @@ class User(BaseDBModel):
     activation_token = sa.Column(sa.String(256))
     activation_deadline_dt = sa.Column(sa.DateTime)
     is_active = sa.Column(sa.Boolean, default=False)
-    email = sa.Column(sa.String(255), default='')
+    email = sa.Column(sa.String(255), default='', index=True)
     gender = sa.Column(sa.String(50))
     is_banned = sa.Column(sa.Boolean, default=False)
     last_login = sa.Column(sa.DateTime)
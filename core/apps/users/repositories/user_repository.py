@@ -3,13 +3,20 @@ from typing import Union
 
 from sqlalchemy import (
     func,
+    literal_column,
     select,
 )
+from sqlalchemy.orm import aliased
 
+from core.apps.classroom.models import Participation
 from core.apps.users.models import User
-from core.apps.users.utils import hash_string
 from core.common.config import config
 from core.common.repositories.base import CRUDRepository
+from core.common.repositories.search import (
+    is_postgresql,
+    set_trigram_threshold,
+    trigram_match,
+)
 from core.common.utils import get_current_datetime
 
 
@@ -31,19 +38,6 @@ class UserRepository(CRUDRepository):
     async def update_last_login(self, user: User) -> User:
         await self.update({'last_login': get_current_datetime()}, id=user.id)
 
-    async def get_user_by_auth_credentials(
-        self,
-        password: str,
-        email: str = None,
-    ):
-        async with self.get_session() as session:
-            statement = select(self._model).filter(
-                self._model.password == hash_string(password),
-                self._model.is_active == True,
-                self._model.email == email,
-            )
-            return (await session.execute(statement)).scalars().first()
-
     async def activate_user(
         self,
         activation_token: str,
@@ -114,3 +108,41 @@ class UserRepository(CRUDRepository):
             )
             user = (await session.execute(statement)).scalars().first()
         return user
+
+    def _get_name_expression(self):
+        # literal separator, so the expression matches the trigram index
+        return self._model.first_name + literal_column("' '") + self._model.last_name
+
+    async def search_roommates(self, user_id: int, search: str, limit: int) -> list[_model]:
+        """Returns active users sharing a room with the user whose names
+        match the search, best matches first.
+
+        On Postgres names are matched with typos by the trigram index,
+        other databases fall back to substring matching.
+
+        """
+        user_participation = aliased(Participation)
+        roommate_participation = aliased(Participation)
+        roommate_ids = select(roommate_participation.user_id).join(
+            user_participation,
+            user_participation.room_id == roommate_participation.room_id,
+        ).filter(
+            user_participation.user_id == user_id,
+        )
+        name = self._get_name_expression()
+        statement = select(self._model).filter(
+            self._model.id.in_(roommate_ids),
+            self._model.id != user_id,
+            self._model.is_active == True,
+        ).limit(limit)
+
+        async with self.get_session() as session:
+            if is_postgresql(session):
+                condition, rank = trigram_match(name, search)
+                statement = statement.filter(condition).order_by(rank.desc(), self._model.id)
+                await set_trigram_threshold(session)
+            else:
+                statement = statement.filter(name.ilike(f'%{search}%')).order_by(self._model.id)
+
+            result = await session.execute(statement)
+            return result.scalars().all()
@@ -5,7 +5,6 @@ from datetime import (
     datetime,
     timedelta,
 )
-from hashlib import md5
 from typing import (
     Any,
     Optional,
@@ -23,12 +22,17 @@ from itsdangerous.exc import BadSignature
 from starlette import status
 
 from core.apps.attachments.models import Attachment
+from core.apps.attachments.repositories.attachment_derivative_repository import AttachmentDerivativeRepository
 from core.apps.attachments.repositories.attachment_repository import AttachmentRepository
 from core.apps.integrations.authentications.vk.client import VKIntegratioinClient
 from core.apps.integrations.authentications.vk.schemas import VKResponseUserInfoSchema
 from core.apps.integrations.containers import IntegrationContainer
 from core.apps.integrations.exceptions import IntegrationException
-from core.apps.localization.utils import translate as _
+from core.apps.localization.utils import (
+    translate as _,
+    translate_lazy as _lazy,
+)
+from core.apps.users.cache import current_user_cache
 from core.apps.users.constants import EMAIL_REGEX
 from core.apps.users.models import User
 from core.apps.users.repositories.user_repository import UserRepository
@@ -36,7 +40,11 @@ from core.apps.users.schemas import (
     UserLoginSchema,
     UserPasswordResetSchema,
 )
-from core.apps.users.utils import resize_image
+from core.apps.users.utils import (
+    hash_password,
+    make_image_derivatives,
+    verify_password,
+)
 from core.common.config import config
 from core.common.exceptions import ServiceError
 from core.common.services.base import (
@@ -55,10 +63,13 @@ from core.scheduler.tasks.user import send_password_reset_email
 class UserService(CRUDService):
     _repository: UserRepository = UserRepository()
     _attachment_repository: AttachmentRepository = AttachmentRepository()
+    _attachment_derivative_repository: AttachmentDerivativeRepository = (
+        AttachmentDerivativeRepository()
+    )
 
     error_messages = {
-        'create': _('User with that credits is already registred.'),
-        'does_not_exist': _('User not found. He is either inactive or not registred yet.'),
+        'create': _lazy('User with that credits is already registred.'),
+        'does_not_exist': _lazy('User not found. He is either inactive or not registred yet.'),
     }
 
     def set_user(self, user: User):
@@ -72,9 +83,6 @@ class UserService(CRUDService):
             user_id = self.user.id
         return user_id
 
-    def _hash_password(self, password: str) -> str:
-        return md5(password.encode()).hexdigest()  # no qa
-
     async def validate_password(self, value: str) -> ResultTuple:
         if self.user is not None and self.user.is_external and not value:
             return True, None
@@ -126,7 +134,9 @@ class UserService(CRUDService):
     async def validate_confirm_password(self, value: str) -> ResultTuple:
         if not self.user.password and self.user.is_external:
             return True, None
-        if self._hash_password(value) != self.user.password:
+        is_valid, _needs_rehash = await verify_password(value, self.user.password)
+
+        if not is_valid:
             return False, _('Incorrect password')
         return True, None
 
@@ -139,7 +149,7 @@ class UserService(CRUDService):
         password = attrs.get('password')
 
         if password:
-            attrs['password'] = self._hash_password(password)
+            attrs['password'] = await hash_password(password)
             attrs.pop('repeat_password', None)
 
         if self.action == 'create':
@@ -151,6 +161,14 @@ class UserService(CRUDService):
             attrs.pop('accept_eula')
         return await super().validate(attrs)
 
+    @action
+    async def update(self, id: Union[int, str], *args, **kwargs):
+        """Updates user and drops cached snapshots, e.g. after profile
+        changes or bans."""
+        updated_user, errors = await super().update(id, *args, **kwargs)
+        await current_user_cache.invalidate(id)
+        return updated_user, errors
+
     @action
     async def authenticate_user(
         self,
@@ -161,14 +179,21 @@ class UserService(CRUDService):
                 'email': _('this field is required'),
             }
 
-        user = await self._repository.get_user_by_auth_credentials(
-            password=userLoginSchema.password,
-            email=userLoginSchema.email,
+        user = await self._repository.retrieve_active_user(email=userLoginSchema.email)
+        is_valid, needs_rehash = await verify_password(
+            userLoginSchema.password,
+            user.password if user else None,
         )
 
-        if not user:
+        if not is_valid:
             return None, _('User not found or inactive')
+        if needs_rehash:
+            await self._repository.update(
+                values={'password': await hash_password(userLoginSchema.password)},
+                id=user.id,
+            )
         await self._repository.update_last_login(user)
+        await current_user_cache.invalidate(user.id)
         return user, None
 
     @action
@@ -179,6 +204,25 @@ class UserService(CRUDService):
             return False
         return True
 
+    @action
+    async def search_roommates(
+        self,
+        user_id: int,
+        search: str,
+        limit: int = config.ROOMMATE_SEARCH_LIMIT,
+    ) -> tuple[list[User], None]:
+        """Autocompletes names of users sharing a room with the user, e.g.
+        when starting a dialog."""
+        search = search.strip()
+
+        if not search:
+            return [], None
+        return await self._repository.search_roommates(
+            user_id=user_id,
+            search=search,
+            limit=min(limit, config.ROOMMATE_SEARCH_MAX_LIMIT),
+        ), None
+
     @action
     async def initiate_user_password_reset(
         self,
@@ -236,6 +280,7 @@ class UserService(CRUDService):
             user_id,
             new_password=attrs['password'],
         )
+        await current_user_cache.invalidate(user_id)
         return user, None
 
     async def _upload_profile_picture(
@@ -249,14 +294,22 @@ class UserService(CRUDService):
         if errors:
             return None, {'content_type_of_profile_photo': errors}
 
-        resized_picture = await resize_image(
+        derivatives = await make_image_derivatives(
             await profile_photo.read(),
-            new_size=config.PROFILE_PICTURE_RESOLUTION,
+            sizes=config.PROFILE_PICTURE_DERIVATIVE_SIZES,
+            formats=config.IMAGE_DERIVATIVE_FORMATS,
         )
 
         created_attachment = await self._attachment_repository.create(
             filename=profile_photo.filename,
-            source=resized_picture,
+            source=derivatives[
+                config.PROFILE_PICTURE_RESOLUTION,
+                config.IMAGE_FALLBACK_FORMAT,
+            ],
+        )
+        await self._attachment_derivative_repository.create_for_attachment(
+            attachment_id=created_attachment.id,
+            derivatives=derivatives,
         )
         return get_attachment_path(created_attachment.id), None
 
@@ -279,6 +332,7 @@ class UserService(CRUDService):
             },
             id=user.id,
         )
+        await current_user_cache.invalidate(user.id)
 
         return updated_user, None
 
@@ -0,0 +1,86 @@
+from fastapi import status
+from fastapi.applications import FastAPI
+
+import pytest
+
+from core.apps.users.cache import CurrentUserCache
+from core.apps.users.repositories.user_repository import UserRepository
+from core.apps.users.utils import hash_string
+from core.common.config import config
+from core.common.helpers.ttl_cache import TTLCache
+from core.tests.client import FastAPITestClient
+from core.tests.factories.user import UserFactory
+
+
+USER_TEST_PASSWORD = 'testpPassword123'
+
+
+def test_ttl_cache_expiration_and_eviction():
+    now = [0.0]
+    cache = TTLCache(maxsize=2, ttl=10, timer=lambda: now[0])
+
+    cache.set('first', 1)
+    cache.set('second', 2)
+    assert cache.get('first') == 1
+
+    cache.set('third', 3)
+    assert cache.get('second') is None
+    assert len(cache) == 2
+
+    now[0] = 10
+    assert cache.get('first') is None
+    assert cache.get('third') is None
+    assert not len(cache)
+
+
+@pytest.mark.asyncio
+async def test_current_user_cached_and_invalidated(
+    app: FastAPI,
+    client: FastAPITestClient,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    user = await UserFactory.create(password=hash_string(USER_TEST_PASSWORD))
+    retrieve = UserRepository.retrieve
+    retrieved_ids = []
+
+    async def counted_retrieve(self, *args, **kwargs):
+        retrieved_ids.append(kwargs.get('id'))
+        return await retrieve(self, *args, **kwargs)
+
+    monkeypatch.setattr(UserRepository, 'retrieve', counted_retrieve)
+    client.authorize(user)
+    url = app.url_path_for('current_user_info')
+
+    for _ in range(3):
+        response = client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+    assert len(retrieved_ids) == 1
+
+    response = client.put(
+        app.url_path_for('update_current_user'),
+        json={
+            'first_name': 'Renamed',
+            'confirm_password': USER_TEST_PASSWORD,
+        },
+    )
+    assert response.status_code == status.HTTP_200_OK, response.json()
+
+    response = client.get(url)
+    assert response.json()['first_name'] == 'Renamed'
+
+
+@pytest.mark.asyncio
+async def test_current_user_redis_cache(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(config, 'CURRENT_USER_REDIS_CACHE', True)
+    user = await UserFactory.create()
+    cache = CurrentUserCache()
+
+    await cache.set(user, jti='first')
+    cached_user = await CurrentUserCache().get(user.id, jti='second')
+    assert cached_user.id == user.id
+    assert cached_user.email == user.email
+    assert cached_user.last_login == user.last_login
+
+    await cache.invalidate(user.id)
+    assert await cache.get(user.id, jti='first') is None
+    assert await CurrentUserCache().get(user.id, jti='second') is None
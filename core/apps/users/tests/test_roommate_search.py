@@ -0,0 +1,58 @@
+from fastapi import status
+from fastapi.applications import FastAPI
+
+from sqlalchemy.dialects import postgresql
+
+import pytest
+
+from core.apps.users.repositories.user_repository import UserRepository
+from core.common.repositories.search import trigram_match
+from core.tests.client import FastAPITestClient
+from core.tests.factories.classroom.participation import ParticipationFactory
+from core.tests.factories.classroom.room import RoomFactory
+from core.tests.factories.user import UserFactory
+
+
+@pytest.mark.asyncio
+async def test_trigram_match_statement(user_repository: UserRepository):
+    condition, rank = trigram_match(user_repository._get_name_expression(), 'Ivn Petro')
+    compile_kwargs = {'dialect': postgresql.dialect(paramstyle='named'), 'compile_kwargs': {'literal_binds': True}}
+
+    # the expression has to match the one of the trigram index
+    assert str(condition.compile(**compile_kwargs)) == (
+        "CAST('Ivn Petro' AS TEXT) <% (users.first_name || ' ' || users.last_name)"
+    )
+    assert str(rank.compile(**compile_kwargs)) == (
+        "word_similarity(CAST('Ivn Petro' AS TEXT), users.first_name || ' ' || users.last_name)"
+    )
+
+
+@pytest.mark.asyncio
+async def test_search_roommates(
+    app: FastAPI,
+    client: FastAPITestClient,
+):
+    room = await RoomFactory.create()
+    participation = await ParticipationFactory.create(room=room)
+    roommate = await UserFactory.create(first_name='Ivan', last_name='Petrov')
+    await ParticipationFactory.create(room=room, user=roommate)
+    await ParticipationFactory.create(
+        room=room,
+        user=await UserFactory.create(first_name='Maria', last_name='Sidorova'),
+    )
+    await ParticipationFactory.create(
+        user=await UserFactory.create(first_name='Ivan', last_name='Petrovsky'),
+    )
+    url = app.url_path_for('search_roommates')
+
+    client.authorize(participation.user)
+    response = client.get(url, params={'search': 'ivan'})
+    assert response.status_code == status.HTTP_200_OK, response.json()
+    assert [user['id'] for user in response.json()] == [roommate.id]
+
+    response = client.get(url, params={'search': participation.user.first_name})
+    assert response.status_code == status.HTTP_200_OK, response.json()
+    assert participation.user.id not in [user['id'] for user in response.json()]
+
+    response = client.get(url, params={'search': 'ivan', 'limit': 1000})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
@@ -12,7 +12,10 @@ import pytest
 from faker import Faker
 
 from core.apps.users.repositories.user_repository import UserRepository
-from core.apps.users.utils import hash_string
+from core.apps.users.utils import (
+    hash_string,
+    verify_password,
+)
 from core.tests.factories.user import UserFactory
 
 
@@ -104,6 +107,33 @@ async def test_authentication_success_email(
     assert user.last_login.date() == datetime.utcnow().date()
 
 
+@pytest.mark.asyncio
+async def test_authentication_upgrades_legacy_hash(
+    app: FastAPI,
+    client: TestClient,
+    user_repository: UserRepository,
+):
+    url = app.url_path_for('authenticate_user')
+    user = await UserFactory.create(password=hash_string(USER_TEST_PASSWORD))
+    credentials = {
+        'username': user.email,
+        'password': USER_TEST_PASSWORD,
+    }
+
+    response = client.post(url, data=credentials)
+    assert response.status_code == status.HTTP_200_OK, response.json()
+
+    user = await user_repository.refresh(user)
+    assert user.password != hash_string(USER_TEST_PASSWORD)
+    assert await verify_password(USER_TEST_PASSWORD, user.password) == (True, False)
+
+    response = client.post(url, data=credentials)
+    assert response.status_code == status.HTTP_200_OK, response.json()
+
+    response = client.post(url, data={**credentials, 'password': USER_TEST_UPDATE_PASSWORD})
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED, response.json()
+
+
 @pytest.mark.asyncio
 async def test_authentication_fail_email(
     app: FastAPI,
@@ -9,7 +9,7 @@ from faker import Faker
 from pytest_mock import MockerFixture
 
 from core.apps.users.repositories.user_repository import UserRepository
-from core.apps.users.utils import hash_string
+from core.apps.users.utils import verify_password
 from core.tests.factories.user import UserFactory
 
 
@@ -56,7 +56,7 @@ async def test_user_registration_success(
     assert user.first_name == user_creds['first_name']
     assert user.last_name == user_creds['last_name']
     assert user.middle_name == user_creds['middle_name']
-    assert user.password == hash_string(password)
+    assert await verify_password(password, user.password) == (True, False)
     assert user.activation_token
     assert user.created_at.date() == datetime.utcnow().date()
     assert not user.is_active
@@ -0,0 +1,65 @@
+from datetime import timedelta
+
+from fastapi_jwt_auth import AuthJWT
+
+import pytest
+
+from core.common.config import config
+from core.common.helpers.jwt import (
+    JWTError,
+    JWTManager,
+)
+
+
+def test_legacy_token_verified():
+    token = AuthJWT().create_access_token(subject=1, expires_time=timedelta(minutes=1))
+    claims = JWTManager(secret_key=config.JWT_SECRET_KEY).decode(token)
+
+    assert claims['sub'] == 1
+    assert claims['jti']
+
+
+def test_key_rotation():
+    old_manager = JWTManager(
+        secret_key='default',
+        keys={'old': 'old-secret'},
+        signing_key_id='old',
+    )
+    new_manager = JWTManager(
+        secret_key='default',
+        keys={'old': 'old-secret', 'new': 'new-secret'},
+        signing_key_id='new',
+    )
+    old_token = old_manager.create_access_token(subject=1, expires_time=timedelta(minutes=1))
+    new_token = new_manager.create_access_token(subject=2, expires_time=timedelta(minutes=1))
+
+    assert new_manager.decode(old_token)['sub'] == 1
+    assert new_manager.decode(new_token)['sub'] == 2
+
+    with pytest.raises(JWTError):
+        old_manager.decode(new_token)
+
+
+@pytest.mark.parametrize(
+    'make_token',
+    [
+        lambda token: token[:-2] + ('AA' if not token.endswith('AA') else 'BB'),
+        lambda token: token.replace('.', '', 1),
+        lambda token: 'eyJhbGciOiJub25lIn0.' + token.split('.', 1)[1],
+    ],
+)
+def test_invalid_token(make_token):
+    manager = JWTManager(secret_key='default')
+    token = manager.create_access_token(subject=1, expires_time=timedelta(minutes=1))
+
+    with pytest.raises(JWTError):
+        manager.decode(make_token(token))
+
+
+def test_expired_token_rejected_after_cache():
+    manager = JWTManager(secret_key='default')
+    token = manager.create_access_token(subject=1, expires_time=timedelta(seconds=-1))
+
+    for _ in range(2):
+        with pytest.raises(JWTError, match='expired'):
+            manager.decode(token)
@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from core.common.helpers.password_hashers import (
+    LegacyMD5PasswordHasher,
+    PasswordManager,
+    ScryptPasswordHasher,
+)
+
+
+@pytest.fixture(scope='module')
+def password_manager():
+    manager = PasswordManager(algorithm='scrypt', max_workers=2)
+    yield manager
+    manager.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_password_hash_verified(password_manager: PasswordManager):
+    encoded = await password_manager.hash('Password1')
+
+    assert encoded.startswith('scrypt$')
+    assert encoded != await password_manager.hash('Password1')
+    assert await password_manager.verify('Password1', encoded) == (True, False)
+    assert await password_manager.verify('Password2', encoded) == (False, False)
+    assert await password_manager.verify('Password1', None) == (False, False)
+    assert await password_manager.verify('Password1', 'garbage') == (False, False)
+
+
+@pytest.mark.asyncio
+async def test_legacy_and_outdated_hashes_need_rehash(password_manager: PasswordManager):
+    legacy_encoded = LegacyMD5PasswordHasher().hash('Password1')
+    outdated_encoded = ScryptPasswordHasher(n=2 ** 10).hash('Password1')
+
+    assert await password_manager.verify('Password1', legacy_encoded) == (True, True)
+    assert await password_manager.verify('Password1', outdated_encoded) == (True, True)
+    assert await password_manager.verify('Password2', legacy_encoded) == (False, False)
+
+
+@pytest.mark.asyncio
+async def test_password_hashing_does_not_block_event_loop(password_manager: PasswordManager):
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+
+        while True:
+            await asyncio.sleep(0.001)
+            ticks += 1
+
+    ticker_task = asyncio.create_task(ticker())
+    await asyncio.gather(*[password_manager.hash('Password1') for _ in range(4)])
+    ticker_task.cancel()
+
+    assert ticks > 4
+
+
+def test_password_manager_shared_between_event_loops(password_manager: PasswordManager):
+    async def hash_concurrently():
+        return await asyncio.gather(*[password_manager.hash('Password1') for _ in range(4)])
+
+    for _ in range(2):
+        loop = asyncio.new_event_loop()
+
+        try:
+            assert len(loop.run_until_complete(hash_concurrently())) == 4
+        finally:
+            loop.close()
@@ -1,5 +1,8 @@
+import asyncio
 import hashlib
+from functools import partial
 from io import BytesIO
+from typing import Optional
 
 from dependency_injector.wiring import (
     inject,
@@ -7,20 +10,59 @@ from dependency_injector.wiring import (
 )
 
 from core.common.containers import MainContainer
-from core.common.helpers.image_resizer import ImageResizer
+from core.common.helpers.image_resizer import (
+    ImageDerivatives,
+    ImageResizer,
+)
+from core.common.helpers.password_hashers import PasswordManager
 
 
 def hash_string(string: str):
+    """Legacy unsalted password hash, upgraded on login."""
     return hashlib.md5(string.encode()).hexdigest()
 
 
+@inject
+async def hash_password(
+    password: str,
+    password_manager: PasswordManager = Provide[MainContainer.password_manager],
+) -> str:
+    return await password_manager.hash(password)
+
+
+@inject
+async def verify_password(
+    password: str,
+    encoded: Optional[str],
+    password_manager: PasswordManager = Provide[MainContainer.password_manager],
+) -> tuple[bool, bool]:
+    """Returns whether the password matches and whether it should be
+    rehashed."""
+    return await password_manager.verify(password, encoded)
+
+
 @inject
 async def resize_image(
     picture_bytes: BytesIO,
     new_size: int,
     image_resizer: ImageResizer = Provide[MainContainer.image_resizer],
 ) -> BytesIO:
-    return image_resizer.get_resized_picture(
-        picture_bytes,
-        new_size=new_size,
+    return await asyncio.get_running_loop().run_in_executor(
+        None,
+        partial(image_resizer.get_resized_picture, picture_bytes, new_size=new_size),
+    )
+
+
+@inject
+async def make_image_derivatives(
+    picture_bytes: bytes,
+    sizes: list[int],
+    formats: list[str],
+    image_resizer: ImageResizer = Provide[MainContainer.image_resizer],
+) -> ImageDerivatives:
+    """Encodes the picture in a thread, decoding and WebP encoding of
+    large pictures would block the event loop for the whole upload."""
+    return await asyncio.get_running_loop().run_in_executor(
+        None,
+        partial(image_resizer.get_derivatives, picture_bytes, sizes=sizes, formats=formats),
     )
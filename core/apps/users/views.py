@@ -13,15 +13,19 @@ from fastapi.responses import (
     RedirectResponse,
 )
 from fastapi.security import OAuth2PasswordRequestForm
-from fastapi_jwt_auth import AuthJWT
 
-from dependency_injector.wiring import inject
+from dependency_injector.wiring import (
+    inject,
+    Provide,
+)
 from starlette import status
 
 from core.apps.localization.services import LocalizationService
+from core.apps.ratelimit.dependencies import RateLimit
 from core.apps.users.dependencies import get_current_user
 from core.apps.users.models import User
 from core.apps.users.schemas import (
+    AuthorSchema,
     ProfilePicturePath,
     UserHyperlinkEmailSchema,
     UserLoginSchema,
@@ -35,8 +39,10 @@ from core.apps.users.schemas import (
 )
 from core.apps.users.services.user_service import UserService
 from core.common.config import config
+from core.common.containers import MainContainer
 from core.common.enums import OperationResultStatusEnum
 from core.common.exceptions import ServiceError
+from core.common.helpers.jwt import JWTManager
 from core.common.schemas import OperationResultSchema
 from core.scheduler.tasks.user import send_activation_email
 
@@ -63,6 +69,7 @@ async def activate_user(
     response_model=UserRegistrationCompleteSchema,
     status_code=status.HTTP_201_CREATED,
     operation_id='registerUser',
+    dependencies=[Depends(RateLimit('register', *config.REGISTER_RATE_LIMIT))],
 )
 async def register_user(
     request: Request,
@@ -85,7 +92,7 @@ async def register_user(
                 hyperlink=activation_link,
                 first_name=user.first_name,
             ),
-            localization=LocalizationService.translate_language,
+            localization=LocalizationService.get_language(),
         )
         return user
     raise HTTPException(detail=errors, status_code=status.HTTP_400_BAD_REQUEST)
@@ -95,11 +102,13 @@ async def register_user(
     '/authenticate',
     response_model=UserLoginSuccessSchema,
     operation_id='authenticateUser',
+    dependencies=[Depends(RateLimit('authenticate', *config.AUTHENTICATE_RATE_LIMIT))],
 )
+@inject
 async def authenticate_user(
     user_service: UserService = Depends(),
     form_data: OAuth2PasswordRequestForm = Depends(),
-    Authorize: AuthJWT = Depends(),
+    jwt_manager: JWTManager = Depends(Provide[MainContainer.jwt_manager]),
 ):
     user_login_schema = UserLoginSchema(email=form_data.username, password=form_data.password)
     user, error_message = await user_service.authenticate_user(user_login_schema)
@@ -110,7 +119,7 @@ async def authenticate_user(
             detail=error_message,
         )
 
-    access_token = Authorize.create_access_token(
+    access_token = jwt_manager.create_access_token(
         subject=user.id,
         expires_time=config.AUTHORIZATION_TOKEN_EXPIRES_TIMEDELTA,
     )
@@ -149,6 +158,27 @@ async def user_info(
     return UserProfileSchema.from_orm(user)
 
 
+@router.get(
+    '/roommates',
+    response_model=list[AuthorSchema],
+    operation_id='searchRoommates',
+    summary='Search roommates',
+    description='Autocompletes names of users sharing a room with the current user',
+)
+async def search_roommates(
+    search: str = Query(...),
+    limit: int = Query(config.ROOMMATE_SEARCH_LIMIT, ge=1, le=config.ROOMMATE_SEARCH_MAX_LIMIT),
+    current_user: User = Depends(get_current_user),
+    user_service: UserService = Depends(),
+):
+    roommates, _ = await user_service.search_roommates(
+        user_id=current_user.id,
+        search=search,
+        limit=limit,
+    )
+    return roommates
+
+
 @router.put(
     '/profile/current',
     response_model=UserProfileSchema,
@@ -177,6 +207,7 @@ async def update_current_user(
     '/request-reset-password',
     response_model=OperationResultSchema,
     operation_id='initiateUserPasswordReset',
+    dependencies=[Depends(RateLimit('password-reset', *config.PASSWORD_RESET_RATE_LIMIT))],
 )
 async def initiate_user_password_reset(
     schema: UserPasswordResetInitiationSchema,
@@ -210,7 +241,7 @@ async def initiate_user_password_reset(
             hyperlink=redirect_url,
             first_name=user.first_name,
         ),
-        localization=LocalizationService.translate_language,
+        localization=LocalizationService.get_language(),
     )
     return JSONResponse(content=response_schema.dict())
 
@@ -271,10 +302,11 @@ async def add_profile_picture(
     response_model=UserLoginSuccessSchema,
     operation_id='OAuthVK',
 )
+@inject
 async def authenticate_via_vk(
     code: str = Query(...),
     user_service: UserService = Depends(),
-    Authorize: AuthJWT = Depends(),
+    jwt_manager: JWTManager = Depends(Provide[MainContainer.jwt_manager]),
 ):
     try:
         vk_user_data = await user_service.get_vk_user_data_by_code(code=code)
@@ -294,7 +326,7 @@ async def authenticate_via_vk(
             profile_picture_path=vk_user_data.photo_400_orig,
         )
 
-    access_token = Authorize.create_access_token(
+    access_token = jwt_manager.create_access_token(
         subject=user.id,
         expires_time=config.AUTHORIZATION_TOKEN_EXPIRES_TIMEDELTA,
     )
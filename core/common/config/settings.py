@@ -34,10 +34,17 @@ class ProjectSettings(BaseModel):
     )
     DB_TEST_CONNECTION_STRING: str = 'sqlite+aiosqlite://'
     TEST_MODE: bool = bool(int(env('TEST_MODE', default=0)))
+    # rows fetched from a server-side cursor at once by repository streams
+    DB_STREAM_YIELD_PER: int = 1000
+    # statement templates of distinct fetch shapes kept by repositories
+    DB_STATEMENT_CACHE_SIZE: int = 500
     # END DB SETTINGS
 
     # CLEANUP SETTINGS
-    CLEANUP_TIMEOUT: int = env('CLEANUP_TIMEOUT')
+    # seconds before unattached uploads are considered abandoned
+    CLEANUP_TIMEOUT: int = env('CLEANUP_TIMEOUT', int)
+    ATTACHMENTS_GC_BATCH_SIZE: int = 500
+    ATTACHMENTS_GC_MAX_BATCHES: int = 20
     # END CLEANUP SETTINGS
 
     # CORS SETTINGS
@@ -67,6 +74,14 @@ class ProjectSettings(BaseModel):
     USER_SUCCESS_STATUS: str = 'success'
     USER_PERMISSION_DENIED_ERROR: str = 'You are not logged in.'
     AUTHORIZATION_TOKEN_EXPIRES_TIMEDELTA: timedelta = timedelta(days=3)
+    JWT_SECRET_KEY: str = env('AUTHJWT_SECRET_KEY')
+    # scrypt, argon2id (argon2-cffi) or bcrypt (bcrypt)
+    PASSWORD_HASHER: str = env('PASSWORD_HASHER', default='scrypt')
+    PASSWORD_HASHING_WORKERS: int = 4
+    # additional keys by `kid`, e.g. JWT_SECRET_KEYS=2024-01=secret,2024-06=secret
+    JWT_SECRET_KEYS: dict[str, str] = env.dict('JWT_SECRET_KEYS', default={})
+    # `kid` of the key used to sign new tokens, the default key if empty
+    JWT_SIGNING_KEY_ID: str = env('JWT_SIGNING_KEY_ID', default='')
 
     # EXTERNAL SETTINGS
     FRONTEND_LOGIN_URL: str = env('FRONTEND_LOGIN_URL')
@@ -79,7 +94,12 @@ class ProjectSettings(BaseModel):
 
     # FILE SETTINGS
     MAX_FILE_SIZE: int = 64 * 1024 * 1024
+    ZIP_STREAM_CHUNK_SIZE: int = 1024 * 1024
     PROFILE_PICTURE_RESOLUTION = 200
+    PROFILE_PICTURE_DERIVATIVE_SIZES: list[int] = [PROFILE_PICTURE_RESOLUTION, 100, 50]
+    # ordered by preference, clients get the first format they accept
+    IMAGE_DERIVATIVE_FORMATS: list[str] = ['WEBP', 'JPEG']
+    IMAGE_FALLBACK_FORMAT: str = 'JPEG'
 
     # POSTS SETTINGS
     TITLE_MAX_LENGTH: int = 150
@@ -90,18 +110,78 @@ class ProjectSettings(BaseModel):
 
     # STATIC
     STATIC_URL = env('STATIC_URL')
+    SIGNED_STATIC_URL = env(
+        'SIGNED_STATIC_URL',
+        default=STATIC_URL.format(file_id='signed/{token}'),
+    )
+    ATTACHMENT_URL_SALT: str = 'attachment'
+    ATTACHMENT_URL_TIMEDELTA: timedelta = timedelta(minutes=15)
+    # internal location of the reverse proxy serving signed downloads,
+    # e.g. /internal/attachments/{file_id}, streamed by the app if empty
+    ATTACHMENT_INTERNAL_REDIRECT_URL: str = env(
+        'ATTACHMENT_INTERNAL_REDIRECT_URL',
+        default='',
+    )
     DEFAULT_PROFILE_PICTURE_URL = env('DEFAULT_PROFILE_PICTURE_URL')
 
+    # SEARCH
+    # stems cyrillic words as russian and latin ones as english
+    POST_SEARCH_CONFIG: str = 'russian'
+    POST_SEARCH_HEADLINE_OPTIONS: str = (
+        'StartSel=<mark>, StopSel=</mark>, MinWords=15, MaxWords=35, MaxFragments=2'
+    )
+    # lower than the pg_trgm default of 0.6 to tolerate typos
+    TRIGRAM_SEARCH_THRESHOLD: float = 0.4
+    ROOMMATE_SEARCH_LIMIT: int = 10
+    ROOMMATE_SEARCH_MAX_LIMIT: int = 50
+
+    # EXPORT
+    # rows fetched from a server-side cursor and written to CSV at once
+    EXPORT_STREAM_BATCH_SIZE: int = 500
+
     # LOCALIZATION
     SUPPORTED_LANGUAGES = ['en', 'ru']
     LOCALE_DIR: str = BASE_DIR / 'locales'
     DEFAULT_LANGUAGE: str = 'en'
+    LOCALIZATION_CACHE_SIZE: int = 10000
+    LOCALIZATION_CACHE_TTL: int = 60
 
     CACHE_SERVICE_HOST: str = env('CACHE_SERVICE_HOST')
     CACHE_SERVICE_PORT: str = env('CACHE_SERVICE_PORT')
     CACHE_URL: str = env('SCHEDULER_REDIS_URL')
+    CACHE_KEY_PREFIX: str = env('CACHE_KEY_PREFIX', default='core')
+    CACHE_INVALIDATION_CHANNEL: str = 'cache-invalidation'
+    CACHE_INVALIDATION_RECONNECT_INTERVAL: int = 5
+    TIERED_CACHE_L1_SIZE: int = 1024
+    TIERED_CACHE_L1_TTL: int = 30
+    TIERED_CACHE_L2_TTL: int = 300
+
+    # RATE LIMITS
+    RATE_LIMIT_ENABLED: bool = env('RATE_LIMIT_ENABLED', bool, default=not TEST_MODE)
+    RATE_LIMIT_LOCAL_BUCKETS: int = 10000
+    RATE_LIMIT_REDIS_RETRY_INTERVAL: int = 30
+    RATE_LIMIT_REDIS_TIMEOUT: float = 0.5
+    # (requests, seconds)
+    AUTHENTICATE_RATE_LIMIT: tuple[int, int] = (10, 60)
+    REGISTER_RATE_LIMIT: tuple[int, int] = (5, 600)
+    PASSWORD_RESET_RATE_LIMIT: tuple[int, int] = (5, 600)
+    ATTACHMENTS_UPLOAD_RATE_LIMIT: tuple[int, int] = (30, 60)
+
+    # CURRENT USER CACHE
+    CURRENT_USER_CACHE_SIZE: int = 1024
+    CURRENT_USER_CACHE_TTL: int = 10
+    CURRENT_USER_REDIS_CACHE: bool = env('CURRENT_USER_REDIS_CACHE', bool, default=False)
+    CURRENT_USER_REDIS_CACHE_TTL: int = 300
     HUEY_IMMEDIATE: bool = env('HUEY_IMMEDIATE', bool)
 
+    # PARTICIPATION ROLE CACHE
+    PARTICIPATION_ROLE_CACHE_TTL: int = 60
+    PARTICIPATION_ROLE_CACHE_REDIS_TTL: int = 600
+
+    # GRADEBOOK CACHE
+    GRADEBOOK_CACHE_TTL: int = 30
+    GRADEBOOK_CACHE_REDIS_TTL: int = 600
+
     # CERTBOT
     WELL_KNOWN_PATH = '/var/www/certbot/{file_name}'
 
@@ -110,6 +190,16 @@ class ProjectSettings(BaseModel):
     TOKEN_TYPE = 'bearer'
 
     # INTEGRATIONS
+    HTTP_CLIENT_TIMEOUT: float = 10
+    HTTP_CLIENT_CONNECT_TIMEOUT: float = 3
+    HTTP_CLIENT_MAX_CONNECTIONS: int = 100
+    HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_CLIENT_KEEPALIVE_EXPIRY: float = 30
+    HTTP_CLIENT_RETRIES: int = 2
+    HTTP_CLIENT_RETRY_DELAY: float = 0.2
+    HTTP_CLIENT_RETRY_MAX_DELAY: float = 2
+    # used only if `h2` is installed
+    HTTP_CLIENT_HTTP2: bool = True
     VK_OAUTH_URL = 'https://oauth.vk.com'
     VK_API_URL = 'https://api.vk.com'
     VK_CLIENT_ID = env('VK_CLIENT_ID', default='')
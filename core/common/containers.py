@@ -6,7 +6,10 @@ from itsdangerous import TimedSerializer
 
 from core.common.config import config
 from core.common.helpers.image_resizer import ImageResizer
+from core.common.helpers.jwt import JWTManager
+from core.common.helpers.password_hashers import PasswordManager
 from core.common.integrations.base import HTTPXClient
+from core.common.integrations.pool import http_client_pool
 from core.common.services.notifications import NotificationsService
 
 
@@ -17,12 +20,16 @@ class MainContainer(containers.DeclarativeContainer):
             'core.common.utils',
             'core.apps.users.services.user_service',
             'core.apps.users.utils',
+            'core.apps.users.dependencies',
+            'core.apps.users.views',
         ],
     )
 
+    http_client_pool = providers.Object(http_client_pool)
     mail_client = providers.Factory(
         HTTPXClient,
         base_url=config.NOTIFICATIONS_BASE_URL,
+        client_pool=http_client_pool,
     )
     notifications_service = providers.Factory(
         NotificationsService,
@@ -36,3 +43,14 @@ class MainContainer(containers.DeclarativeContainer):
     image_resizer = providers.Factory(
         ImageResizer,
     )
+    jwt_manager = providers.Singleton(
+        JWTManager,
+        secret_key=config.JWT_SECRET_KEY,
+        keys=config.JWT_SECRET_KEYS,
+        signing_key_id=config.JWT_SIGNING_KEY_ID,
+    )
+    password_manager = providers.Singleton(
+        PasswordManager,
+        algorithm=config.PASSWORD_HASHER,
+        max_workers=config.PASSWORD_HASHING_WORKERS,
+    )
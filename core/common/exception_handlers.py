@@ -4,9 +4,18 @@ from fastapi_jwt_auth.exceptions import AuthJWTException
 
 from starlette import status
 
+from core.common.helpers.jwt import JWTError
+
 
 def authjwt_exception_handler(request: Request, exc: AuthJWTException):
     return JSONResponse(
         status_code=status.HTTP_401_UNAUTHORIZED,
         content={'detail': exc.message},
     )
+
+
+def jwt_exception_handler(request: Request, exc: JWTError):
+    return JSONResponse(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        content={'detail': exc.message},
+    )
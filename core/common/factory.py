@@ -8,9 +8,15 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi_jwt_auth.exceptions import AuthJWTException
 from fastapi_pagination import add_pagination
 
+from core.apps.cache.tiered import invalidation_listener
 from core.apps.localization.middlewares import localization_middleware
 from core.common.config import config
-from core.common.exception_handlers import authjwt_exception_handler
+from core.common.exception_handlers import (
+    authjwt_exception_handler,
+    jwt_exception_handler,
+)
+from core.common.helpers.jwt import JWTError
+from core.common.integrations.pool import http_client_pool
 
 
 API_V1_PREFIX = '/api/v1/'
@@ -47,6 +53,9 @@ class AppFactory:
         cls.add_middleware(app, 'http', localization_middleware)
 
         app.exception_handler(AuthJWTException)(authjwt_exception_handler)
+        app.exception_handler(JWTError)(jwt_exception_handler)
+        app.on_event('startup')(invalidation_listener.start)
+        app.on_event('shutdown')(http_client_pool.aclose)
 
         add_pagination(app)
         return app
@@ -1,9 +1,21 @@
 from io import BytesIO
+from typing import Iterable
 
-from PIL import Image
+from PIL import (
+    features,
+    Image,
+)
+
+
+ImageDerivatives = dict[tuple[int, str], bytes]
 
 
 class ImageResizer:
+    # formats which require optional Pillow codecs
+    optional_formats: dict[str, str] = {
+        'WEBP': 'webp',
+    }
+
     def get_proportional_size(
         self,
         size_profile_picture: tuple,
@@ -17,13 +29,80 @@ class ImageResizer:
 
         return size_of_side, new_size
 
-    def get_resized_picture(self, profile_picture: bytes, new_size: int) -> bytes:
-        img = Image.open(BytesIO(profile_picture)).convert('RGB')
-        size_profile_picture = img.size
+    def is_format_supported(self, image_format: str) -> bool:
+        feature = self.optional_formats.get(image_format)
+
+        if feature is None:
+            return True
+        return features.check(feature)
+
+    def _open_image(self, picture: bytes, largest_size: int) -> Image.Image:
+        """Decodes the picture once.
 
-        resized_image = img.resize(
-            self.get_proportional_size(size_profile_picture, new_size),
+        For JPEG sources draft mode lets the decoder downscale by a power
+        of two while decoding, so huge photos are never fully decoded.
+
+        """
+        img = Image.open(BytesIO(picture))
+        img.draft('RGB', self.get_proportional_size(img.size, largest_size))
+        return img.convert('RGB')
+
+    def _downscale(self, img: Image.Image, new_size: int) -> Image.Image:
+        if new_size >= max(img.size):
+            # small pictures are kept as they are rather than upscaled
+            return img
+
+        target_size = self.get_proportional_size(img.size, new_size)
+        reduce_factor = min(
+            img.size[0] // max(target_size[0], 1),
+            img.size[1] // max(target_size[1], 1),
         )
+
+        if reduce_factor > 1:
+            img = img.reduce(reduce_factor)
+        return img.resize(target_size)
+
+    def _encode(self, img: Image.Image, image_format: str) -> bytes:
         byte_io = BytesIO()
-        resized_image.save(byte_io, format='JPEG')
+        img.save(byte_io, format=image_format)
         return byte_io.getvalue()
+
+    def get_derivatives(
+        self,
+        picture: bytes,
+        sizes: Iterable[int],
+        formats: Iterable[str],
+    ) -> ImageDerivatives:
+        """Returns the picture encoded in every size and format.
+
+        The source is decoded only once, each smaller size is produced from
+        the previous one. Sizes not smaller than the source keep its size.
+        Result keys are `(size, format)` tuples.
+
+        """
+        sizes = sorted(set(sizes), reverse=True)
+        formats = [
+            image_format for image_format in formats
+            if self.is_format_supported(image_format)
+        ]
+        derivatives: ImageDerivatives = {}
+
+        if not sizes:
+            return derivatives
+
+        img = self._open_image(picture, sizes[0])
+
+        for size in sizes:
+            img = self._downscale(img, size)
+
+            for image_format in formats:
+                derivatives[size, image_format] = self._encode(img, image_format)
+        return derivatives
+
+    def get_resized_picture(self, profile_picture: bytes, new_size: int) -> bytes:
+        derivatives = self.get_derivatives(
+            profile_picture,
+            sizes=[new_size],
+            formats=['JPEG'],
+        )
+        return derivatives[new_size, 'JPEG']
@@ -0,0 +1,161 @@
+import base64
+import hashlib
+import hmac
+import json
+import time
+import uuid
+from datetime import timedelta
+from typing import (
+    Any,
+    Optional,
+    Union,
+)
+
+from core.common.helpers.ttl_cache import TTLCache
+
+
+class JWTError(Exception):
+    def __init__(self, message: str) -> None:
+        super().__init__(message)
+        self.message = message
+
+
+def _base64url_encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b'=')
+
+
+def _base64url_decode(data: bytes) -> bytes:
+    return base64.urlsafe_b64decode(data + b'=' * (-len(data) % 4))
+
+
+def _json_dumps(value: dict[str, Any]) -> bytes:
+    return json.dumps(value, separators=(',', ':')).encode()
+
+
+class JWTManager:
+    """Issues and verifies HS256 access tokens.
+
+    Secret keys are parsed once per instance. Tokens carry the `kid`
+    header of the signing key, so old keys can be kept for verification
+    while a new one is used for signing. Tokens without `kid` are
+    verified with the default secret key.
+
+    Verified headers and claims are cached by token, only time based
+    claims are checked on every call.
+
+    """
+    algorithm: str = 'HS256'
+    token_type: str = 'access'
+
+    def __init__(
+        self,
+        secret_key: str,
+        keys: Optional[dict[str, str]] = None,
+        signing_key_id: Optional[str] = None,
+        cache_size: int = 1024,
+        cache_ttl: float = 300,
+    ) -> None:
+        self._default_key = self._load_key(secret_key)
+        self._keys = {
+            key_id: self._load_key(key)
+            for key_id, key in (keys or {}).items()
+        }
+
+        if signing_key_id and signing_key_id not in self._keys:
+            raise ValueError(f'Unknown signing key id: {signing_key_id}')
+
+        self._signing_key_id = signing_key_id or None
+        self._verified_tokens = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+
+    def _load_key(self, secret_key: str) -> 'hmac.HMAC':
+        return hmac.new(secret_key.encode(), digestmod=hashlib.sha256)
+
+    def _get_key(self, key_id: Optional[str]) -> 'hmac.HMAC':
+        if key_id is None:
+            return self._default_key
+
+        try:
+            return self._keys[key_id]
+        except KeyError:
+            raise JWTError('Unknown signing key')
+
+    def _sign(self, key: 'hmac.HMAC', signing_input: bytes) -> bytes:
+        mac = key.copy()
+        mac.update(signing_input)
+        return mac.digest()
+
+    def create_access_token(
+        self,
+        subject: Union[str, int],
+        expires_time: timedelta,
+    ) -> str:
+        now = int(time.time())
+        header = {'alg': self.algorithm, 'typ': 'JWT'}
+
+        if self._signing_key_id:
+            header['kid'] = self._signing_key_id
+
+        claims = {
+            'sub': subject,
+            'iat': now,
+            'nbf': now,
+            'jti': str(uuid.uuid4()),
+            'exp': now + int(expires_time.total_seconds()),
+            'type': self.token_type,
+            'fresh': False,
+        }
+        signing_input = b'.'.join([
+            _base64url_encode(_json_dumps(header)),
+            _base64url_encode(_json_dumps(claims)),
+        ])
+        signature = self._sign(self._get_key(self._signing_key_id), signing_input)
+        return b'.'.join([signing_input, _base64url_encode(signature)]).decode()
+
+    def _verify_signature(self, token: str) -> tuple[dict[str, Any], dict[str, Any]]:
+        try:
+            signing_input, encoded_signature = token.encode().rsplit(b'.', 1)
+            encoded_header, encoded_claims = signing_input.split(b'.')
+            header = json.loads(_base64url_decode(encoded_header))
+            signature = _base64url_decode(encoded_signature)
+        except (ValueError, TypeError):
+            raise JWTError('Invalid token format')
+
+        if not isinstance(header, dict) or header.get('alg') != self.algorithm:
+            raise JWTError('Unsupported token algorithm')
+
+        key = self._get_key(header.get('kid'))
+
+        if not hmac.compare_digest(self._sign(key, signing_input), signature):
+            raise JWTError('Signature verification failed')
+
+        try:
+            claims = json.loads(_base64url_decode(encoded_claims))
+        except (ValueError, TypeError):
+            raise JWTError('Invalid token format')
+
+        if not isinstance(claims, dict) or 'sub' not in claims:
+            raise JWTError('Invalid token claims')
+        if claims.get('type', self.token_type) != self.token_type:
+            raise JWTError(f'Only {self.token_type} token allowed')
+        return header, claims
+
+    def _validate_time_claims(self, claims: dict[str, Any]) -> None:
+        now = time.time()
+
+        if 'exp' in claims and claims['exp'] <= now:
+            raise JWTError('Signature has expired')
+        if 'nbf' in claims and claims['nbf'] > now:
+            raise JWTError('The token is not yet valid')
+
+    def decode(self, token: str) -> dict[str, Any]:
+        """Returns claims of a valid access token, raises `JWTError`
+        otherwise."""
+        verified = self._verified_tokens.get(token)
+
+        if verified is None:
+            verified = self._verify_signature(token)
+            self._verified_tokens.set(token, verified)
+
+        _, claims = verified
+        self._validate_time_claims(claims)
+        return claims
@@ -0,0 +1,241 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Optional,
+    Sequence,
+)
+
+
+try:
+    import argon2
+except ImportError:
+    argon2 = None
+
+try:
+    import bcrypt
+except ImportError:
+    bcrypt = None
+
+
+class BasePasswordHasher:
+    algorithm: str
+
+    def hash(self, password: str) -> str:
+        raise NotImplementedError()
+
+    def verify(self, password: str, encoded: str) -> bool:
+        raise NotImplementedError()
+
+    def identify(self, encoded: str) -> bool:
+        return encoded.startswith(f'{self.algorithm}$')
+
+    def needs_rehash(self, encoded: str) -> bool:
+        return False
+
+
+class ScryptPasswordHasher(BasePasswordHasher):
+    """Memory-hard hasher from the standard library."""
+    algorithm: str = 'scrypt'
+
+    def __init__(self, n: int = 2 ** 14, r: int = 8, p: int = 1) -> None:
+        self.n, self.r, self.p = n, r, p
+
+    def _derive(self, password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+        return hashlib.scrypt(
+            password.encode(),
+            salt=salt,
+            n=n,
+            r=r,
+            p=p,
+            maxmem=256 * n * r,
+            dklen=32,
+        )
+
+    def hash(self, password: str) -> str:
+        salt = os.urandom(16)
+        derived_key = self._derive(password, salt, self.n, self.r, self.p)
+        return '$'.join([
+            self.algorithm,
+            str(self.n),
+            str(self.r),
+            str(self.p),
+            base64.b64encode(salt).decode(),
+            base64.b64encode(derived_key).decode(),
+        ])
+
+    def _split(self, encoded: str) -> tuple[int, int, int, bytes, bytes]:
+        _, n, r, p, salt, derived_key = encoded.split('$')
+        return int(n), int(r), int(p), base64.b64decode(salt), base64.b64decode(derived_key)
+
+    def verify(self, password: str, encoded: str) -> bool:
+        try:
+            n, r, p, salt, derived_key = self._split(encoded)
+        except ValueError:
+            return False
+        return hmac.compare_digest(self._derive(password, salt, n, r, p), derived_key)
+
+    def needs_rehash(self, encoded: str) -> bool:
+        n, r, p, *_ = self._split(encoded)
+        return (n, r, p) != (self.n, self.r, self.p)
+
+
+class Argon2PasswordHasher(BasePasswordHasher):
+    """argon2id hasher, requires `argon2-cffi`."""
+    algorithm: str = 'argon2id'
+
+    def __init__(self) -> None:
+        if argon2 is None:
+            raise RuntimeError('argon2-cffi is required for argon2id password hashing.')
+        self._hasher = argon2.PasswordHasher(type=argon2.Type.ID)
+
+    def identify(self, encoded: str) -> bool:
+        return encoded.startswith('$argon2id$')
+
+    def hash(self, password: str) -> str:
+        return self._hasher.hash(password)
+
+    def verify(self, password: str, encoded: str) -> bool:
+        try:
+            return self._hasher.verify(encoded, password)
+        except (argon2.exceptions.VerificationError, argon2.exceptions.InvalidHash):
+            return False
+
+    def needs_rehash(self, encoded: str) -> bool:
+        return self._hasher.check_needs_rehash(encoded)
+
+
+class BcryptPasswordHasher(BasePasswordHasher):
+    """bcrypt hasher, requires `bcrypt`."""
+    algorithm: str = 'bcrypt'
+
+    def __init__(self, rounds: int = 12) -> None:
+        if bcrypt is None:
+            raise RuntimeError('bcrypt is required for bcrypt password hashing.')
+        self.rounds = rounds
+
+    def identify(self, encoded: str) -> bool:
+        return encoded.startswith(('$2a$', '$2b$', '$2y$'))
+
+    def hash(self, password: str) -> str:
+        return bcrypt.hashpw(password.encode(), bcrypt.gensalt(self.rounds)).decode()
+
+    def verify(self, password: str, encoded: str) -> bool:
+        try:
+            return bcrypt.checkpw(password.encode(), encoded.encode())
+        except ValueError:
+            return False
+
+    def needs_rehash(self, encoded: str) -> bool:
+        return int(encoded.split('$')[2]) != self.rounds
+
+
+class LegacyMD5PasswordHasher(BasePasswordHasher):
+    """Verifies unsalted MD5 hashes, which are always upgraded."""
+    algorithm: str = 'md5'
+    _encoded_regex = re.compile(r'^[0-9a-f]{32}$')
+
+    def identify(self, encoded: str) -> bool:
+        return bool(self._encoded_regex.match(encoded))
+
+    def hash(self, password: str) -> str:
+        return hashlib.md5(password.encode()).hexdigest()
+
+    def verify(self, password: str, encoded: str) -> bool:
+        return hmac.compare_digest(self.hash(password), encoded)
+
+    def needs_rehash(self, encoded: str) -> bool:
+        return True
+
+
+PASSWORD_HASHERS: dict[str, type[BasePasswordHasher]] = {
+    ScryptPasswordHasher.algorithm: ScryptPasswordHasher,
+    Argon2PasswordHasher.algorithm: Argon2PasswordHasher,
+    BcryptPasswordHasher.algorithm: BcryptPasswordHasher,
+}
+
+
+class PasswordManager:
+    """Hashes and verifies passwords in a bounded thread pool.
+
+    New hashes are made by the preferred hasher, hashes of the other
+    available hashers and legacy MD5 ones are still verified and reported
+    as needing rehash. At most `max_workers` hashes are computed at once,
+    the rest wait in the executor queue without blocking the event loop.
+
+    """
+
+    def __init__(
+        self,
+        algorithm: str,
+        max_workers: int,
+        legacy_hashers: Optional[Sequence[BasePasswordHasher]] = None,
+    ) -> None:
+        self.hasher = PASSWORD_HASHERS[algorithm]()
+        self._hashers = [self.hasher]
+
+        for hasher_class in PASSWORD_HASHERS.values():
+            if hasher_class.algorithm == algorithm:
+                continue
+
+            try:
+                self._hashers.append(hasher_class())
+            except RuntimeError:
+                continue
+
+        self._hashers.extend(legacy_hashers or [LegacyMD5PasswordHasher()])
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix='password-hasher',
+        )
+        # verified against unknown users to keep response time the same
+        self._dummy_encoded = self.hasher.hash(os.urandom(16).hex())
+
+    async def _run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor,
+            func,
+            *args,
+        )
+
+    def _identify(self, encoded: str) -> Optional[BasePasswordHasher]:
+        for hasher in self._hashers:
+            if hasher.identify(encoded):
+                return hasher
+        return None
+
+    def _verify(self, password: str, encoded: str) -> tuple[bool, bool]:
+        hasher = self._identify(encoded)
+
+        if hasher is None:
+            return False, False
+        if not hasher.verify(password, encoded):
+            return False, False
+        return True, hasher is not self.hasher or hasher.needs_rehash(encoded)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.hasher.hash, password)
+
+    async def verify(
+        self,
+        password: str,
+        encoded: Optional[str],
+    ) -> tuple[bool, bool]:
+        """Returns whether the password matches and whether its hash should
+        be upgraded.
+
+        Missing hashes are verified against a dummy one, so unknown users
+        cost the same time as known ones.
+
+        """
+        if not encoded:
+            await self._run(self.hasher.verify, password, self._dummy_encoded)
+            return False, False
+        return await self._run(self._verify, password, encoded)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False)
@@ -1,4 +1,7 @@
-from dataclasses import dataclass
+from dataclasses import (
+    dataclass,
+    field,
+)
 from functools import partialmethod
 from typing import (
     Optional,
@@ -10,6 +13,10 @@ import httpx
 
 from core.common.integrations.const import SAFE_METHODS
 from core.common.integrations.exceptions import IntegrationException
+from core.common.integrations.pool import (
+    http_client_pool,
+    HTTPClientPool,
+)
 
 
 @dataclass
@@ -64,6 +71,7 @@ class IClient(Protocol):
 @dataclass
 class HTTPXClient(IClient):
     base_url: str
+    client_pool: HTTPClientPool = field(default=http_client_pool)
 
     def __post_init__(self):
         self.headers = {}
@@ -71,8 +79,8 @@ class HTTPXClient(IClient):
     def set_headers(self, new_headers: dict) -> None:
         self.headers.update(new_headers)
 
-    def __get_client(self):
-        return httpx.Client(base_url=self.base_url, headers=self.headers)
+    def __get_client(self) -> httpx.Client:
+        return self.client_pool.get_client(self.base_url)
 
     def _make_request(
         self,
@@ -85,24 +93,23 @@ class HTTPXClient(IClient):
         json: Optional[dict] = kwargs.get('json')
         data: Optional[dict] = kwargs.get('data')
 
-        with self.__get_client() as client:
-            request_kwargs = self.__build_request_kwargs(
-                method,
-                params,
-                headers,
-                json,
-                data,
-            )
-
-            request_method = getattr(client, method)
-            response = request_method(
-                urljoin(self.base_url, uri),
-                **request_kwargs,
-            )
-
-            if response.is_error:
-                raise IntegrationException(response.content)
-            return response.json()
+        request_kwargs = self.__build_request_kwargs(
+            method,
+            params,
+            {**self.headers, **(headers or {})},
+            json,
+            data,
+        )
+
+        request_method = getattr(self.__get_client(), method)
+        response = request_method(
+            urljoin(self.base_url, uri),
+            **request_kwargs,
+        )
+
+        if response.is_error:
+            raise IntegrationException(response.content)
+        return response.json()
 
     def __build_request_kwargs(
         self,
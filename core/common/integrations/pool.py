@@ -0,0 +1,165 @@
+import asyncio
+import random
+import time
+from importlib.util import find_spec
+from typing import Optional
+
+import httpx
+
+from core.common.config import config
+
+
+IDEMPOTENT_METHODS = {'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'}
+RETRY_STATUS_CODES = {429, 502, 503, 504}
+# the request has not reached the server, so any method is safe to retry
+CONNECT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+def get_retry_delay(attempt: int) -> float:
+    """Exponential backoff with full jitter."""
+    return random.uniform(
+        0,
+        min(config.HTTP_CLIENT_RETRY_MAX_DELAY, config.HTTP_CLIENT_RETRY_DELAY * 2 ** attempt),
+    )
+
+
+def should_retry_error(request: httpx.Request, error: httpx.TransportError) -> bool:
+    return isinstance(error, CONNECT_ERRORS) or request.method in IDEMPOTENT_METHODS
+
+
+def should_retry_response(request: httpx.Request, response: httpx.Response) -> bool:
+    return (
+        request.method in IDEMPOTENT_METHODS
+        and response.status_code in RETRY_STATUS_CODES
+    )
+
+
+class RetryTransport(httpx.BaseTransport):
+    def __init__(self, transport: httpx.BaseTransport, retries: int) -> None:
+        self._transport = transport
+        self._retries = retries
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        for attempt in range(self._retries + 1):
+            is_last_attempt = attempt == self._retries
+
+            try:
+                response = self._transport.handle_request(request)
+            except httpx.TransportError as error:
+                if is_last_attempt or not should_retry_error(request, error):
+                    raise
+            else:
+                if is_last_attempt or not should_retry_response(request, response):
+                    return response
+                response.close()
+
+            time.sleep(get_retry_delay(attempt))
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+class AsyncRetryTransport(httpx.AsyncBaseTransport):
+    def __init__(self, transport: httpx.AsyncBaseTransport, retries: int) -> None:
+        self._transport = transport
+        self._retries = retries
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        for attempt in range(self._retries + 1):
+            is_last_attempt = attempt == self._retries
+
+            try:
+                response = await self._transport.handle_async_request(request)
+            except httpx.TransportError as error:
+                if is_last_attempt or not should_retry_error(request, error):
+                    raise
+            else:
+                if is_last_attempt or not should_retry_response(request, response):
+                    return response
+                await response.aclose()
+
+            await asyncio.sleep(get_retry_delay(attempt))
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class HTTPClientPool:
+    """Keeps one keep-alive client per base URL for the whole process.
+
+    Clients retry failed requests with jittered backoff and use HTTP/2
+    when `h2` is installed. `transport` replaces the network transport,
+    e.g. with `httpx.MockTransport` in tests.
+
+    """
+
+    def __init__(self, transport: Optional[httpx.MockTransport] = None) -> None:
+        self.transport = transport
+        self._clients: dict[str, httpx.Client] = {}
+        self._async_clients: dict[str, httpx.AsyncClient] = {}
+
+    @property
+    def http2(self) -> bool:
+        return config.HTTP_CLIENT_HTTP2 and find_spec('h2') is not None
+
+    @property
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=config.HTTP_CLIENT_MAX_CONNECTIONS,
+            max_keepalive_connections=config.HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=config.HTTP_CLIENT_KEEPALIVE_EXPIRY,
+        )
+
+    @property
+    def timeout(self) -> httpx.Timeout:
+        return httpx.Timeout(
+            config.HTTP_CLIENT_TIMEOUT,
+            connect=config.HTTP_CLIENT_CONNECT_TIMEOUT,
+        )
+
+    def get_client(self, base_url: str) -> httpx.Client:
+        client = self._clients.get(base_url)
+
+        if client is None or client.is_closed:
+            transport = self.transport or httpx.HTTPTransport(
+                http2=self.http2,
+                limits=self.limits,
+            )
+            client = httpx.Client(
+                base_url=base_url,
+                timeout=self.timeout,
+                transport=RetryTransport(transport, retries=config.HTTP_CLIENT_RETRIES),
+            )
+            self._clients[base_url] = client
+        return client
+
+    def get_async_client(self, base_url: str) -> httpx.AsyncClient:
+        client = self._async_clients.get(base_url)
+
+        if client is None or client.is_closed:
+            transport = self.transport or httpx.AsyncHTTPTransport(
+                http2=self.http2,
+                limits=self.limits,
+            )
+            client = httpx.AsyncClient(
+                base_url=base_url,
+                timeout=self.timeout,
+                transport=AsyncRetryTransport(transport, retries=config.HTTP_CLIENT_RETRIES),
+            )
+            self._async_clients[base_url] = client
+        return client
+
+    def close(self) -> None:
+        for client in self._clients.values():
+            client.close()
+        self._clients.clear()
+
+    async def aclose(self) -> None:
+        self.close()
+
+        for client in self._async_clients.values():
+            await client.aclose()
+        self._async_clients.clear()
+
+
+http_client_pool = HTTPClientPool()
@@ -0,0 +1,14 @@
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+class TSVector(sa.types.TypeDecorator):
+    """`tsvector` on Postgres, plain text on the other databases, e.g. the
+    sqlite test database."""
+    impl = sa.Text
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == 'postgresql':
+            return dialect.type_descriptor(postgresql.TSVECTOR())
+        return dialect.type_descriptor(sa.Text())
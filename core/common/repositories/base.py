@@ -1,6 +1,9 @@
+import math
 from abc import ABC
+from contextlib import asynccontextmanager
 from typing import (
     Any,
+    AsyncIterator,
     Callable,
     Optional,
     Union,
@@ -8,20 +11,28 @@ from typing import (
 
 import sqlalchemy
 from sqlalchemy import (
+    bindparam,
     delete,
     func,
     select,
     update,
 )
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy.ext.asyncio import (
+    AsyncResult,
+    AsyncSession,
+)
+from sqlalchemy.orm import (
+    joinedload,
+    selectinload,
+)
 
 from core.common.config import config
 from core.common.database import (
     async_session,
     test_session,
 )
+from core.common.helpers.ttl_cache import TTLCache
 from core.common.models.base import BaseDBModel
 from core.common.repositories.exceptions import ObjectAlreadyExistsException
 
@@ -30,6 +41,8 @@ class AbstractBaseRepository(ABC):
     _model: type[BaseDBModel] = NotImplemented
     _session_factory: Callable = async_session
     _integrity_error: type[Exception] = IntegrityError
+    # 'selectin' or 'joined' loading of join paths like 'dialog.participants'
+    join_strategies: dict[str, str] = {}
 
     def get_session(self) -> AsyncSession:
         return self._session_factory()
@@ -50,9 +63,56 @@ class AbstractBaseRepository(ABC):
     def model_fields(self):
         return self._model.__table__.columns
 
+    def _get_join_options_recursive(self, column: str, selectin: Optional[bool] = None):
+        """Returns loader option of the relations chain of the column.
+
+        Collections are loaded by `selectinload` to keep one row per object,
+        many-to-one relations by `joinedload`. `join_strategies` of the
+        repository, then `selectin` override the choice.
+
+        """
+        mapper = sqlalchemy.inspect(self._model)
+        path: list[str] = []
+        option = None
+
+        for field in column.split('.'):
+            relationship = mapper.relationships[field]
+            path.append(field)
+            mapper = relationship.mapper
+
+            strategy = self.join_strategies.get('.'.join(path))
+            use_selectin = relationship.uselist if strategy is None else strategy == 'selectin'
+
+            if selectin is not None:
+                use_selectin = selectin
+
+            if option is None:
+                option = selectinload(field) if use_selectin else joinedload(field)
+            else:
+                option = option.selectinload(field) if use_selectin else option.joinedload(field)
+        return option
+
+    async def _join_statement(
+        self,
+        statement,
+        columns: Optional[list[str]] = None,
+        selectin: Optional[bool] = None,
+    ):
+        """Loads relations of the columns, forcing separate `SELECT ... IN`
+        queries or joins if `selectin` is set."""
+        if not columns:
+            return statement
+
+        load_options = [
+            self._get_join_options_recursive(column, selectin=selectin) for column in columns
+        ]
+        statement = statement.options(*load_options)
+        return statement
+
 
 class ReadOnlyRepository(AbstractBaseRepository):
     default_ordering: list[str] = []
+    _fetch_templates: TTLCache = TTLCache(maxsize=config.DB_STATEMENT_CACHE_SIZE, ttl=math.inf)
 
     def _get_column_recursive(self, string: str):
         fields = string.split('.')
@@ -84,24 +144,6 @@ class ReadOnlyRepository(AbstractBaseRepository):
             return query.order_by(*ordering_fields)
         return query
 
-    async def _get_join_options_recursive(self, column: str):
-        fields = column.split('.')
-        option = joinedload(fields.pop(0))
-
-        for nested_field in fields:
-            option = option.joinedload(nested_field)
-        return option
-
-    async def _join_statement(self, statement, columns: Optional[list[str]] = None):
-        if not columns:
-            return statement
-
-        load_options = [
-            await self._get_join_options_recursive(column) for column in columns
-        ]
-        statement = statement.options(*load_options)
-        return statement
-
     async def _distinct_statement(
         self,
         statement,
@@ -142,6 +184,65 @@ class ReadOnlyRepository(AbstractBaseRepository):
             statement = statement.limit(limit)
         return statement
 
+    def _get_fetch_template(
+        self,
+        ordering: Optional[list[str]],
+        join: Optional[list[str]],
+        offset: Optional[int],
+        limit: Optional[int],
+        filters: dict[str, Any],
+    ) -> tuple[Any, dict[str, Any]]:
+        """Returns the `_fetch_statement` of the shape of the arguments with
+        filter values, offset and limit as bound parameters, and values of
+        the parameters.
+
+        Templates are kept per repository class, ordering, joins, names of
+        the filters, `None` filters and pagination, so repeated fetches of
+        a shape skip building the statement and its SQLAlchemy cache key,
+        and render the same SQL for prepared statements.
+
+        """
+        ordering = ordering or self.default_ordering
+        null_filters = frozenset(name for name, value in filters.items() if value is None)
+        key = (
+            type(self),
+            tuple(ordering),
+            tuple(join or ()),
+            tuple(sorted(filters)),
+            null_filters,
+            bool(offset),
+            bool(limit),
+        )
+        statement = self._fetch_templates.get(key)
+
+        if statement is None:
+            statement = select(self._model)
+
+            if join:
+                statement = statement.options(
+                    *[self._get_join_options_recursive(column) for column in join],
+                )
+
+            statement = statement.filter_by(**{
+                name: None if name in null_filters else bindparam(name) for name in filters
+            })
+
+            if ordering:
+                statement = statement.order_by(*self._get_ordering_fields(ordering))
+            if offset:
+                statement = statement.offset(bindparam('fetch_offset'))
+            if limit:
+                statement = statement.limit(bindparam('fetch_limit'))
+            self._fetch_templates.set(key, statement)
+
+        parameters = {name: value for name, value in filters.items() if value is not None}
+
+        if offset:
+            parameters['fetch_offset'] = offset
+        if limit:
+            parameters['fetch_limit'] = limit
+        return statement, parameters
+
     async def fetch(
         self,
         ordering: list[str] = None,
@@ -151,6 +252,60 @@ class ReadOnlyRepository(AbstractBaseRepository):
         **filters,
     ) -> list[BaseDBModel]:
         """Fetch list of object with the specific criteria."""
+        statement, parameters = self._get_fetch_template(ordering, join, offset, limit, filters)
+
+        async with self.get_session() as session:
+            result = await session.execute(statement, parameters)
+            return result.unique().scalars().all()
+
+    @asynccontextmanager
+    async def _stream_statement(
+        self,
+        statement,
+        yield_per: Optional[int] = None,
+    ) -> AsyncIterator[AsyncResult]:
+        """Executes statement on a server-side cursor, which fetches
+        `yield_per` rows at once.
+
+        The cursor and the session connection are released on exit from the
+        block, whether the result was read to the end or not.
+
+        """
+        statement = statement.execution_options(
+            yield_per=yield_per or config.DB_STREAM_YIELD_PER,
+        )
+
+        async with self.get_session() as session:
+            result = await session.stream(statement)
+
+            try:
+                yield result
+            finally:
+                await result.close()
+
+    @asynccontextmanager
+    async def stream(
+        self,
+        ordering: list[str] = None,
+        join: list[str] = None,
+        offset: int = 0,
+        limit: int = None,
+        yield_per: Optional[int] = None,
+        batches: bool = False,
+        **filters,
+    ) -> AsyncIterator[AsyncIterator[Union[BaseDBModel, list[BaseDBModel]]]]:
+        """Streams objects with the specific criteria, or lists of up to
+        `yield_per` of them if `batches` is set.
+
+        Unlike `fetch` only a batch of objects is held in memory. Joined
+        collections are loaded by a `SELECT ... IN` query per batch and
+        can't be forced to `joined` loading.
+
+            async with repository.stream(room_id=room_id) as posts:
+                async for post in posts:
+                    ...
+
+        """
         statement = await self._fetch_statement(
             ordering=ordering,
             join=join,
@@ -159,9 +314,9 @@ class ReadOnlyRepository(AbstractBaseRepository):
             **filters,
         )
 
-        async with self.get_session() as session:
-            result = await session.execute(statement)
-            return result.unique().scalars().all()
+        async with self._stream_statement(statement, yield_per=yield_per) as result:
+            scalars = result.scalars()
+            yield scalars.partitions() if batches else scalars
 
     async def _get_statement_with_unique_fields(
         self,
@@ -210,14 +365,10 @@ class ReadOnlyRepository(AbstractBaseRepository):
         join: list[str] = None,
         **filters,
     ) -> Union[BaseDBModel, None]:
-        statement = await self._fetch_statement(
-            ordering=ordering,
-            join=join,
-            **filters,
-        )
+        statement, parameters = self._get_fetch_template(ordering, join, None, None, filters)
 
         async with self.get_session() as session:
-            return (await session.execute(statement)).scalars().first()
+            return (await session.execute(statement, parameters)).scalars().first()
 
     async def exists(self, **filters) -> bool:
         statement = await self._fetch_statement(**filters)
@@ -241,17 +392,25 @@ class ReadOnlyRepository(AbstractBaseRepository):
 
 class CreateRepository(AbstractBaseRepository):
     async def create(self, join: list[str] = None, **kwargs) -> BaseDBModel:
+        """Creates object, `join` relations are loaded in the same session."""
         created_object = self._model(**kwargs)
 
         async with self.get_session() as session:
             session.add(created_object)
             try:
+                await session.flush()
+
+                if join:
+                    statement = await self._join_statement(
+                        select(self._model).filter_by(id=created_object.id),
+                        columns=join,
+                        selectin=True,
+                    )
+                    await session.execute(statement.execution_options(populate_existing=True))
                 await session.commit()
             except self._integrity_error as e:
                 raise ObjectAlreadyExistsException(e)
 
-            if join:
-                return await self.retrieve(id=created_object.id, join=join)
             return created_object
 
     async def get_or_create(self, **defaults) -> tuple[BaseDBModel, bool]:
@@ -270,15 +429,61 @@ class CreateRepository(AbstractBaseRepository):
 
 
 class UpdateRepository(AbstractBaseRepository):
+    @asynccontextmanager
+    async def _updating(self, values: dict[str, Any], **filters) -> AsyncIterator[None]:
+        """Wraps every update of the filtered queryset, overridden to act
+        before and after it, e.g. to invalidate caches."""
+        yield
+
+    def _update_statement(self, values: dict[str, Any], **filters):
+        return update(self._model).filter_by(**filters).values(**values)
+
+    def _returning_statement(self, statement):
+        """Selects objects of the model from rows returned by the write
+        statement."""
+        return select(self._model).from_statement(
+            statement.returning(*self._model.__table__.columns),
+        )
+
     async def update(self, values: dict[str, Any], **filters) -> int:
         """Updates filtered queryset with provided values."""
-        statement = update(self._model).filter_by(**filters).values(**values)
+        statement = self._update_statement(values, **filters)
 
-        async with self.get_session() as session:
+        async with self._updating(values, **filters), self.get_session() as session:
             result = await session.execute(statement)
             await session.commit()
             return result.rowcount
 
+    async def update_returning(
+        self,
+        values: dict[str, Any],
+        join: list[str] = None,
+        **filters,
+    ) -> list[BaseDBModel]:
+        """Updates filtered queryset with provided values and returns the
+        updated objects.
+
+        Objects are hydrated from `UPDATE ... RETURNING` where the dialect
+        supports it, otherwise they are selected by primary keys after the
+        update. Either way `join` relations are loaded in the same session.
+
+        """
+        statement = self._update_statement(values, **filters)
+
+        async with self._updating(values, **filters), self.get_session() as session:
+            if session.bind.dialect.full_returning:
+                statement = self._returning_statement(statement)
+            else:
+                ids = (await session.execute(select(self._model.id).filter_by(**filters))).scalars().all()
+                await session.execute(statement)
+                statement = select(self._model).filter(self._model.id.in_(ids))
+
+            statement = await self._join_statement(statement, columns=join, selectin=True)
+            result = await session.execute(statement.execution_options(populate_existing=True))
+            updated_objects = result.scalars().all()
+            await session.commit()
+            return updated_objects
+
 
 class CreateUpdateRepository(CreateRepository, UpdateRepository):
     pass
@@ -302,8 +507,8 @@ class CRUDRepository(
 ):
     async def update_object(self, obj: BaseDBModel, **values) -> BaseDBModel:
         """Updates specific object with values."""
-        await self.update(values=values, id=obj.id)
-        return await self.refresh(obj=obj)
+        updated_objects = await self.update_returning(values=values, id=obj.id)
+        return updated_objects[0] if updated_objects else None
 
     async def update_and_return_single(
         self,
@@ -311,8 +516,9 @@ class CRUDRepository(
         join: list[str] = None,
         **filters,
     ) -> BaseDBModel:
-        """Updates first object matching provided filters and returns it."""
-        updated_rows = await self.update(values=values, **filters)
+        """Updates objects matching provided filters and returns the first
+        of them."""
+        updated_objects = await self.update_returning(values=values, join=join, **filters)
 
-        if updated_rows:
-            return await self.retrieve(join=join, **filters)
+        if updated_objects:
+            return updated_objects[0]
@@ -0,0 +1,32 @@
+import sqlalchemy as sa
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import Grouping
+
+from core.common.config import config
+
+
+def is_postgresql(session: AsyncSession) -> bool:
+    return session.bind.dialect.name == 'postgresql'
+
+
+async def set_trigram_threshold(session: AsyncSession, threshold: float = None) -> None:
+    """Sets `pg_trgm` word similarity threshold of the current transaction.
+
+    The `<%` operator compares against it, so the threshold is applied by
+    the trigram index instead of filtering the computed similarity.
+
+    """
+    if threshold is None:
+        threshold = config.TRIGRAM_SEARCH_THRESHOLD
+
+    await session.execute(
+        sa.select(sa.func.set_config('pg_trgm.word_similarity_threshold', str(threshold), True)),
+    )
+
+
+def trigram_match(column, search: str):
+    """Returns the condition matching the search to any part of the column
+    with typos, served by a `gin_trgm_ops` index, and its rank."""
+    search = sa.cast(search, sa.Text)
+    # `<%` binds as tight as `||` of concatenated columns
+    return search.op('<%')(Grouping(column)), sa.func.word_similarity(search, column)
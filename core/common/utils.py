@@ -35,10 +35,43 @@ def prepare_json_list(schemas: list[BaseModel]):
     return [prepare_json_schema(schema) for schema in schemas]
 
 
-def get_attachment_path(attachment_id: int) -> str:
+def get_attachment_path(attachment_id: int, signed: bool = False) -> str:
+    """Returns attachment URL.
+
+    Signed URLs are short-lived and can be downloaded without
+    authorization, so they must not be persisted.
+
+    """
+    if signed:
+        return config.SIGNED_STATIC_URL.format(token=sign_attachment_id(attachment_id))
     return config.STATIC_URL.format(file_id=attachment_id)
 
 
+@inject
+def sign_attachment_id(
+    attachment_id: int,
+    timed_serializer: TimedSerializer = Provide[MainContainer.timed_serializer],
+) -> str:
+    return timed_serializer.dumps(obj=attachment_id, salt=config.ATTACHMENT_URL_SALT)
+
+
+@inject
+def unsign_attachment_id(
+    token: str,
+    timed_serializer: TimedSerializer = Provide[MainContainer.timed_serializer],
+) -> int:
+    """Returns attachment id from signed token.
+
+    Raises `BadSignature` if the token is forged or expired.
+
+    """
+    return timed_serializer.loads(
+        token,
+        max_age=config.ATTACHMENT_URL_TIMEDELTA.total_seconds(),
+        salt=config.ATTACHMENT_URL_SALT,
+    )
+
+
 @inject
 async def sign_timed_token(
     subject: Any,
@@ -0,0 +1,47 @@
+"""added posts search vector
+
+Revision ID: 7a3f9c2d1e84
+Revises: 5d2e8c41f7a9
+Create Date: 2026-10-19 16:21:07.193845
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '7a3f9c2d1e84'
+down_revision = '5d2e8c41f7a9'
+branch_labels = None
+depends_on = None
+
+# the russian configuration stems latin words with the english stemmer
+SEARCH_VECTOR_EXPRESSION = """
+    setweight(to_tsvector('russian'::regconfig, coalesce(title, '')), 'A')
+    || setweight(to_tsvector('russian'::regconfig, coalesce(description, '')), 'B')
+    || setweight(to_tsvector('russian'::regconfig, coalesce(text, '')), 'C')
+"""
+
+
+def upgrade() -> None:
+    op.add_column(
+        'posts',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(SEARCH_VECTOR_EXPRESSION, persisted=True),
+        ),
+    )
+    op.create_index(
+        'ix_posts_search_vector',
+        'posts',
+        ['search_vector'],
+        unique=False,
+        postgresql_using='gin',
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_posts_search_vector', table_name='posts')
+    op.drop_column('posts', 'search_vector')
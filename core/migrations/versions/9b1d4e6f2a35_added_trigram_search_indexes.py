@@ -0,0 +1,45 @@
+"""added trigram search indexes
+
+Revision ID: 9b1d4e6f2a35
+Revises: 7a3f9c2d1e84
+Create Date: 2026-10-19 17:45:12.408213
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '9b1d4e6f2a35'
+down_revision = '7a3f9c2d1e84'
+branch_labels = None
+depends_on = None
+
+# must be the same expression as the one searched by `UserRepository`
+USER_NAME_EXPRESSION = "(first_name || ' ' || last_name)"
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index(
+        'ix_topics_title_trgm',
+        'topics',
+        ['title'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'title': 'gin_trgm_ops'},
+    )
+    op.execute(
+        f'CREATE INDEX ix_users_name_trgm ON users USING gin ({USER_NAME_EXPRESSION} gin_trgm_ops)',
+    )
+    op.create_index(
+        op.f('ix_participations_room_id'),
+        'participations',
+        ['room_id'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_participations_room_id'), table_name='participations')
+    op.drop_index('ix_users_name_trgm', table_name='users')
+    op.drop_index('ix_topics_title_trgm', table_name='topics')
@@ -0,0 +1,72 @@
+"""deduplicated attachment contents
+
+Revision ID: b84e0d6a51c3
+Revises: 3a1f9c27e4b0
+Create Date: 2026-10-19 13:40:07.215934
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b84e0d6a51c3'
+down_revision = '3a1f9c27e4b0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('attachment_contents',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('sha256', sa.String(length=64), nullable=False),
+    sa.Column('source', sa.LargeBinary(), nullable=False),
+    sa.Column('size', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('sha256')
+    )
+    op.add_column('attachments', sa.Column('content_id', sa.Integer(), nullable=True))
+
+    # move existing files into shared contents
+    op.execute(
+        """
+        INSERT INTO attachment_contents
+            (created_at, updated_at, sha256, source, size)
+        SELECT DISTINCT ON (hashes.sha256)
+            now(), now(), hashes.sha256, hashes.source, length(hashes.source)
+        FROM (
+            SELECT encode(sha256(source), 'hex') AS sha256, source
+            FROM attachments
+        ) AS hashes
+        """
+    )
+    op.execute(
+        """
+        UPDATE attachments SET content_id = attachment_contents.id
+        FROM attachment_contents
+        WHERE attachment_contents.sha256 = encode(sha256(attachments.source), 'hex')
+        """
+    )
+
+    op.alter_column('attachments', 'content_id', nullable=False)
+    op.create_index(op.f('ix_attachments_content_id'), 'attachments', ['content_id'], unique=False)
+    op.create_foreign_key(None, 'attachments', 'attachment_contents', ['content_id'], ['id'])
+    op.drop_column('attachments', 'source')
+
+
+def downgrade() -> None:
+    op.add_column('attachments', sa.Column('source', sa.LargeBinary(), nullable=True))
+    op.execute(
+        """
+        UPDATE attachments SET source = attachment_contents.source
+        FROM attachment_contents
+        WHERE attachment_contents.id = attachments.content_id
+        """
+    )
+    op.alter_column('attachments', 'source', nullable=False)
+    op.drop_constraint('attachments_content_id_fkey', 'attachments', type_='foreignkey')
+    op.drop_index(op.f('ix_attachments_content_id'), table_name='attachments')
+    op.drop_column('attachments', 'content_id')
+    op.drop_table('attachment_contents')
@@ -1,6 +1,8 @@
 from huey import RedisHuey
 
+from core.apps.cache.tiered import invalidation_listener
 from core.common.config import config
+from core.common.integrations.pool import http_client_pool
 
 
 huey_app = RedisHuey(
@@ -9,3 +11,13 @@ huey_app = RedisHuey(
     utc=True,
     immediate=config.HUEY_IMMEDIATE,
 )
+
+
+@huey_app.on_startup()
+def start_cache_invalidation_listener():
+    invalidation_listener.start()
+
+
+@huey_app.on_shutdown()
+def close_http_clients():
+    http_client_pool.close()
@@ -1 +1,2 @@
+from .attachments import *  # no qa
 from .classroom import *  # no qa
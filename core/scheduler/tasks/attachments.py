@@ -0,0 +1,80 @@
+import logging
+from datetime import timedelta
+
+from huey import crontab
+
+from core.apps.attachments.repositories.attachment_content_repository import AttachmentContentRepository
+from core.apps.attachments.repositories.attachment_repository import AttachmentRepository
+from core.common.config import config
+from core.common.utils import get_current_datetime
+from core.scheduler.app import huey_app
+from core.scheduler.utils import run_async
+
+
+logger = logging.getLogger('huey')
+
+
+async def collect_orphaned_attachments() -> tuple[int, int]:
+    """Deletes attachments left without post, assignment or user.
+
+    Returns count of deleted attachments and freed derivatives bytes.
+
+    """
+    repository = AttachmentRepository()
+    created_before = get_current_datetime() - timedelta(seconds=config.CLEANUP_TIMEOUT)
+    deleted_count, freed_bytes = 0, 0
+
+    for _ in range(config.ATTACHMENTS_GC_MAX_BATCHES):
+        batch_count, batch_bytes = await repository.delete_orphans(
+            created_before=created_before,
+            limit=config.ATTACHMENTS_GC_BATCH_SIZE,
+        )
+        deleted_count += batch_count
+        freed_bytes += batch_bytes
+
+        if batch_count < config.ATTACHMENTS_GC_BATCH_SIZE:
+            break
+    return deleted_count, freed_bytes
+
+
+async def collect_attachment_contents() -> tuple[int, int]:
+    """Deletes stored files which are no longer referenced by attachments.
+
+    Returns count of deleted files and freed bytes.
+
+    """
+    repository = AttachmentContentRepository()
+    deleted_count, freed_bytes = 0, 0
+
+    for _ in range(config.ATTACHMENTS_GC_MAX_BATCHES):
+        batch_count, batch_bytes = await repository.delete_unreferenced(
+            limit=config.ATTACHMENTS_GC_BATCH_SIZE,
+        )
+        deleted_count += batch_count
+        freed_bytes += batch_bytes
+
+        if batch_count < config.ATTACHMENTS_GC_BATCH_SIZE:
+            break
+    return deleted_count, freed_bytes
+
+
+async def collect_attachments_garbage() -> dict[str, int]:
+    attachments_count, derivatives_bytes = await collect_orphaned_attachments()
+    contents_count, contents_bytes = await collect_attachment_contents()
+
+    return {
+        'attachments': attachments_count,
+        'contents': contents_count,
+        'reclaimed_bytes': derivatives_bytes + contents_bytes,
+    }
+
+
+@huey_app.periodic_task(crontab(minute='*/30'))
+def collect_attachments_garbage_task() -> dict[str, int]:
+    report = run_async(collect_attachments_garbage())
+    logger.info(
+        'Attachments garbage collected: %(attachments)s attachments, '
+        '%(contents)s files, %(reclaimed_bytes)s bytes reclaimed',
+        report,
+    )
+    return report
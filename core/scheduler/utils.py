@@ -0,0 +1,23 @@
+import asyncio
+from typing import (
+    Any,
+    Awaitable,
+)
+
+from core.common.database import engine
+
+
+def run_async(awaitable: Awaitable) -> Any:
+    """Runs repository coroutines from synchronous huey tasks.
+
+    Every call gets its own event loop, so pooled connections are disposed
+    afterwards instead of leaking into the next loop.
+
+    """
+    async def runner():
+        try:
+            return await awaitable
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(runner())
@@ -0,0 +1,145 @@
+"""Rows read by collection joins of room posts and last messages with
+`joined` and `selectin` loading.
+
+Usage: TEST_MODE=1 python -m core.tests.benchmarks.join_loading
+
+"""
+import asyncio
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from sqlalchemy import event
+
+from core.apps.attachments.repositories.attachment_repository import AttachmentRepository
+from core.apps.chat.repositories.message_repository import MessageRepository
+from core.apps.classroom.repositories.post_repository import RoomPostRepository
+from core.common.database import test_engine
+from core.common.models.base import BaseDBModel
+from core.tests.factories.chat.dialog import DialogFactory
+from core.tests.factories.chat.message import MessageFactory
+from core.tests.factories.classroom.room import RoomFactory
+from core.tests.factories.classroom.room_post import RoomPostFactory
+from core.tests.factories.user import UserFactory
+
+
+POSTS_COUNT = 50
+ATTACHMENTS_COUNTS = [1, 5, 10]
+DIALOGS_COUNT = 20
+PARTICIPANTS_COUNTS = [2, 10, 30]
+
+
+class JoinedRoomPostRepository(RoomPostRepository):
+    """Loads attachments by joins, as every join did before."""
+    join_strategies = {'attachments': 'joined'}
+
+
+class JoinedMessageRepository(MessageRepository):
+    join_strategies = {'dialog.participants': 'joined'}
+
+
+@contextmanager
+def collect_statements() -> Iterator[list[tuple]]:
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, *args):
+        statements.append((statement, parameters))
+
+    event.listen(test_engine.sync_engine, 'before_cursor_execute', before_cursor_execute)
+
+    try:
+        yield statements
+    finally:
+        event.remove(test_engine.sync_engine, 'before_cursor_execute', before_cursor_execute)
+
+
+async def count_rows(statements: list[tuple]) -> tuple[int, int]:
+    """Executes collected statements again, returns count of rows of the
+    first one and count of values of all of them."""
+    rows_counts, values_count = [], 0
+
+    async with test_engine.connect() as connection:
+        for statement, parameters in statements:
+            result = await connection.exec_driver_sql(statement, parameters)
+            rows = result.all()
+            rows_counts.append(len(rows))
+            values_count += len(rows) * len(result.keys())
+    return rows_counts[0], values_count
+
+
+async def measure(name: str, size: int, load) -> None:
+    with collect_statements() as statements:
+        started_at = time.perf_counter()
+        objects = await load()
+        elapsed = time.perf_counter() - started_at
+
+    rows_count, values_count = await count_rows(statements)
+    print(
+        f'{name:<24} n={size:<4} {len(objects):4} objects {len(statements):3} queries '
+        f'{rows_count:5} rows {values_count:7} values {elapsed * 1e3:9.2f} ms',
+    )
+
+
+async def measure_room_posts() -> None:
+    attachment_repository = AttachmentRepository()
+
+    for attachments_count in ATTACHMENTS_COUNTS:
+        room = await RoomFactory.create()
+
+        for _ in range(POSTS_COUNT):
+            post = await RoomPostFactory.create(room=room)
+
+            for index in range(attachments_count):
+                await attachment_repository.create(
+                    filename=f'file-{index}.txt',
+                    source=f'{post.id}-{index}'.encode(),
+                    post_id=post.id,
+                )
+
+        for name, repository in (
+            ('room posts, joined', JoinedRoomPostRepository()),
+            ('room posts, selectin', RoomPostRepository()),
+        ):
+            await measure(name, attachments_count, lambda: repository.fetch(
+                ordering=['-created_at'],
+                join=['author', 'attachments', 'topic'],
+                limit=POSTS_COUNT,
+                room_id=room.id,
+            ))
+
+
+async def measure_last_messages() -> None:
+    for participants_count in PARTICIPANTS_COUNTS:
+        user = await UserFactory.create()
+
+        for _ in range(DIALOGS_COUNT):
+            participants = [user] + await UserFactory.create_batch(size=participants_count - 1)
+            dialog = await DialogFactory.create(participants=participants)
+            await MessageFactory.create(dialog=dialog, sender=user)
+
+        for name, repository in (
+            ('last messages, joined', JoinedMessageRepository()),
+            ('last messages, selectin', MessageRepository()),
+        ):
+            await measure(name, participants_count, lambda: repository.get_unique_last_messages(
+                user_id=user.id,
+                ordering=['-created_at'],
+                join=['sender', 'dialog', 'dialog.participants'],
+                limit=100,
+            ))
+
+
+async def main() -> None:
+    async with test_engine.begin() as connection:
+        await connection.run_sync(BaseDBModel.metadata.create_all)
+
+    try:
+        await measure_room_posts()
+        await measure_last_messages()
+    finally:
+        async with test_engine.begin() as connection:
+            await connection.run_sync(BaseDBModel.metadata.drop_all)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,42 @@
+"""Per-request JWT verification cost.
+
+Usage: python -m core.tests.benchmarks.jwt_verification
+
+"""
+import timeit
+from datetime import timedelta
+
+from fastapi_jwt_auth import AuthJWT
+
+from core.common.config import config
+from core.common.helpers.jwt import JWTManager
+
+
+NUMBER = 20000
+
+
+def report(name: str, seconds: float) -> None:
+    print(f'{name:<40} {seconds / NUMBER * 1e6:8.2f} us/request')
+
+
+def main() -> None:
+    token = AuthJWT().create_access_token(subject=1, expires_time=timedelta(minutes=5))
+    manager = JWTManager(secret_key=config.JWT_SECRET_KEY)
+    uncached_manager = JWTManager(secret_key=config.JWT_SECRET_KEY, cache_size=0)
+
+    report(
+        'AuthJWT() + get_raw_jwt',
+        timeit.timeit(lambda: AuthJWT().get_raw_jwt(token), number=NUMBER),
+    )
+    report(
+        'JWTManager.decode, cold cache',
+        timeit.timeit(lambda: uncached_manager.decode(token), number=NUMBER),
+    )
+    report(
+        'JWTManager.decode, warm cache',
+        timeit.timeit(lambda: manager.decode(token), number=NUMBER),
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""Query count of the roommates check used by group dialogs.
+
+Usage: TEST_MODE=1 python -m core.tests.benchmarks.roommates_queries
+
+"""
+import asyncio
+import time
+
+from core.apps.classroom.repositories.participation_repository import ParticipationRepository
+from core.common.database import test_engine
+from core.common.models.base import BaseDBModel
+from core.tests.factories.classroom.participation import ParticipationFactory
+from core.tests.factories.classroom.room import RoomFactory
+from core.tests.utils.functions import count_queries
+
+
+USERS_COUNTS = [2, 5, 10, 20]
+
+
+async def pairwise_are_users_roommates(
+    repository: ParticipationRepository,
+    users_ids: list[int],
+) -> bool:
+    """The previous implementation, which loaded roommates of every pair."""
+    for user_index, user_id in enumerate(users_ids):
+        for other_user_id in users_ids[user_index + 1:]:
+            if other_user_id not in await repository.get_user_roommates(user_id=user_id):
+                return False
+    return True
+
+
+async def measure(name: str, users_count: int, check) -> None:
+    with count_queries(test_engine) as statements:
+        started_at = time.perf_counter()
+        assert await check()
+        elapsed = time.perf_counter() - started_at
+    print(f'{name:<12} n={users_count:<4} {len(statements):5} queries {elapsed * 1e3:9.2f} ms')
+
+
+async def main() -> None:
+    async with test_engine.begin() as connection:
+        await connection.run_sync(BaseDBModel.metadata.create_all)
+
+    repository = ParticipationRepository()
+
+    try:
+        for users_count in USERS_COUNTS:
+            room = await RoomFactory.create()
+            participations = await ParticipationFactory.create_batch(size=users_count, room=room)
+            users_ids = [participation.user_id for participation in participations]
+
+            await measure(
+                'pairwise',
+                users_count,
+                lambda: pairwise_are_users_roommates(repository, users_ids),
+            )
+            await measure(
+                'self-join',
+                users_count,
+                lambda: repository.are_users_rommmates(users_ids=users_ids),
+            )
+    finally:
+        async with test_engine.begin() as connection:
+            await connection.run_sync(BaseDBModel.metadata.drop_all)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -8,6 +8,7 @@ import pytest_asyncio
 from faker.proxy import Faker
 
 from core.apps.attachments.repositories.attachment_repository import AttachmentRepository
+from core.apps.cache.tiered import invalidation_listener
 from core.apps.classroom.repositories import RoomRepository
 from core.apps.classroom.repositories.assignment import HomeworkAssignmentRepository
 from core.apps.classroom.repositories.participation_repository import ParticipationRepository
@@ -45,6 +46,8 @@ def client(app: FastAPI, event_loop: asyncio.AbstractEventLoop) -> Generator:
     with FastAPITestClient(app) as c:
         yield c
     event_loop.run_until_complete(connection.run_sync(BaseDBModel.metadata.drop_all))
+    # cached rows of dropped tables must not leak into the next test
+    event_loop.run_until_complete(invalidation_listener.clear_caches())
 
 
 @pytest_asyncio.fixture
@@ -0,0 +1,67 @@
+import pytest
+
+from core.apps.classroom.constants import ParticipationRoleEnum
+from core.apps.classroom.repositories.participation_repository import ParticipationRepository
+from core.apps.classroom.repositories.post_repository import RoomPostRepository
+from core.apps.classroom.repositories.topic_repository import TopicRepository
+from core.common.database import test_engine
+from core.tests.factories.classroom.participation import ParticipationFactory
+from core.tests.factories.classroom.room import RoomFactory
+from core.tests.factories.classroom.room_post import RoomPostFactory
+from core.tests.factories.classroom.topics import TopicFactory
+from core.tests.utils.functions import count_queries
+
+
+@pytest.mark.asyncio
+async def test_fetch_reuses_template(topic_repository: TopicRepository):
+    rooms = [await RoomFactory.create() for _ in range(2)]
+    topics = {
+        room.id: [await TopicFactory.create(room=room, order=order) for order in range(1, 5)]
+        for room in rooms
+    }
+    fetch_arguments = {'ordering': ['-order'], 'join': ['room'], 'offset': 1, 'limit': 2}
+
+    with count_queries(test_engine) as statements:
+        fetched_topics = {
+            room.id: await topic_repository.fetch(room_id=room.id, **fetch_arguments)
+            for room in rooms
+        }
+
+    assert statements[0] == statements[1]
+    assert str(rooms[0].id) not in statements[0].split('WHERE')[1]
+    assert topic_repository._get_fetch_template(
+        filters={'room_id': rooms[0].id},
+        **fetch_arguments,
+    )[0] is topic_repository._get_fetch_template(
+        filters={'room_id': rooms[1].id},
+        **fetch_arguments,
+    )[0]
+
+    for room in rooms:
+        assert [topic.id for topic in fetched_topics[room.id]] == [topic.id for topic in topics[room.id][2:0:-1]]
+        assert fetched_topics[room.id][0].room.id == room.id
+
+    topic = await topic_repository.retrieve(id=topics[rooms[1].id][0].id)
+    assert topic.room_id == rooms[1].id
+
+
+@pytest.mark.asyncio
+async def test_fetch_template_filters(room_post_repository: RoomPostRepository):
+    topic = await TopicFactory.create(order=1)
+    post = await RoomPostFactory.create(room=topic.room)
+    topic_post = await RoomPostFactory.create(room=topic.room, topic=topic)
+
+    posts = await room_post_repository.fetch(room_id=topic.room_id, topic_id=None)
+    assert [post.id for post in posts] == [post.id]
+
+    posts = await room_post_repository.fetch(room_id=topic.room_id, topic_id=topic.id)
+    assert [post.id for post in posts] == [topic_post.id]
+
+    host_participation = await ParticipationFactory.create(role=ParticipationRoleEnum.host)
+    await ParticipationFactory.create(room=host_participation.room, role=ParticipationRoleEnum.participant)
+
+    participations = await ParticipationRepository().fetch(
+        room_id=host_participation.room_id,
+        role=ParticipationRoleEnum.host,
+    )
+    assert [participation.id for participation in participations] == [host_participation.id]
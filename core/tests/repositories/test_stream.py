@@ -0,0 +1,48 @@
+import pytest
+
+from core.apps.classroom.repositories.topic_repository import TopicRepository
+from core.common.database import test_engine
+from core.tests.factories.classroom.room import RoomFactory
+from core.tests.factories.classroom.topics import TopicFactory
+from core.tests.utils.functions import count_checkouts
+
+
+@pytest.mark.asyncio
+async def test_stream_matches_fetch(topic_repository: TopicRepository):
+    room = await RoomFactory.create()
+
+    for order in (3, 1, 5, 2, 4):
+        await TopicFactory.create(room=room, order=order)
+    await TopicFactory.create()
+
+    fetched_topics = await topic_repository.fetch(ordering=['-order'], join=['room'], room_id=room.id)
+
+    async with topic_repository.stream(ordering=['-order'], join=['room'], room_id=room.id) as topics:
+        streamed_topics = [topic async for topic in topics]
+
+    assert [topic.id for topic in streamed_topics] == [topic.id for topic in fetched_topics]
+    assert streamed_topics[0].room.id == room.id
+
+    async with topic_repository.stream(
+        ordering=['order'],
+        yield_per=2,
+        batches=True,
+        room_id=room.id,
+    ) as batches:
+        assert [[topic.order for topic in batch] async for batch in batches] == [[1, 2], [3, 4], [5]]
+
+
+@pytest.mark.asyncio
+async def test_stream_releases_connection_on_early_exit(topic_repository: TopicRepository):
+    room = await RoomFactory.create()
+
+    for order in range(1, 6):
+        await TopicFactory.create(room=room, order=order)
+
+    with count_checkouts(test_engine) as checkouts:
+        async with topic_repository.stream(yield_per=2, room_id=room.id) as topics:
+            async for _ in topics:
+                break
+            assert checkouts == {'checkout': 1, 'checkin': 0}
+
+    assert checkouts == {'checkout': 1, 'checkin': 1}
@@ -0,0 +1,119 @@
+import sqlite3
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql.base import PGCompiler
+from sqlalchemy.dialects.sqlite.base import SQLiteCompiler
+
+import pytest
+
+from core.apps.classroom.repositories.topic_repository import TopicRepository
+from core.common.database import test_engine
+from core.tests.factories.classroom.room import RoomFactory
+from core.tests.factories.classroom.topics import TopicFactory
+from core.tests.factories.user import UserFactory
+from core.tests.utils.functions import (
+    count_checkouts,
+    count_queries,
+)
+
+
+@pytest.mark.asyncio
+async def test_returning_statement(topic_repository: TopicRepository):
+    statement = topic_repository._returning_statement(
+        topic_repository._update_statement({'title': 'Algebra'}, id=1),
+    )
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+
+    assert sql.startswith('UPDATE topics SET')
+    assert 'RETURNING topics.id, ' in sql
+    assert 'topics.room_id' in sql
+
+
+@pytest.mark.asyncio
+async def test_update_and_return_single_in_one_session(topic_repository: TopicRepository):
+    room = await RoomFactory.create()
+    topic = await TopicFactory.create(room=room, title='Algebra')
+    other_topic = await TopicFactory.create(room=room, title='Geometry')
+
+    with count_checkouts(test_engine) as checkouts, count_queries(test_engine) as statements:
+        updated_topic = await topic_repository.update_and_return_single(
+            values={'title': 'Calculus'},
+            join=['room'],
+            title='Algebra',
+            room_id=room.id,
+        )
+
+    assert checkouts['checkout'] == 1
+    assert len([statement for statement in statements if statement.startswith('UPDATE')]) == 1
+    assert updated_topic.id == topic.id
+    assert updated_topic.title == 'Calculus'
+    assert updated_topic.room.id == room.id
+
+    other_topic = await topic_repository.refresh(other_topic)
+    assert other_topic.title == 'Geometry'
+
+    updated_topic = await topic_repository.update_object(updated_topic, order=7)
+    assert (updated_topic.title, updated_topic.order) == ('Calculus', 7)
+
+    assert await topic_repository.update_and_return_single(values={'title': 'Logic'}, id=0) is None
+
+
+@pytest.mark.asyncio
+async def test_create_with_join_in_one_session(topic_repository: TopicRepository):
+    room = await RoomFactory.create()
+    author = await UserFactory.create()
+
+    with count_checkouts(test_engine) as checkouts:
+        topic = await topic_repository.create(
+            join=['room'],
+            title='Algebra',
+            order=1,
+            room_id=room.id,
+            author_id=author.id,
+        )
+
+    assert checkouts['checkout'] == 1
+    assert topic.room.id == room.id
+
+
+@pytest.fixture
+def sqlite_returning(monkeypatch: pytest.MonkeyPatch):
+    """Lets the SQLite test engine take the `UPDATE ... RETURNING` path,
+    which SQLite executes since 3.35 but SQLAlchemy 1.4 only compiles for
+    other dialects."""
+    if sqlite3.sqlite_version_info < (3, 35):
+        pytest.skip('SQLite supports RETURNING since 3.35')
+
+    monkeypatch.setattr(test_engine.dialect, 'full_returning', True)
+    monkeypatch.setattr(SQLiteCompiler, 'returning_clause', PGCompiler.returning_clause)
+
+
+@pytest.mark.asyncio
+async def test_update_returning_hydrates_from_returning(
+    topic_repository: TopicRepository,
+    sqlite_returning: None,
+):
+    room = await RoomFactory.create()
+    topic = await TopicFactory.create(room=room, title='Algebra')
+    other_topic = await TopicFactory.create(room=room, title='Geometry')
+
+    with count_checkouts(test_engine) as checkouts, count_queries(test_engine) as statements:
+        updated_topic = await topic_repository.update_and_return_single(
+            values={'title': 'Calculus'},
+            join=['room', 'room.participations'],
+            title='Algebra',
+            room_id=room.id,
+        )
+
+    assert checkouts['checkout'] == 1
+    assert statements[0].startswith('UPDATE topics SET') and 'RETURNING' in statements[0]
+    assert len(statements) == 3
+    assert updated_topic.id == topic.id
+    assert updated_topic.title == 'Calculus'
+    assert updated_topic.room.id == room.id
+    assert updated_topic.room.participations == []
+
+    updated_topic = await topic_repository.update_object(updated_topic, order=7)
+    assert (updated_topic.title, updated_topic.order) == ('Calculus', 7)
+    assert (await topic_repository.refresh(other_topic)).title == 'Geometry'
+    assert await topic_repository.update_and_return_single(values={'title': 'Logic'}, id=0) is None
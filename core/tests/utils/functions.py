@@ -1,4 +1,11 @@
-from typing import Union
+from contextlib import contextmanager
+from typing import (
+    Iterator,
+    Union,
+)
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
 
 from core.apps.attachments.models import Attachment
 from core.apps.classroom.models import (
@@ -20,3 +27,41 @@ def check_attachment_is_attached(
     assert attachment.id in [
         assignment_attachment.id for assignment_attachment in attached_to.attachments
     ]
+
+
+@contextmanager
+def count_queries(engine: AsyncEngine) -> Iterator[list[str]]:
+    """Collects SQL statements executed by the engine inside the block."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, 'before_cursor_execute', before_cursor_execute)
+
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, 'before_cursor_execute', before_cursor_execute)
+
+
+@contextmanager
+def count_checkouts(engine: AsyncEngine) -> Iterator[dict[str, int]]:
+    """Counts connection checkouts and checkins of the engine pool inside
+    the block."""
+    counts = {'checkout': 0, 'checkin': 0}
+
+    def on_checkout(*args):
+        counts['checkout'] += 1
+
+    def on_checkin(*args):
+        counts['checkin'] += 1
+
+    event.listen(engine.sync_engine, 'checkout', on_checkout)
+    event.listen(engine.sync_engine, 'checkin', on_checkin)
+
+    try:
+        yield counts
+    finally:
+        event.remove(engine.sync_engine, 'checkout', on_checkout)
+        event.remove(engine.sync_engine, 'checkin', on_checkin)
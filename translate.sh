@@ -1,2 +1,2 @@
-find . -iname "*.py" | xargs xgettext --from-code=UTF-8 --default-domain=locales/en/LC_MESSAGES/base
-find . -iname "*.py" | xargs xgettext --from-code=UTF-8 --default-domain=locales/ru/LC_MESSAGES/base
+find . -iname "*.py" | xargs xgettext --from-code=UTF-8 --keyword=_lazy --default-domain=locales/en/LC_MESSAGES/base
+find . -iname "*.py" | xargs xgettext --from-code=UTF-8 --keyword=_lazy --default-domain=locales/ru/LC_MESSAGES/base